@@ -0,0 +1,197 @@
+"""
+Batched evaluation of Koopman models on test trajectories.
+
+Models lifted with identity plus RFF observables are evaluated by lifting the states of all test trajectories at once
+and propagating them together with matrix multiplies. Trajectories of different lengths are padded and masked.
+Models fit on normalized states are propagated in their normalized coordinates and mapped back.
+Any other model is evaluated with model.solve_ivp, fanned out over a process pool.
+"""
+
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from export import extract_operators
+
+# a rollout diverged if its state norm exceeds this multiple of the largest true state norm, or is not finite
+DIVERGENCE_FACTOR = 1e3
+
+
+class LiftedLinearModel:
+    """
+    discrete time Koopman model z' = A z + B u with lifting z = [x, sqrt(2 / D) * cos(w x + u)]
+
+    Models fit on normalized states also hold the MinMax normalization x_n = scale * x + offset, which is applied
+    before lifting, while predicted states are mapped back.
+    """
+
+    def __init__(self, A, B, w, u, scale=None, offset=None):
+        if (scale is None) != (offset is None):
+            raise ValueError("model normalization requires both scale and offset")
+        self.A = A
+        self.B = B
+        self.w = w
+        self.u = u
+        self.scale = scale
+        self.offset = offset
+        self.state_dim = w.shape[1]
+        self.rff_scale = np.sqrt(2 / w.shape[0])
+
+    @classmethod
+    def from_autokoopman(cls, model):
+        operators = extract_operators(model)
+        return cls(operators['A'], operators['B'], operators['w'], operators['u'],
+                   scale=operators.get('scale'), offset=operators.get('offset'))
+
+    def normalize(self, states):
+        """map (N, state dim) states to the normalized coordinates of the model"""
+        return states if self.scale is None else states * self.scale + self.offset
+
+    def denormalize(self, states):
+        """map (N, state dim) normalized states back to states"""
+        return states if self.scale is None else (states - self.offset) / self.scale
+
+    def lift(self, states):
+        """lift a (N, state dim) array of normalized states"""
+        return np.concatenate([states, self.rff_scale * np.cos(states @ self.w.T + self.u)], axis=1)
+
+    def step(self, time, state, action):
+        """single step with the signature of autokoopman's model.step"""
+        z = self.lift(self.normalize(np.asarray(state, dtype=np.float64)[None, :]))
+        z_next = z @ self.A.T + np.asarray(action, dtype=np.float64)[None, :] @ self.B.T
+        return self.denormalize(z_next[:, :self.state_dim])[0]
+
+    def rollout(self, initial_states, inputs, lengths=None):
+        """
+        Propagate a batch of trajectories, relifting the predicted state at every step like model.step.
+
+        initial_states: (N, state dim), inputs: (T - 1, N, input dim), lengths: (N,) number of states per trajectory.
+        Returns the (T, N, state dim) predicted states, NaN past each trajectory's length or divergence.
+        """
+        num_steps = inputs.shape[0] + 1
+        if lengths is None:
+            lengths = np.full((len(initial_states),), num_steps)
+
+        states = np.full((num_steps,) + initial_states.shape, np.nan)
+        states[0] = self.normalize(initial_states)
+        active = lengths > 1
+
+        # diverging rollouts overflow, they are detected by the caller
+        with np.errstate(over='ignore', invalid='ignore'):
+            for i in range(num_steps - 1):
+                if not np.any(active):
+                    break
+                z_next = self.lift(states[i, active]) @ self.A.T + inputs[i, active] @ self.B.T
+                states[i + 1, active] = z_next[:, :self.state_dim]
+                active &= lengths > i + 2
+
+        return self.denormalize(states)
+
+
+def _pad(trajectories):
+    lengths = np.array([len(t.states) for t in trajectories])
+    num_steps = lengths.max()
+    state_dim = trajectories[0].states.shape[1]
+    input_dim = trajectories[0].inputs.shape[1]
+
+    true_states = np.full((num_steps, len(trajectories), state_dim), np.nan)
+    inputs = np.zeros((num_steps - 1, len(trajectories), input_dim))
+    for n, t in enumerate(trajectories):
+        true_states[:lengths[n], n] = t.states
+        inputs[:lengths[n] - 1, n] = t.inputs[:lengths[n] - 1]
+
+    return true_states, inputs, lengths
+
+
+def _relative_error(y_true, y_pred):
+    return np.linalg.norm(y_true - y_pred) / np.linalg.norm(y_true)
+
+
+def _solve_trajectory(args):
+    model, t = args
+    try:
+        teval = np.linspace(t.times[0], t.times[-1], len(t.times))
+        trajectory = model.solve_ivp(
+            initial_state=t.states[0, :],
+            tspan=(t.times[0], t.times[-1]),
+            sampling_period=t.times[1] - t.times[0],
+            inputs=t.inputs,
+            teval=teval
+        )
+        return trajectory.states
+    except Exception:
+        # solve_ivp fails for unstable models
+        return None
+
+
+def evaluate_batched(lifted, trajectories):
+    true_states, inputs, lengths = _pad(trajectories)
+    predicted = lifted.rollout(true_states[0], inputs, lengths)
+    return [predicted[:lengths[n], n] for n in range(len(trajectories))]
+
+
+def evaluate_pool(model, trajectories, workers=None):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_solve_trajectory, [(model, t) for t in trajectories]))
+
+
+def evaluate(model, trajectories, workers=None, batched=None):
+    """
+    Evaluate a model on a list of test trajectories.
+
+    Parameters
+    ----------
+    model : autokoopman model or LiftedLinearModel
+        model to evaluate
+    trajectories : list
+        list of autokoopman Trajectory objects, or a TrajectoriesData
+    workers : int
+        number of processes of the solve_ivp fallback, all cores if None
+    batched : bool
+        force (True) or disable (False) batched evaluation, by default used whenever the model supports it
+
+    Returns
+    -------
+    dict
+        per trajectory 'errors' (relative euclidean error, inf if diverged) and 'diverged' flags, 'mean_error',
+        'num_diverged', 'method' and evaluation 'time' in seconds
+    """
+    if hasattr(trajectories, '_trajs'):
+        trajectories = list(trajectories._trajs.values())
+
+    start = time.time()
+
+    lifted = None
+    if batched is None or batched:
+        try:
+            lifted = model if isinstance(model, LiftedLinearModel) else LiftedLinearModel.from_autokoopman(model)
+        except (ValueError, AttributeError):
+            if batched:
+                raise
+
+    if lifted is not None:
+        method = 'batched'
+        predictions = evaluate_batched(lifted, trajectories)
+    else:
+        method = 'pool'
+        predictions = evaluate_pool(model, trajectories, workers)
+
+    errors = np.empty((len(trajectories),))
+    diverged = np.zeros((len(trajectories),), dtype=bool)
+    for n, (t, y_pred) in enumerate(zip(trajectories, predictions)):
+        limit = DIVERGENCE_FACTOR * np.max(np.linalg.norm(t.states, axis=1))
+        if y_pred is None or y_pred.shape != t.states.shape or not np.all(np.isfinite(y_pred)) \
+                or np.max(np.linalg.norm(y_pred, axis=1)) > limit:
+            diverged[n] = True
+            errors[n] = np.inf
+        else:
+            errors[n] = _relative_error(t.states.flatten(), y_pred.flatten())
+
+    return {
+        'errors': errors,
+        'diverged': diverged,
+        'mean_error': float(np.mean(errors)),
+        'num_diverged': int(np.sum(diverged)),
+        'method': method,
+        'time': time.time() - start,
+    }
@@ -1,52 +1,29 @@
 import gym
 import time
-import numpy as np
 import matplotlib
 from matplotlib import pyplot as plt
 import random
 import csv
 import os
-import json
+
+from extract_trajectories import extract_to_store
+from trajectory_store import TrajectoryStore
 
 import sys
 sys.path.insert(0,'..')
 sys.path.insert(1,'../..')
 
-file_path = "../output/expr_20240522_143535/PPO_DubinsRejoin_15bc3_00000_0_2024-05-22_14-35-38/eval/ckpt_200/eval.log"
-with open(file_path, 'r') as file:
-    data = [json.loads(line) for line in file]
-
-output = []
+WRITE_CSV = False
 
-# Split data into episodes 
-batch = []
-for data_item in data:
-    if data_item['info']['failure'] or data_item['info']['success']:
-        lead_x = np.array([entry['info']['lead']['x'] for entry in batch])
-        lead_y = np.array([entry['info']['lead']['y'] for entry in batch])
-        wingman_x = np.array([entry['info']['wingman']['x'] for entry in batch])
-        wingman_y = np.array([entry['info']['wingman']['y'] for entry in batch])
-        lead_speed = np.array([entry['info']['lead']['v'] for entry in batch])
-        wingman_speed = np.array([entry['info']['wingman']['v'] for entry in batch])
-        lead_heading = np.array([entry['info']['lead']['heading'] for entry in batch])
-        wingman_heading = np.array([entry['info']['wingman']['heading'] for entry in batch])
-        
-        actions = [entry['actions'] for entry in batch]
-        
-        #states = list(zip(lead_x, lead_y, wingman_x, wingman_y, lead_speed, wingman_speed, lead_heading, wingman_heading))
-        #states = list(zip(lead_x, lead_y, lead_speed, lead_heading))
-        #states = list(zip(wingman_x, wingman_y, wingman_speed, wingman_heading))
-
-        states = list(zip(lead_x - wingman_x, lead_y - wingman_y, lead_speed - wingman_speed, lead_heading - wingman_heading))
-        
-        times = [t for t in range(0,len(states))]
+file_path = "../output/expr_20240522_143535/PPO_DubinsRejoin_15bc3_00000_0_2024-05-22_14-35-38/eval/ckpt_200/eval.log"
 
-        output.append([actions, times, states])
+# Stream episodes into the trajectory store, the legacy per-measurement CSV directories are only written if requested
+extract_to_store(file_path, "DubinsRejoin.npz", preset='rejoin', input_names=['rudder', 'throttle'])
 
-        batch = []
-    else:
-        batch.append(data_item)
+if not WRITE_CSV:
+    sys.exit(0)
 
+output = [[inputs, times, states] for times, states, inputs in TrajectoryStore("DubinsRejoin.npz").load()]
 
 # Write CSV Files
 for i, measurement in enumerate(output):
@@ -0,0 +1,73 @@
+import numpy as np
+
+
+def _find_observables(obs):
+    """flatten combined AutoKoopman observables into a list"""
+    if hasattr(obs, 'observables'):
+        found = []
+        for o in obs.observables:
+            found += _find_observables(o)
+        return found
+    return [obs]
+
+
+def scaler_parameters(scaler):
+    """MinMax normalization x_n = scale * x + offset of a fitted sklearn MinMaxScaler, None without scaler"""
+    if scaler is None:
+        return None
+    return {'scale': np.asarray(scaler.scale_, dtype=np.float64), 'offset': np.asarray(scaler.min_, dtype=np.float64)}
+
+
+def extract_operators(model):
+    """
+    Extract the linear operators, RFF lifting parameters and state normalization of a trained AutoKoopman model.
+
+    The model must use identity plus random Fourier feature observables (obs_type='rff') and have inputs. Models fit
+    on normalized states (model.scaler, or model.scale of search.py models, is not None) also return the normalization
+    'scale' and 'offset'.
+    """
+
+    # models fit by search.py already hold their lifting parameters
+    if all(hasattr(model, k) for k in ['A', 'B', 'w', 'u']):
+        operators = {'A': np.asarray(model.A), 'B': np.asarray(model.B), 'w': np.asarray(model.w),
+                     'u': np.asarray(model.u).flatten()}
+        if getattr(model, 'scale', None) is not None:
+            operators['scale'] = np.asarray(model.scale, dtype=np.float64)
+            operators['offset'] = np.asarray(model.offset, dtype=np.float64)
+        return operators
+
+    observables = _find_observables(model.obs)
+    identity = [o for o in observables if type(o).__name__ == 'IdentityObservable']
+    rff = [o for o in observables if type(o).__name__ == 'RFFObservable']
+    if len(identity) != 1 or len(rff) != 1 or observables[0] is not identity[0]:
+        raise ValueError("only models lifted with identity followed by RFF observables can be exported, got {}".format(
+            [type(o).__name__ for o in observables]))
+
+    A = getattr(model, 'A', None)
+    B = getattr(model, 'B', None)
+    if A is None or B is None:
+        A, B = model._A, model._B
+
+    operators = {
+        'A': np.real(np.asarray(A)),
+        'B': np.real(np.asarray(B)),
+        'w': np.asarray(rff[0].w),
+        'u': np.asarray(rff[0].u).flatten(),
+    }
+    operators.update(scaler_parameters(getattr(model, 'scaler', None)) or {})
+
+    return operators
+
+
+def export_surrogate(model, path, sampling_period, state_indices=None):
+    """
+    Export a trained AutoKoopman RFF model to the .npz artifact loaded by
+    saferl.environment.models.koopman.KoopmanSurrogateDynamics, including its state normalization.
+    """
+
+    artifact = extract_operators(model)
+    artifact['sampling_period'] = np.float64(sampling_period)
+    if state_indices is not None:
+        artifact['state_indices'] = np.asarray(state_indices, dtype=np.int64)
+
+    np.savez(path, **artifact)
@@ -0,0 +1,129 @@
+"""
+Streaming extraction of Koopman training trajectories from SafeRL eval logs.
+
+The eval log is read one line at a time. Only the configured state features and the actions are projected into
+preallocated per-episode buffers, and each finished episode is streamed to the trajectory store's files on disk, so
+memory use is bounded by the longest episode and does not grow with the size of the log. As in the original
+extraction, the terminal step of each episode (the line reporting success or failure) is not part of the trajectory.
+
+Usage:
+    python extract_trajectories.py <eval.log> <output.npz> [preset]
+"""
+
+import json
+import sys
+import numpy as np
+
+from trajectory_store import TrajectoryStoreWriter
+
+# feature definitions: (name, info key path, optional info key path subtracted from it)
+PRESETS = {
+    'rejoin': [
+        ('rel_x', ('lead', 'x'), ('wingman', 'x')),
+        ('rel_y', ('lead', 'y'), ('wingman', 'y')),
+        ('rel_v', ('lead', 'v'), ('wingman', 'v')),
+        ('rel_heading', ('lead', 'heading'), ('wingman', 'heading')),
+    ],
+    'docking': [
+        ('x', ('deputy', 'x'), ('chief', 'x')),
+        ('y', ('deputy', 'y'), ('chief', 'y')),
+        ('x_dot', ('deputy', 'x_dot'), ('chief', 'x_dot')),
+        ('y_dot', ('deputy', 'y_dot'), ('chief', 'y_dot')),
+    ],
+}
+
+INITIAL_CAPACITY = 1024
+
+
+def _lookup(info, path):
+    for key in path:
+        info = info[key]
+    return info
+
+
+class EpisodeBuffer:
+    """growable preallocated buffer of one episode's states and actions"""
+
+    def __init__(self, state_dim, capacity=INITIAL_CAPACITY):
+        self.states = np.empty((capacity, state_dim), dtype=np.float64)
+        self.actions = None
+        self.length = 0
+
+    def _grow(self):
+        self.states = np.concatenate([self.states, np.empty_like(self.states)])
+        self.actions = np.concatenate([self.actions, np.empty_like(self.actions)])
+
+    def append(self, state, action):
+        if self.actions is None:
+            self.actions = np.empty((len(self.states), len(action)), dtype=np.float64)
+        if self.length == len(self.states):
+            self._grow()
+        self.states[self.length] = state
+        self.actions[self.length] = action
+        self.length += 1
+
+    def clear(self):
+        self.length = 0
+
+
+def extract_trajectories(log_path, writer, features):
+    """
+    Stream the episodes of an eval log into a TrajectoryStoreWriter.
+
+    Parameters
+    ----------
+    log_path : str
+        path to a jsonlines eval log
+    writer : TrajectoryStoreWriter
+        destination of the extracted trajectories
+    features : list
+        feature definitions (name, info key path, optional subtracted info key path)
+
+    Returns
+    -------
+    int
+        number of trajectories written
+    """
+    buffer = EpisodeBuffer(len(features))
+    state = np.empty((len(features),), dtype=np.float64)
+    num_trajectories = 0
+
+    with open(log_path, 'r') as log:
+        for line in log:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            info = entry['info']
+
+            if info['failure'] or info['success']:
+                if buffer.length > 0:
+                    writer.append(np.arange(buffer.length), buffer.states[:buffer.length],
+                                  buffer.actions[:buffer.length])
+                    num_trajectories += 1
+                buffer.clear()
+                continue
+
+            for i, (_, path, ref_path) in enumerate(features):
+                state[i] = _lookup(info, path)
+                if ref_path is not None:
+                    state[i] -= _lookup(info, ref_path)
+            buffer.append(state, entry['actions'])
+
+    return num_trajectories
+
+
+def extract_to_store(log_path, store_path, preset='rejoin', features=None, input_names=None):
+    """extract an eval log into a new trajectory store with a preset or custom feature definitions"""
+    if features is None:
+        features = PRESETS[preset]
+
+    with TrajectoryStoreWriter(store_path, state_names=[f[0] for f in features], input_names=input_names) as writer:
+        num_trajectories = extract_trajectories(log_path, writer, features)
+
+    return num_trajectories
+
+
+if __name__ == '__main__':
+    preset_name = sys.argv[3] if len(sys.argv) > 3 else 'rejoin'
+    num_extracted = extract_to_store(sys.argv[1], sys.argv[2], preset=preset_name)
+    print("extracted {} trajectories to {}".format(num_extracted, sys.argv[2]))
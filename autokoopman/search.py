@@ -0,0 +1,192 @@
+"""
+Cached hyperparameter grid search for Koopman models with random Fourier feature (RFF) observables.
+
+Replaces the auto_koopman grid search of train_from_csv.py for obs_type='rff'. Three sources of repeated work are
+removed:
+  - lifted data matrices are computed once per (observable type, n_obs, bandwidth, seed, normalization) and training
+    set, and cached on disk across runs
+  - for every grid point and fold, a single SVD of the lifted data is shared by all rank values, since the truncated
+    DMDc solutions only differ in the number of singular triplets kept
+  - grid points run in parallel across a process pool
+Like the auto_koopman estimators, states are MinMax normalized to [-1, 1] with a scaler fit on the states of each
+training set. Validation errors are computed with the batched evaluator of batch_eval.py, in the original coordinates.
+"""
+
+import hashlib
+import itertools
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.preprocessing import MinMaxScaler
+
+from batch_eval import LiftedLinearModel, evaluate
+from export import scaler_parameters
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.koopman_cache')
+
+
+def _as_arrays(data):
+    """list of (states, inputs) arrays from autokoopman trajectories or (times, states, inputs) tuples"""
+    if hasattr(data, '_trajs'):
+        data = list(data._trajs.values())
+    arrays = []
+    for t in data:
+        if hasattr(t, 'states'):
+            arrays.append((np.asarray(t.states, dtype=np.float64), np.asarray(t.inputs, dtype=np.float64)))
+        else:
+            arrays.append((np.asarray(t[1], dtype=np.float64), np.asarray(t[2], dtype=np.float64)))
+    return arrays
+
+
+def _fingerprint(arrays):
+    digest = hashlib.sha1()
+    for states, inputs in arrays:
+        digest.update(np.ascontiguousarray(states).tobytes())
+        digest.update(np.ascontiguousarray(inputs).tobytes())
+    return digest.hexdigest()
+
+
+def normalization(arrays, feature_range=(-1, 1)):
+    """
+    MinMax normalization {'scale', 'offset'} fit on the states of all transitions, as fit by the auto_koopman
+    estimators with normalize=True.
+    """
+    scaler = MinMaxScaler(feature_range=feature_range)
+    scaler.fit(np.concatenate([states[:-1] for states, _ in arrays]))
+    return scaler_parameters(scaler)
+
+
+def rff_parameters(state_dim, n_obs, gamma, seed):
+    """RFF weights and phases, deterministic in (n_obs, gamma, seed)"""
+    rng = np.random.default_rng(seed)
+    w = np.sqrt(2 * gamma) * rng.normal(size=(n_obs, state_dim))
+    u = rng.uniform(0, 2 * np.pi, size=n_obs)
+    return w, u
+
+
+def lifted_data(arrays, n_obs, gamma, seed, cache_dir=CACHE_DIR, obs_type='rff', scale=None, offset=None):
+    """
+    Lifted snapshot matrices of all trajectories, loaded from the disk cache when available. States are normalized
+    with x_n = scale * x + offset before lifting if a normalization is given.
+
+    Returns a dict with the RFF parameters 'w' and 'u', the lifted states 'G' and successor states 'Gp' of all
+    transitions, the inputs 'U' and per trajectory row 'offsets'.
+    """
+    if obs_type != 'rff':
+        raise ValueError("unsupported observable type '{}'".format(obs_type))
+
+    normalization_key = None if scale is None else _fingerprint([(scale, offset)])
+    key = hashlib.sha1("{}-{}-{!r}-{}-{}-{}".format(
+        obs_type, n_obs, float(gamma), seed, normalization_key, _fingerprint(arrays)).encode()).hexdigest()
+    path = os.path.join(cache_dir, key + '.npz')
+    if os.path.isfile(path):
+        with np.load(path) as cached:
+            return {k: cached[k] for k in cached.files}
+
+    w, u = rff_parameters(arrays[0][0].shape[1], n_obs, gamma, seed)
+    model = LiftedLinearModel(None, None, w, u, scale=scale, offset=offset)
+
+    G, Gp, U, lengths = [], [], [], []
+    for states, inputs in arrays:
+        lifted = model.lift(model.normalize(states))
+        G.append(lifted[:-1])
+        Gp.append(lifted[1:])
+        U.append(inputs[:len(states) - 1])
+        lengths.append(len(states) - 1)
+
+    data = {
+        'w': w,
+        'u': u,
+        'G': np.concatenate(G),
+        'Gp': np.concatenate(Gp),
+        'U': np.concatenate(U),
+        'offsets': np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+    }
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # write to a temporary file first so parallel workers never read a partial cache entry
+    tmp_path = "{}.{}.tmp.npz".format(path[:-len('.npz')], os.getpid())
+    np.savez(tmp_path, **data)
+    os.replace(tmp_path, path)
+
+    return data
+
+
+def fit_ranks(G, Gp, U, ranks):
+    """
+    DMDc fits of [A B] for every rank from one SVD of the stacked lifted states and inputs.
+
+    Returns a dict rank -> (A, B).
+    """
+    Omega = np.concatenate([G, U], axis=1)
+    Uo, S, Vh = np.linalg.svd(Omega, full_matrices=False)
+    # project the successor states once, truncations only select leading columns
+    projected = Gp.T @ Uo
+
+    lift_dim = G.shape[1]
+    fits = {}
+    for rank in ranks:
+        r = min(rank, len(S))
+        AB = (projected[:, :r] / S[:r]) @ Vh[:r]
+        fits[rank] = (AB[:, :lift_dim], AB[:, lift_dim:])
+    return fits
+
+
+class _Trajectory:
+    """minimal trajectory container for batch_eval"""
+
+    def __init__(self, states, inputs):
+        self.states = states
+        self.inputs = inputs
+
+
+def _fit(arrays, n_obs, gamma, seed, ranks, normalize, cache_dir):
+    """LiftedLinearModels of every rank fit on the trajectories, with a normalization fit on their states"""
+    norm = normalization(arrays) if normalize else {}
+    data = lifted_data(arrays, n_obs, gamma, seed, cache_dir=cache_dir, **norm)
+    fits = fit_ranks(data['G'], data['Gp'], data['U'], ranks)
+    return {rank: LiftedLinearModel(A, B, data['w'], data['u'], **norm) for rank, (A, B) in fits.items()}
+
+
+def _evaluate_grid_point(args):
+    arrays, n_obs, gamma, seed, ranks, folds, normalize, cache_dir = args
+
+    errors = {rank: [] for rank in ranks}
+    for validation in folds:
+        validation_set = set(validation)
+        training = [arrays[i] for i in range(len(arrays)) if i not in validation_set]
+        models = _fit(training, n_obs, gamma, seed, ranks, normalize, cache_dir)
+
+        validation_trajectories = [_Trajectory(*arrays[i]) for i in validation]
+        for rank, model in models.items():
+            errors[rank].append(evaluate(model, validation_trajectories)['mean_error'])
+
+    return [((n_obs, gamma, seed, rank), float(np.mean(errors[rank]))) for rank in ranks]
+
+
+def search(data, n_obs=(200,), gammas=tuple(np.logspace(-3, 1, 5)), ranks=tuple(range(1, 200, 20)), seeds=(0,),
+           n_splits=5, normalize=True, workers=None, cache_dir=CACHE_DIR):
+    """
+    Grid search over RFF observables and DMDc ranks with n_splits fold cross validation over trajectories. With
+    normalize, models are fit on MinMax normalized states like auto_koopman(..., normalize=True).
+
+    Returns
+    -------
+    tuple
+        (model, best, results): the LiftedLinearModel of the best hyperparameters fit on all data, the best
+        hyperparameters as a dict and a list of ((n_obs, gamma, seed, rank), mean validation error) for the full grid
+    """
+    arrays = _as_arrays(data)
+    folds = [list(f) for f in np.array_split(np.arange(len(arrays)), n_splits) if len(f) > 0]
+
+    jobs = [(arrays, n, g, s, list(ranks), folds, normalize, cache_dir)
+            for n, g, s in itertools.product(n_obs, gammas, seeds)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = [r for point in executor.map(_evaluate_grid_point, jobs) for r in point]
+
+    (best_n_obs, best_gamma, best_seed, best_rank), _ = min(results, key=lambda r: r[1])
+    best = {'n_obs': best_n_obs, 'gamma': best_gamma, 'seed': best_seed, 'rank': best_rank}
+
+    model = _fit(arrays, best_n_obs, best_gamma, best_seed, [best_rank], normalize, cache_dir)[best_rank]
+
+    return model, best, results
@@ -7,12 +7,21 @@ import pandas as pd
 import torch
 from matplotlib import pyplot as plt
 from sklearn.metrics import mean_squared_error, mean_absolute_percentage_error, r2_score
-from numpy.linalg import norm
-import statistics
 
 from autokoopman import auto_koopman
 import autokoopman.core.trajectory as traj
 
+from export import export_surrogate
+from trajectory_store import TrajectoryStore
+from batch_eval import evaluate
+from search import search
+
+# use the cached parallel RFF grid search of search.py instead of auto_koopman
+USE_CACHED_SEARCH = True
+
+# MinMax normalize the training states, passed to both searches so that they fit the same models
+NORMALIZE = True
+
 """set the variable PATH to the directory with measurements folder"""
 PATH = os.getcwd()
 
@@ -29,14 +38,20 @@ def set_seed(seed=0):
     torch.use_deterministic_algorithms(True)
 
 
-def load_data(benchmark):
-    """load the measured data"""
+def load_data(benchmark, max_trajectories=100):
+    """load the measured data, from the <benchmark>.npz trajectory store if it exists"""
+
+    store_path = os.path.join(PATH, benchmark + '.npz')
+    if os.path.isfile(store_path):
+        store = TrajectoryStore(store_path)
+        indices = range(min(len(store), max_trajectories)) if max_trajectories is not None else None
+        return [traj.Trajectory(times * 0.02, states, inputs) for times, states, inputs in store.load(indices)]
 
     path = os.path.join(PATH, benchmark)
     cnt = 0
     data = []
 
-    while True:
+    while max_trajectories is None or cnt < max_trajectories:
         dirpath = os.path.join(path, 'measurement_' + str(cnt))
         if os.path.isdir(dirpath):
             states = np.asarray(pd.read_csv(os.path.join(dirpath, 'trajectory.csv')))
@@ -48,10 +63,6 @@ def load_data(benchmark):
         else:
             break
 
-    if len(data) > 100:
-        data = data[0:100]
-
-
     return data
 
 
@@ -88,7 +99,8 @@ def train_model(data):
         rank=(1,200,20),
         grid_param_slices=5,
         n_splits=5,
-        max_opt_iter=100
+        max_opt_iter=100,
+        normalize=NORMALIZE
     )
 
     # get the model from the experiment results
@@ -100,6 +112,22 @@ def train_model(data):
     return model
 
 
+def train_model_cached(data):
+    """train the Koopman model with the cached RFF grid search, same grid as train_model"""
+
+    model, best, _ = search(
+        data,
+        n_obs=(200,),
+        ranks=tuple(range(1, 200, 20)),
+        n_splits=5,
+        normalize=NORMALIZE
+    )
+
+    print(best)
+
+    return model
+
+
 def compute_trajectory(model, times, states, inputs, resample):
     test_traj = []
     test_traj.append(list(states[0]))
@@ -126,50 +154,13 @@ def compute_trajectory(model, times, states, inputs, resample):
     return np.array(test_traj)
     
 
-def compute_error(model, test_data):
+def compute_error(model, test_data, workers=None):
     """compute error between model prediction and real data"""
-    euc_norms = []
-
-    # loop over all test trajectories
-    tmp = list(test_data._trajs.values())
-
+    report = evaluate(model, test_data, workers=workers)
+    print("evaluated {} trajectories ({}) in {:.3f}s, {} diverged".format(
+        len(report['errors']), report['method'], report['time'], report['num_diverged']))
 
-    for t in tmp:
-        try:
-            # simulate using the learned model
-            iv = t.states[0, :]
-            start_time = t.times[0]
-            end_time = t.times[len(t.times) - 1]
-            teval = np.linspace(start_time, end_time, len(t.times))
-
-            trajectory = model.solve_ivp(
-                initial_state=iv,
-                tspan=(start_time, end_time),
-                sampling_period=t.times[1] - t.times[0],
-                inputs=t.inputs,
-                teval=teval
-            )
-
-            # compute error
-            y_true = np.matrix.flatten(t.states)
-            y_pred = np.matrix.flatten(trajectory.states)
-            euc_norm = norm(y_true - y_pred) / norm(y_true)
-            euc_norms.append(euc_norm)
-        except:
-            print("ERROR--solve_ivp failed (likely unstable model)")
-            # NOTE: Robot has constant 0 states, resulting in high error numbers (MSE is good)
-            euc_norms.append(np.infty)
-
-
-    '''
-    for t in tmp:
-        y_true = np.matrix.flatten(t.states)
-        y_pred = np.matrix.flatten(compute_trajectory(model, t.times, t.states, t.inputs, 1))
-        euc_norm = norm(y_true - y_pred) / norm(y_true)
-        euc_norms.append(euc_norm)
-    '''
-    
-    return statistics.mean(euc_norms)
+    return report['mean_error']
 
 
 def plot(trajectory, true_trajectory, var_1, var_2):
@@ -197,7 +188,7 @@ if __name__ == '__main__':
     training_data, test_data = split_data(data, 80)
 
     start = time.time()
-    model = train_model(training_data)
+    model = train_model_cached(training_data) if USE_CACHED_SEARCH else train_model(training_data)
     end = time.time()
 
 
@@ -209,6 +200,10 @@ if __name__ == '__main__':
     print(f"The average euc norm perc error is {round(euc_norm * 100, 2)}%")
     print("time taken: ", comp_time)
 
+    # save the model for use as a KoopmanSurrogateDynamics in SafeRL
+    # measurements are sampled once per environment step, the time rescaling in load_data only affects training
+    export_surrogate(model, os.path.join(PATH, benchmark + "_koopman.npz"), sampling_period=1)
+
     # loop over all test trajectories and plot
     tmp = list(test_data._trajs.values())
 
@@ -0,0 +1,187 @@
+"""
+Consolidated binary storage for Koopman training trajectories.
+
+All trajectories of a dataset are concatenated into three ragged arrays (times, states, inputs) indexed by an
+offsets array, trajectory i spanning rows offsets[i]:offsets[i + 1]. The arrays are saved uncompressed in a single
+.npz file, so the reader can memory map each member and only materializes the trajectories and columns requested.
+The writer streams trajectories to temporary files as they are appended, so writing a store only holds one
+trajectory in memory at a time.
+
+Usage:
+    python trajectory_store.py DubinsRejoin DubinsRejoin.npz    # convert measurement_<i> CSV directories
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+import numpy as np
+import pandas as pd
+
+ARRAYS = ['times', 'states', 'inputs']
+
+
+class TrajectoryStoreWriter:
+    """streams trajectories to temporary files and assembles them into a single store file on close"""
+
+    def __init__(self, path, state_names=None, input_names=None):
+        # np.savez appends the extension otherwise
+        self.path = path if path.endswith('.npz') else path + '.npz'
+        self.state_names = state_names
+        self.input_names = input_names
+        self.lengths = []
+
+        # rows of each array are appended to a temporary file next to the store, their row shapes fixed by the first
+        # trajectory
+        directory = os.path.dirname(os.path.abspath(self.path))
+        self.files = {name: tempfile.TemporaryFile(dir=directory) for name in ARRAYS}
+        self.row_shapes = {}
+
+    def append(self, times, states, inputs):
+        times = np.asarray(times, dtype=np.float64).reshape(-1)
+        states = np.asarray(states, dtype=np.float64)
+        inputs = np.asarray(inputs, dtype=np.float64)
+        if not len(times) == len(states) == len(inputs):
+            raise ValueError("times, states and inputs must have the same length, got {}, {} and {}".format(
+                len(times), len(states), len(inputs)))
+
+        rows = {'times': times, 'states': states.reshape(len(states), -1), 'inputs': inputs.reshape(len(inputs), -1)}
+        for name in ARRAYS:
+            row_shape = self.row_shapes.setdefault(name, rows[name].shape[1:])
+            if rows[name].shape[1:] != row_shape:
+                raise ValueError("{} rows of shape {} do not match the store's {} rows of shape {}".format(
+                    name, rows[name].shape[1:], name, row_shape))
+
+        for name in ARRAYS:
+            self.files[name].write(np.ascontiguousarray(rows[name]).tobytes())
+        self.lengths.append(len(times))
+
+    def close(self):
+        num_rows = int(np.sum(self.lengths, dtype=np.int64))
+        arrays = {'offsets': np.concatenate([[0], np.cumsum(self.lengths)]).astype(np.int64)}
+        if self.state_names is not None:
+            arrays['state_names'] = np.asarray(self.state_names, dtype=str)
+        if self.input_names is not None:
+            arrays['input_names'] = np.asarray(self.input_names, dtype=str)
+
+        # uncompressed so members can be memory mapped
+        with zipfile.ZipFile(self.path, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for name, array in arrays.items():
+                with archive.open(name + '.npy', 'w', force_zip64=True) as member:
+                    np.lib.format.write_array(member, array, allow_pickle=False)
+
+            for name in ARRAYS:
+                row_shape = self.row_shapes.get(name, () if name == 'times' else (0,))
+                header = {
+                    'descr': np.lib.format.dtype_to_descr(np.dtype(np.float64)),
+                    'fortran_order': False,
+                    'shape': (num_rows,) + row_shape,
+                }
+                with archive.open(name + '.npy', 'w', force_zip64=True) as member:
+                    np.lib.format.write_array_header_2_0(member, header)
+                    self.files[name].seek(0)
+                    shutil.copyfileobj(self.files[name], member)
+
+        self._close_files()
+
+    def _close_files(self):
+        # temporary files are deleted on close
+        for f in self.files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._close_files()
+
+
+def _memmap_npz(path):
+    """memory map every member of an uncompressed .npz file"""
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            name = info.filename[:-len('.npy')]
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError("store member '{}' is compressed and cannot be memory mapped".format(name))
+
+            # skip the local file header to the start of the .npy data
+            f.seek(info.header_offset)
+            local_header = f.read(30)
+            name_len = int.from_bytes(local_header[26:28], 'little')
+            extra_len = int.from_bytes(local_header[28:30], 'little')
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject:
+                raise ValueError("store member '{}' holds python objects".format(name))
+
+            if 0 in shape:
+                arrays[name] = np.zeros(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(f, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                                         order='F' if fortran_order else 'C')
+    return arrays
+
+
+class TrajectoryStore:
+    """memory mapped reader for stores written by TrajectoryStoreWriter"""
+
+    def __init__(self, path):
+        self.path = path
+        self.arrays = _memmap_npz(path)
+        self.offsets = np.asarray(self.arrays['offsets'])
+        self.state_names = list(self.arrays['state_names']) if 'state_names' in self.arrays else None
+        self.input_names = list(self.arrays['input_names']) if 'input_names' in self.arrays else None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def trajectory(self, i, state_columns=None, input_columns=None):
+        """return (times, states, inputs) of trajectory i, optionally restricted to the given columns"""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        times = np.array(self.arrays['times'][start:end])
+        states = self.arrays['states'][start:end]
+        inputs = self.arrays['inputs'][start:end]
+        states = np.array(states if state_columns is None else states[:, state_columns])
+        inputs = np.array(inputs if input_columns is None else inputs[:, input_columns])
+        return times, states, inputs
+
+    def load(self, indices=None, state_columns=None, input_columns=None):
+        """return a list of (times, states, inputs) for the requested trajectories, all if indices is None"""
+        if indices is None:
+            indices = range(len(self))
+        return [self.trajectory(i, state_columns, input_columns) for i in indices]
+
+
+def convert_measurements(measurement_dir, path):
+    """convert a directory of measurement_<i> CSV folders into a single store file"""
+    with TrajectoryStoreWriter(path) as writer:
+        cnt = 0
+        while True:
+            dirpath = os.path.join(measurement_dir, 'measurement_' + str(cnt))
+            if not os.path.isdir(dirpath):
+                break
+            states = pd.read_csv(os.path.join(dirpath, 'trajectory.csv'), header=None).to_numpy()
+            inputs = pd.read_csv(os.path.join(dirpath, 'input.csv'), header=None).to_numpy()
+            times = pd.read_csv(os.path.join(dirpath, 'time.csv'), header=None).to_numpy()
+            writer.append(times, states, inputs)
+            cnt += 1
+
+    return cnt
+
+
+if __name__ == '__main__':
+    num_converted = convert_measurements(sys.argv[1], sys.argv[2])
+    print("converted {} trajectories to {}".format(num_converted, sys.argv[2]))
@@ -159,11 +159,26 @@ class CWHOriented2dActuatorSet(BaseActuatorSet):
 
 
 class CWHOriented2dDynamics(CWH2dDynamics):
+    # indices of the translational states (x, y, x_dot, y_dot) within the oriented state vector
+    POS_VEL_IDX = (0, 1, 3, 4)
+
     def __init__(self, ang_vel_limit, m=12, n=0.001027, integration_method='RK45'):
         self.ang_vel_limit = ang_vel_limit
 
         super().__init__(m=m, n=n, integration_method=integration_method)
 
+        # embed the translational dynamics in the full 6d state so derivatives can be computed in place
+        self.A_full = np.zeros((6, 6), dtype=np.float64)
+        self.B_full = np.zeros((6, 2), dtype=np.float64)
+        self.A_full[np.ix_(self.POS_VEL_IDX, self.POS_VEL_IDX)] = self.A
+        self.B_full[self.POS_VEL_IDX, :] = self.B
+        self._thrust_rows = [(i, float(self.B_full[i, 0]), float(self.B_full[i, 1]))
+                             for i in range(6) if self.B_full[i].any()]
+
+        # preallocated buffers for fixed step integration
+        self._rk4_k = np.zeros((4, 6), dtype=np.float64)
+        self._rk4_tmp = np.zeros((6,), dtype=np.float64)
+
     def step(self, step_size, state, control):
         state = super().step(step_size, state, control)
 
@@ -178,31 +193,111 @@ class CWHOriented2dDynamics(CWH2dDynamics):
 
         return state
 
-    def dx(self, t, state_vec, control):
-        state_cur = CWHOriented2dState(vector=state_vec, vector_deep_copy=False)
-
-        pos_vel_state_vec = np.array([state_cur.x, state_cur.y, state_cur.x_dot, state_cur.y_dot], dtype=np.float64)
-
-        thrust_vector = control[0] * np.array([math.cos(state_cur.theta), math.sin(state_cur.theta)])
-        pos_vel_derivative = np.matmul(self.A, pos_vel_state_vec) + np.matmul(self.B, thrust_vector)
+    def propagate(self, state_vec, control, step_size, num_steps):
+        # thrust direction depends on orientation, the linear closed form solution of the parent does not apply
+        raise NotImplementedError("CWHOriented2dDynamics does not support closed form propagation")
 
+    def dx(self, t, state_vec, control):
+        # a new array is returned as ODE solvers may hold on to previous derivative evaluations
+        out = np.empty((6,), dtype=np.float64)
+        self.dx_into(state_vec, control, out)
+        return out
+
+    def dx_into(self, state_vec, control, out):
+        """
+        Computes the state derivative into a preallocated output vector without constructing any state objects.
+
+        Parameters
+        ----------
+        state_vec : numpy.ndarray
+            state vector [x, y, theta, x_dot, y_dot, theta_dot]
+        control : numpy.ndarray
+            control vector [thrust, reaction_wheel]
+        out : numpy.ndarray
+            length 6 array the state derivative is written to
+
+        Returns
+        -------
+        numpy.ndarray
+            out
+        """
+        np.dot(self.A_full, state_vec, out=out)
+
+        theta = state_vec[2]
+        thrust_x = control[0] * math.cos(theta)
+        thrust_y = control[0] * math.sin(theta)
+        for i, b_x, b_y in self._thrust_rows:
+            out[i] += b_x * thrust_x + b_y * thrust_y
+
+        theta_dot = state_vec[5]
         theta_dot_dot = control[1]
 
         # check angular velocity limit
-        if state_cur.theta_dot >= self.ang_vel_limit:
+        if theta_dot >= self.ang_vel_limit:
             theta_dot_dot = min(0, theta_dot_dot)
-            state_cur.theta_dot = self.ang_vel_limit
-        elif state_cur.theta_dot <= -self.ang_vel_limit:
+            theta_dot = self.ang_vel_limit
+        elif theta_dot <= -self.ang_vel_limit:
             theta_dot_dot = max(0, theta_dot_dot)
-            state_cur.theta_dot = -self.ang_vel_limit
-
-        state_derivative = CWHOriented2dState(
-            x=pos_vel_derivative[0],
-            y=pos_vel_derivative[1],
-            theta=state_cur.theta_dot,
-            x_dot=pos_vel_derivative[2],
-            y_dot=pos_vel_derivative[3],
-            theta_dot=theta_dot_dot,
-        )
-
-        return state_derivative.vector
+            theta_dot = -self.ang_vel_limit
+
+        out[2] = theta_dot
+        out[5] = theta_dot_dot
+
+        return out
+
+    def dx_batch(self, t, state_vecs, controls):
+        """
+        Vectorized state derivative for a batch of states.
+
+        Parameters
+        ----------
+        t : float
+            time, unused as the dynamics are time invariant
+        state_vecs : numpy.ndarray
+            (N, 6) array of state vectors
+        controls : numpy.ndarray
+            (N, 2) array of control vectors or a single (2,) control vector applied to every state
+
+        Returns
+        -------
+        numpy.ndarray
+            (N, 6) array of state derivatives
+        """
+        controls = np.broadcast_to(controls, (state_vecs.shape[0], 2))
+        theta = state_vecs[:, 2]
+
+        thrust = np.empty((state_vecs.shape[0], 2), dtype=np.float64)
+        thrust[:, 0] = controls[:, 0] * np.cos(theta)
+        thrust[:, 1] = controls[:, 0] * np.sin(theta)
+
+        out = state_vecs @ self.A_full.T + thrust @ self.B_full.T
+
+        theta_dot = state_vecs[:, 5]
+        theta_dot_dot = controls[:, 1]
+        upper = theta_dot >= self.ang_vel_limit
+        lower = theta_dot <= -self.ang_vel_limit
+
+        out[:, 2] = np.clip(theta_dot, -self.ang_vel_limit, self.ang_vel_limit)
+        out[:, 5] = np.where(upper, np.minimum(0, theta_dot_dot),
+                             np.where(lower, np.maximum(0, theta_dot_dot), theta_dot_dot))
+
+        return out
+
+    def rk4_step(self, step_size, state_vec, control):
+        k = self._rk4_k
+        tmp = self._rk4_tmp
+
+        self.dx_into(state_vec, control, k[0])
+        np.multiply(k[0], step_size / 2, out=tmp)
+        tmp += state_vec
+        self.dx_into(tmp, control, k[1])
+        np.multiply(k[1], step_size / 2, out=tmp)
+        tmp += state_vec
+        self.dx_into(tmp, control, k[2])
+        np.multiply(k[2], step_size, out=tmp)
+        tmp += state_vec
+        self.dx_into(tmp, control, k[3])
+
+        k[1] *= 2
+        k[2] *= 2
+        return state_vec + step_size / 6 * k.sum(axis=0)
@@ -229,6 +229,88 @@ class Dubins2dDynamics(BaseODESolverDynamics):
 
         return dx_vec
 
+    def dx_batch(self, t, state_vecs, controls):
+        """
+        Vectorized state derivative for an (N, 4) batch of states and (N, 2) batch of controls.
+        """
+        dx_vecs = np.empty_like(state_vecs)
+        dx_vecs[:, 0] = state_vecs[:, 3] * np.cos(state_vecs[:, 2])
+        dx_vecs[:, 1] = state_vecs[:, 3] * np.sin(state_vecs[:, 2])
+        dx_vecs[:, 2] = controls[:, 0]
+        dx_vecs[:, 3] = controls[:, 1]
+        return dx_vecs
+
+    def step_batch(self, step_size, state_vecs, controls, v_min=None, v_max=None):
+        """
+        Steps an (N, 4) batch of states in place with the same throttle trimming as step.
+        Only fixed step integration ('Euler' or 'RK4') is supported.
+
+        Parameters
+        ----------
+        step_size : float
+            integration step size
+        state_vecs : numpy.ndarray
+            (N, 4) array of state vectors, updated in place
+        controls : numpy.ndarray
+            (N, 2) array of controls, throttle is trimmed in place
+        v_min : numpy.ndarray
+            (N,) array of minimum velocities, defaults to the dynamics v_min
+        v_max : numpy.ndarray
+            (N,) array of maximum velocities, defaults to the dynamics v_max
+
+        Returns
+        -------
+        numpy.ndarray
+            state_vecs
+        """
+        v_min = self.v_min if v_min is None else v_min
+        v_max = self.v_max if v_max is None else v_max
+
+        v = state_vecs[:, 3]
+        throttle = controls[:, 1]
+        trimmed = np.where(v + 2*throttle < v_min, (v_min - v) / 2, throttle)
+        trimmed = np.where(v + 2*throttle > v_max, (v_max - v) / 2, trimmed)
+        controls[:, 1] = trimmed
+
+        if self.integration_method == 'Euler':
+            state_vecs += step_size * self.dx_batch(0, state_vecs, controls)
+        elif self.integration_method == 'RK4':
+            k1 = self.dx_batch(0, state_vecs, controls)
+            k2 = self.dx_batch(step_size / 2, state_vecs + step_size / 2 * k1, controls)
+            k3 = self.dx_batch(step_size / 2, state_vecs + step_size / 2 * k2, controls)
+            k4 = self.dx_batch(step_size, state_vecs + step_size * k3, controls)
+            state_vecs += step_size / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        else:
+            raise ValueError("batched stepping does not support integration method '{}'".format(
+                self.integration_method))
+
+        return state_vecs
+
+    def propagate(self, state_vec, control, step_size, num_steps):
+        x, y, heading, v = state_vec
+        rudder, throttle = control
+
+        # closed form solution only exists for constant velocity, which the throttle trimming in step guarantees
+        # only for zero throttle within the velocity limits
+        if throttle != 0 or not (self.v_min <= v <= self.v_max):
+            raise ValueError("closed form propagation requires zero throttle and velocity within limits")
+
+        t = step_size * np.arange(1, num_steps + 1)
+        heading_t = heading + rudder * t
+
+        states = np.empty((num_steps, 4), dtype=np.float64)
+        if rudder == 0:
+            states[:, 0] = x + v * math.cos(heading) * t
+            states[:, 1] = y + v * math.sin(heading) * t
+        else:
+            turn_radius = v / rudder
+            states[:, 0] = x + turn_radius * (np.sin(heading_t) - math.sin(heading))
+            states[:, 1] = y - turn_radius * (np.cos(heading_t) - math.cos(heading))
+        states[:, 2] = heading_t
+        states[:, 3] = v
+
+        return states
+
 
 """
 3D Dubins Implementation
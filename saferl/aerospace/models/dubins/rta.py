@@ -7,16 +7,16 @@ from saferl.environment.models.geometry import angle_wrap
 
 class RTADubins2dCollision(SimplexModule):
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, rta_on_dist=200, rta_off_dist=250, **kwargs):
+        super().__init__(**kwargs)
         self.projection_window = 11  # seconds
         self.projection_frequency = 10
         self.watch_list = ['lead']
         self.platform_name = 'wingman'
         self.turn_rate = np.deg2rad(6)
 
-        self.rta_on_dist = 200
-        self.rta_off_dist = 250
+        self.rta_on_dist = rta_on_dist
+        self.rta_off_dist = rta_off_dist
 
         self.projection_numpoints = \
             self.projection_window * self.projection_frequency + 1
@@ -103,12 +103,11 @@ class RTADubins2dCollision(SimplexModule):
         return traj
 
     def generate_info(self):
-        info = {
-            'rta_traj': self.rta_traj,
-            'watch_traj': self.watch_traj
-        }
+        info_ret = super().generate_info()
 
-        info_parent = super().generate_info()
-        info_ret = {**info_parent, **info}
+        # projected trajectories are large, only include them in sampled debug steps
+        if self.debug_info_active:
+            info_ret['rta_traj'] = self.rta_traj
+            info_ret['watch_traj'] = self.watch_traj
 
         return info_ret
@@ -1 +1 @@
-from saferl.aerospace.tasks import rejoin, docking  # noqa: F401
+from saferl.aerospace.tasks import rejoin, docking, formation  # noqa: F401
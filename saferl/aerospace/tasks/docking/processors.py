@@ -6,6 +6,7 @@ from saferl.aerospace.models.integrators.integrator_3d import Integrator3d
 from saferl.aerospace.models.cwhspacecraft.platforms import CWHSpacecraft2d, CWHSpacecraft3d, CWHSpacecraftOriented2d
 from saferl.environment.tasks.processor import ObservationProcessor, RewardProcessor, StatusProcessor
 from saferl.environment.models.geometry import distance
+from saferl.environment.models.events import DistanceEvent
 
 # --------------------- Observation Processors ------------------------
 
@@ -206,13 +207,19 @@ class DockingDistanceStatusProcessor(StatusProcessor):
 
 
 class InDockingStatusProcessor(StatusProcessor):
-    def __init__(self, name=None, deputy=None, docking_region=None):
+    def __init__(self, name=None, deputy=None, docking_region=None, entry_event=False, event_substeps=10):
         super().__init__(name=name)
         self.docking_region = docking_region
         self.deputy = deputy
 
+        # optionally detect docking region entries between step endpoints
+        self.entry_event = None
+        if entry_event:
+            self.entry_event = DistanceEvent(name, target=docking_region, direction=-1, substeps=event_substeps)
+
     def reset(self, sim_state):
-        pass
+        if self.entry_event is not None:
+            sim_state.env_objs[self.deputy].register_event(self.entry_event)
 
     def _increment(self, sim_state, step_size):
         # status derived directly from simulation state. No state machine necessary
@@ -220,6 +227,8 @@ class InDockingStatusProcessor(StatusProcessor):
 
     def _process(self, sim_state):
         in_docking = sim_state.env_objs[self.docking_region].contains(sim_state.env_objs[self.deputy])
+        if self.entry_event is not None:
+            in_docking = in_docking or self.entry_event.triggered
         return in_docking
 
 
@@ -0,0 +1 @@
+from saferl.aerospace.tasks.formation import task, processors  # noqa: F401
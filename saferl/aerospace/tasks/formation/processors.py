@@ -0,0 +1,269 @@
+import gym.spaces
+import math
+import numpy as np
+
+from saferl.environment.tasks.processor import ObservationProcessor, RewardProcessor, StatusProcessor
+
+"""
+Batched processors of the multi-agent formation task. Per-agent values are computed for all wingmen in one pass and
+returned as arrays ordered like the 'wingmen' list, i.e. (N,) statuses and rewards and (N, k) observations.
+"""
+
+
+def platform_states(sim_state, names):
+    return np.array([sim_state.env_objs[name].state.vector for name in names], dtype=np.float64)
+
+
+def positions(sim_state, names):
+    return np.array([sim_state.env_objs[name].position[0:2] for name in names], dtype=np.float64)
+
+
+# --------------------- Observation Processors ------------------------
+
+class FormationObservationProcessor(ObservationProcessor):
+    """
+    Per-wingman observations in the wingman body frame: slot relative position (2), lead velocity (2), own speed (1)
+    and nearest aircraft relative position (2). The nearest aircraft is read from the '<separation>.neighbor.<wingman>'
+    status keys of a PairwiseSeparationStatusProcessor.
+    """
+
+    def __init__(self,
+                 name=None,
+                 lead=None,
+                 wingmen=None,
+                 slots=None,
+                 separation_status=None,
+                 normalization=None,
+                 clip=None,
+                 post_processors=None):
+
+        # Initialize member variables from config
+        self.lead = lead
+        self.wingmen = wingmen
+        self.slots = slots
+        self.neighbor_keys = ["{}.neighbor.{}".format(separation_status, wingman) for wingman in wingmen]
+
+        # Invoke parent's constructor
+        super().__init__(name=name, normalization=normalization, clip=clip, post_processors=post_processors)
+
+        # Add default normalization
+        if not self.has_normalization:
+            self._add_normalization([1000, 1000, 100, 100, 100, 1000, 1000])
+
+    def define_observation_space(self) -> gym.spaces.Box:
+        return gym.spaces.Box(low=-math.inf, high=math.inf, shape=(7,))
+
+    def _process(self, sim_state):
+        wingmen = platform_states(sim_state, self.wingmen)
+        lead = sim_state.env_objs[self.lead].state.vector
+        cos_h, sin_h = np.cos(wingmen[:, 2]), np.sin(wingmen[:, 2])
+
+        def to_body(vectors):
+            return np.stack([cos_h * vectors[:, 0] + sin_h * vectors[:, 1],
+                             -sin_h * vectors[:, 0] + cos_h * vectors[:, 1]], axis=1)
+
+        neighbors = [sim_state.status[key] for key in self.neighbor_keys]
+
+        slot_rel = to_body(positions(sim_state, self.slots) - wingmen[:, 0:2])
+        lead_velocity = lead[3] * np.array([math.cos(lead[2]), math.sin(lead[2])])
+        lead_vel_body = to_body(np.broadcast_to(lead_velocity, (len(self.wingmen), 2)))
+        nearest_rel = to_body(positions(sim_state, neighbors) - wingmen[:, 0:2])
+
+        obs = np.concatenate([
+            slot_rel,
+            lead_vel_body,
+            wingmen[:, 3:4],
+            nearest_rel,
+        ], axis=1)
+
+        return obs
+
+
+# --------------------- Reward Processors ------------------------
+
+class FormationStatusRewardProcessor(RewardProcessor):
+    """
+    Per-wingman reward proportional to an (N,) status array, e.g. a bool array of wingmen in their slots.
+    """
+
+    def __init__(self, name=None, reward=None, status=None):
+        super().__init__(name=name, reward=reward)
+        self.status = status
+
+    def _increment(self, sim_state, step_size):
+        # reward derived straight from status dict, therefore no state machine necessary
+        pass
+
+    def _process(self, sim_state):
+        return self.reward * np.asarray(sim_state.status[self.status], dtype=np.float64)
+
+
+class FormationDistanceChangeRewardProcessor(RewardProcessor):
+    """
+    Per-wingman reward proportional to the decrease of an (N,) distance status array since the last step.
+    """
+
+    def __init__(self, name=None, scale=None, distance_status=None):
+        super().__init__(name=name, reward=0)
+        self.scale = scale
+        self.distance_status = distance_status
+        self.prev_distance = None
+        self.curr_distance = None
+
+    def reset(self, sim_state):
+        super().reset(sim_state)
+        self.prev_distance = sim_state.status[self.distance_status]
+        self.curr_distance = self.prev_distance
+
+    def _increment(self, sim_state, step_size):
+        self.prev_distance = self.curr_distance
+        self.curr_distance = sim_state.status[self.distance_status]
+
+    def _process(self, sim_state):
+        return self.scale * (self.prev_distance - self.curr_distance)
+
+
+# --------------------- Status Processors ------------------------
+
+class FormationSlotDistance(StatusProcessor):
+    """
+    (N,) array of distances from each wingman to its formation slot.
+    """
+
+    def __init__(self, name=None, wingmen=None, slots=None):
+        super().__init__(name=name)
+        assert len(wingmen) == len(slots), "every wingman requires a slot"
+        self.wingmen = wingmen
+        self.slots = slots
+
+    def reset(self, sim_state):
+        pass
+
+    def _increment(self, sim_state, step_size):
+        # status derived directly from simulation state, therefore no state machine needed
+        pass
+
+    def _process(self, sim_state):
+        return np.linalg.norm(positions(sim_state, self.wingmen) - positions(sim_state, self.slots), axis=1)
+
+
+class FormationInSlot(StatusProcessor):
+    """
+    (N,) bool array of wingmen within the radius of their slot.
+    """
+
+    def __init__(self, name=None, slots=None, slot_distance=None):
+        super().__init__(name=name)
+        self.slots = slots
+        self.slot_distance_key = slot_distance
+        self.radii = None
+
+    def reset(self, sim_state):
+        self.radii = np.array([sim_state.env_objs[slot].radius for slot in self.slots], dtype=np.float64)
+
+    def _increment(self, sim_state, step_size):
+        # status derived directly from simulation state, therefore no state machine needed
+        pass
+
+    def _process(self, sim_state):
+        return sim_state.status[self.slot_distance_key] <= self.radii
+
+
+class FormationLeadDistance(StatusProcessor):
+    """
+    (N,) array of distances from each wingman to the lead.
+    """
+
+    def __init__(self, name=None, lead=None, wingmen=None):
+        super().__init__(name=name)
+        self.lead = lead
+        self.wingmen = wingmen
+
+    def reset(self, sim_state):
+        pass
+
+    def _increment(self, sim_state, step_size):
+        # status derived directly from simulation state, therefore no state machine needed
+        pass
+
+    def _process(self, sim_state):
+        lead_position = sim_state.env_objs[self.lead].position[0:2]
+        return np.linalg.norm(positions(sim_state, self.wingmen) - lead_position, axis=1)
+
+
+class FormationCrashed(StatusProcessor):
+    """
+    (N,) bool array of wingmen in a violating pair of a PairwiseSeparationStatusProcessor.
+    """
+
+    def __init__(self, name=None, wingmen=None, separation_status=None):
+        super().__init__(name=name)
+        self.wingmen = wingmen
+        self.violating_pairs_key = "{}.violating_pairs".format(separation_status)
+
+    def reset(self, sim_state):
+        pass
+
+    def _increment(self, sim_state, step_size):
+        # status derived directly from simulation state, therefore no state machine needed
+        pass
+
+    def _process(self, sim_state):
+        violating = set(name for pair in sim_state.status[self.violating_pairs_key] for name in pair)
+        return np.array([wingman in violating for wingman in self.wingmen], dtype=bool)
+
+
+class FormationTime(StatusProcessor):
+    """
+    Time all wingmen have continuously been in their slots.
+    """
+
+    def __init__(self, name=None, in_slot=None):
+        super().__init__(name=name)
+        self.in_slot_key = in_slot
+
+    def reset(self, sim_state):
+        self.formation_time = 0
+
+    def _increment(self, sim_state, step_size):
+        if np.all(sim_state.status[self.in_slot_key]):
+            self.formation_time += step_size
+        else:
+            self.formation_time = 0
+
+    def _process(self, sim_state):
+        return self.formation_time
+
+
+class FormationFailureStatus(StatusProcessor):
+    """
+    Formation failure: 'crash' when any two aircraft violate the safety margin, 'timeout' and 'distance' when any
+    wingman is at least max_goal_distance from the lead.
+    """
+
+    def __init__(self, name=None, separation_status=None, lead_distance=None, time_elapsed=None, timeout=None,
+                 max_goal_distance=None):
+        super().__init__(name=name)
+        self.violating_pairs_key = "{}.violating_pairs".format(separation_status)
+        self.lead_distance_key = lead_distance
+        self.time_elapsed_key = time_elapsed
+        self.timeout = timeout
+        self.max_goal_dist = max_goal_distance
+
+    def reset(self, sim_state):
+        pass
+
+    def _increment(self, sim_state, step_size):
+        # status derived directly from simulation state, therefore no state machine needed
+        pass
+
+    def _process(self, sim_state):
+        failure = False
+        if sim_state.status[self.violating_pairs_key]:
+            failure = 'crash'
+        elif sim_state.status[self.time_elapsed_key] > self.timeout:
+            failure = 'timeout'
+        elif np.any(sim_state.status[self.lead_distance_key] >= self.max_goal_dist):
+            failure = 'distance'
+
+        return failure
@@ -0,0 +1,149 @@
+import copy
+import numpy as np
+
+try:
+    from ray.rllib.env.multi_agent_env import MultiAgentEnv
+except ImportError:
+    # allows importing saferl for ray-free policy evaluation
+    MultiAgentEnv = object
+
+from saferl.aerospace.models.dubins.platforms import Dubins2dPlatform, Dubins2dDynamics
+from saferl.environment.models.platforms import BasePlatform
+from saferl.environment.models.scene import SceneGraph
+from saferl.environment.tasks.env import BaseEnv
+from saferl.environment.tasks.processor.status import PairwiseSeparationStatusProcessor
+
+
+class DubinsFormation(BaseEnv, MultiAgentEnv):
+    """
+    Multi-agent formation flight task. A group of wingmen, each controlled by an agent, must take up slots in a
+    formation behind a passive lead aircraft without violating the safety margin between any two aircraft.
+
+    Status, rewards and observations are produced by the configured processors and managers. Processors of
+    per-agent values are batched: they return arrays over the 'agents' list, which are split into the per-agent
+    dicts of the MultiAgentEnv interface.
+
+    All aircraft share a single struct-of-arrays state store: each Dubins2dPlatform state vector is a view into one
+    row of the store, so the whole formation is integrated with one batched dynamics step.
+    """
+
+    def __init__(self, env_config):
+        self.agent_ids = list(env_config['agents'])
+        self.max_init_attempts = env_config.get('max_init_attempts', 100)
+        self.integration_method = env_config.get('integration_method', 'RK4')
+
+        # the first agent provides the action space shared by all agents
+        env_config = dict(env_config)
+        env_config.setdefault('agent', self.agent_ids[0])
+
+        super().__init__(env_config)
+
+    def _setup_scheduler(self, env_config):
+        self.platforms = [obj for obj in self.env_objs.values() if isinstance(obj, BasePlatform)]
+        for platform in self.platforms:
+            if not isinstance(platform, Dubins2dPlatform):
+                raise ValueError("formation platform '{}' must be a Dubins2dPlatform".format(platform.name))
+        self.agents = [self.env_objs[agent_id] for agent_id in self.agent_ids]
+        self.agent_indices = [self.platforms.index(agent) for agent in self.agents]
+
+        # struct-of-arrays state store, one row per platform
+        self.state_store = np.zeros((len(self.platforms), 4), dtype=np.float64)
+        self.control_store = np.zeros((len(self.platforms), 2), dtype=np.float64)
+        self.v_min = np.array([platform.dynamics.v_min for platform in self.platforms], dtype=np.float64)
+        self.v_max = np.array([platform.dynamics.v_max for platform in self.platforms], dtype=np.float64)
+        self.dynamics = Dubins2dDynamics(integration_method=self.integration_method)
+
+        self.scene_graph = SceneGraph(self.env_objs)
+
+        self.separation = next((p for p in self.status_manager.processors
+                                if isinstance(p, PairwiseSeparationStatusProcessor)), None)
+
+    def reset(self):
+        obs = super().reset()
+        return self._split(obs)
+
+    def step(self, action_dict):
+        obs, reward, done, info = super().step(action_dict)
+        reward = np.broadcast_to(reward, (len(self.agent_ids),))
+
+        obs_dict = self._split(obs)
+        reward_dict = {agent_id: float(reward[i]) for i, agent_id in enumerate(self.agent_ids)}
+        done_dict = {agent_id: done for agent_id in self.agent_ids}
+        done_dict['__all__'] = done
+        info_dict = {agent_id: self._agent_info(info, i) for i, agent_id in enumerate(self.agent_ids)}
+
+        return obs_dict, reward_dict, done_dict, info_dict
+
+    def _step_sim(self, action):
+        # agent controls, other platforms are passive and fly with zero control
+        self.control_store[:] = 0
+        for agent, i in zip(self.agents, self.agent_indices):
+            agent.current_actuation = agent.controller.gen_actuation(agent.state, action.get(agent.name))
+            self.control_store[i] = agent.actuator_set.gen_control(agent.current_actuation)
+            agent.untrimmed_control = np.copy(self.control_store[i])
+
+        self.dynamics.step_batch(self.step_size, self.state_store, self.control_store, v_min=self.v_min,
+                                 v_max=self.v_max)
+
+        for i, platform in enumerate(self.platforms):
+            platform.current_control = np.copy(self.control_store[i])
+            platform.mark_pose_changed()
+
+        self.scene_graph.flush()
+
+    def _initialize(self):
+        resample = self.initializers
+        for _ in range(self.max_init_attempts):
+            for initializer in resample:
+                initializer.initialize()
+
+            # resample agents in separation violations until none remain, passive platforms are never resampled
+            violating = self._violating_platforms()
+            if not violating:
+                break
+            violating_objs = [self.env_objs[name] for name in violating]
+            resample = [initializer for initializer in self.initializers
+                        if any(initializer.env_obj is obj for obj in violating_objs)]
+        else:
+            raise ValueError("failed to initialize the formation without separation violations in {} attempts, "
+                             "violating platforms: {}".format(self.max_init_attempts, sorted(violating)))
+
+        self._bind_states()
+
+    def _violating_platforms(self):
+        if self.separation is None:
+            return set()
+
+        sim_state = copy.copy(self.sim_state)
+        sim_state.status = {}
+        self.separation.reset(sim_state)
+        self.separation.process(sim_state)
+
+        violating_pairs = sim_state.status[self.separation.violating_pairs_key]
+        return set(name for pair in violating_pairs for name in pair if name in self.agent_ids)
+
+    def _bind_states(self):
+        # point each platform's state vector at its row of the state store
+        for i, platform in enumerate(self.platforms):
+            self.state_store[i] = platform.state.vector
+            platform.reset(vector=self.state_store[i], vector_deep_copy=False)
+        self.control_store[:] = 0
+
+    def _split(self, obs):
+        return {agent_id: obs[i] for i, agent_id in enumerate(self.agent_ids)}
+
+    def _agent_info(self, info, agent_idx):
+        """
+        Info of a single agent, with the per-agent arrays of batched status and reward processors indexed.
+        """
+        def agent_value(value):
+            if isinstance(value, dict):
+                return {k: agent_value(v) for k, v in value.items()}
+            if isinstance(value, np.ndarray) and value.ndim == 1 and len(value) == len(self.agent_ids):
+                return value[agent_idx].item()
+            return value
+
+        agent_info = dict(info)
+        agent_info['status'] = agent_value(info['status'])
+        agent_info['reward'] = agent_value(info['reward'])
+        return agent_info
@@ -5,6 +5,7 @@ from scipy.spatial.transform import Rotation
 
 from saferl.environment.tasks.processor import ObservationProcessor, RewardProcessor, StatusProcessor
 from saferl.environment.models.geometry import distance
+from saferl.environment.models.events import DistanceEvent
 from saferl.environment.utils import vec2magnorm
 
 
@@ -393,7 +394,8 @@ class DubinsLeadDistance(StatusProcessor):
 class DubinsFailureStatus(StatusProcessor):
     def __init__(self, name=None, lead_distance=None, time_elapsed=None, safety_margin=None,
                  timeout=None, max_goal_distance=None, on_leave_rejoin=False, in_rejoin="in_rejoin",
-                 in_rejoin_prev="in_rejoin_prev"):
+                 in_rejoin_prev="in_rejoin_prev", crash_event=False, wingman="wingman", lead="lead",
+                 event_substeps=10, separation_status=None):
         super().__init__(name=name)
         # Initialize member variables from config
         self.lead_distance_key = lead_distance
@@ -404,8 +406,20 @@ class DubinsFailureStatus(StatusProcessor):
         self.on_leave_rejoin = on_leave_rejoin
         self.in_rejoin_key = in_rejoin
         self.in_rejoin_prev_key = in_rejoin_prev
+        self.wingman = wingman
+        self.separation_status_key = separation_status
+
+        # optionally detect safety margin violations between step endpoints
+        self.crash_event = None
+        if crash_event:
+            self.crash_event = DistanceEvent("{}.crash".format(name), target=lead,
+                                             threshold=safety_margin['aircraft'], direction=-1,
+                                             substeps=event_substeps)
 
     def reset(self, sim_state):
+        if self.crash_event is not None:
+            sim_state.env_objs[self.wingman].register_event(self.crash_event)
+
         # reset state
         self.lead_distance = sim_state.status[self.lead_distance_key]
         self.time_elapsed = sim_state.status[self.time_elapsed_key]
@@ -423,6 +437,11 @@ class DubinsFailureStatus(StatusProcessor):
         failure = False
         if self.lead_distance < self.safety_margin['aircraft']:
             failure = 'crash'
+        elif self.crash_event is not None and self.crash_event.triggered:
+            failure = 'crash'
+        elif self.separation_status_key is not None and \
+                sim_state.status[self.separation_status_key] < self.safety_margin['aircraft']:
+            failure = 'crash'
         elif self.time_elapsed > self.timeout:
             failure = 'timeout'
         elif self.lead_distance >= self.max_goal_dist:
@@ -1 +1,2 @@
-from saferl.environment import utils, models, tasks, callbacks   # noqa: F401
+# callbacks depend on ray and are imported explicitly by the training scripts
+from saferl.environment import utils, models, tasks, logs   # noqa: F401
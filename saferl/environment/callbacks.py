@@ -5,8 +5,12 @@ from ray.rllib.agents.callbacks import DefaultCallbacks
 from ray.rllib.env import BaseEnv
 from ray.rllib.evaluation import MultiAgentEpisode, RolloutWorker
 from ray.rllib.policy import Policy
-from saferl.environment.utils import jsonify, is_jsonable, log_to_jsonlines
+from saferl.environment.utils import to_jsonable
+from saferl.environment.logs.columnar import ColumnarLogWriter
+from saferl.environment.logs.writer import BackgroundLogWriter
 
+import atexit
+import os
 import time
 from enum import Enum
 
@@ -44,12 +48,22 @@ def build_callbacks_caller(callbacks: []):  # noqa C901
     return CallbacksCaller
 
 
+def episode_info(episode):
+    """
+    Last info of the first agent in the episode. Episode level entries (success, failure, status) are shared by
+    all agents in multi-agent environments.
+    """
+    agents = episode.get_agents()
+    return episode.last_info_for(agents[0]) if agents else episode.last_info_for()
+
+
 class EpisodeOutcomeCallback:
     def on_episode_end(self, *, worker: RolloutWorker, base_env: BaseEnv,
                        policies: Dict[str, Policy], episode: MultiAgentEpisode,
                        env_index: int, **kwargs):
-        episode.custom_metrics["outcome/success"] = int(episode.last_info_for()['success'])
-        episode.custom_metrics["outcome/failure"] = int(bool(episode.last_info_for()['failure']))
+        info = episode_info(episode)
+        episode.custom_metrics["outcome/success"] = int(info['success'])
+        episode.custom_metrics["outcome/failure"] = int(bool(info['failure']))
 
 
 class FailureCodeCallback:
@@ -62,26 +76,29 @@ class FailureCodeCallback:
                        policies: Dict[str, Policy], episode: MultiAgentEpisode,
                        env_index: int, **kwargs):
 
-        if episode.last_info_for()['failure']:
+        failure = episode_info(episode)['failure']
+        if failure:
             for failure_code in self.failure_codes:
-                episode.custom_metrics["failure_code_ratio/{}".format(failure_code)] = int(
-                    episode.last_info_for()['failure'] == failure_code)
+                episode.custom_metrics["failure_code_ratio/{}".format(failure_code)] = int(failure == failure_code)
 
 
 class RewardComponentsCallback:
     def on_episode_end(self, *, worker: RolloutWorker, base_env: BaseEnv,
                        policies: Dict[str, Policy], episode: MultiAgentEpisode,
                        env_index: int, **kwargs):
-        ep_info = episode.last_info_for()
-        for reward_comp_name, reward_comp_val in ep_info['reward']['components']['total'].items():
-            episode.custom_metrics['reward_component_totals/{}'.format(reward_comp_name)] = reward_comp_val
+        # component totals are summed over all agents
+        for agent_id in episode.get_agents():
+            ep_info = episode.last_info_for(agent_id)
+            for reward_comp_name, reward_comp_val in ep_info['reward']['components']['total'].items():
+                metric_name = 'reward_component_totals/{}'.format(reward_comp_name)
+                episode.custom_metrics[metric_name] = episode.custom_metrics.get(metric_name, 0) + reward_comp_val
 
 
 class StatusCustomMetricsCallback:
     def on_episode_end(self, *, worker: RolloutWorker, base_env: BaseEnv,
                        policies: Dict[str, Policy], episode: MultiAgentEpisode,
                        env_index: int, **kwargs):
-        status = episode.last_info_for()['status']
+        status = episode_info(episode)['status']
         custom_metric_keys = [k for k in status.keys() if 'custom_metrics.' in k]
         for k in custom_metric_keys:
             metric_name = k.split('.', 1)[1]
@@ -103,7 +120,7 @@ class ConstraintViolationMetricsCallback:
                         episode: MultiAgentEpisode, env_index: int, **kwargs):
         if episode.length == 0:
             return
-        status = episode.last_info_for()['status']
+        status = episode_info(episode)['status']
         if self.constraint_keys is None:
             self.constraint_keys = [k for k in status.keys() if 'constraint' in k]
 
@@ -126,6 +143,19 @@ class ConstraintViolationMetricsCallback:
             episode.custom_metrics[ratio_name] = violation_ratio
 
 
+class RTATelemetryCallback:
+    def on_episode_end(self, *, worker: RolloutWorker, base_env: BaseEnv,
+                       policies: Dict[str, Policy], episode: MultiAgentEpisode,
+                       env_index: int, **kwargs):
+        env = base_env.get_unwrapped()[env_index]
+        for obj_name, obj in env.env_objs.items():
+            rta = getattr(obj, 'rta', None)
+            if rta is None:
+                continue
+            for metric_name, metric_val in rta.telemetry.summary().items():
+                episode.custom_metrics["rta/{}/{}".format(obj_name, metric_name)] = metric_val
+
+
 class LogContents(Enum):
     """
     Simple Enum class for log contents options
@@ -140,12 +170,31 @@ class LogContents(Enum):
 class LoggingCallback:
     """
     A callback class to handle the storage of episode states by episode
+
+    Every worker keeps its log open. jsonlines records are encoded and written by a BackgroundLogWriter thread in
+    batches of log_batch_size, handed over at the latest at episode end. When more than max_pending batches wait to be
+    written, sampling blocks ('block' backpressure) or the batches are dropped ('drop').
+
+    With log_format 'columnar', every worker writes a columnar log (see saferl.environment.logs.columnar) flushed
+    every chunk_size steps instead of appending jsonlines entries.
     """
 
     def __init__(self, num_logging_workers: int = 999999, episode_log_interval: int = 1,
-                 contents: tuple = (LogContents.VERBOSE,)):
+                 contents: tuple = (LogContents.VERBOSE,), log_format: str = "jsonlines", chunk_size: int = 4096,
+                 log_batch_size: int = 256, max_pending: int = 64, backpressure: str = "block"):
+        if log_format not in ("jsonlines", "columnar"):
+            raise ValueError("invalid log_format '{}', should be 'jsonlines' or 'columnar'".format(log_format))
         self.num_logging_workers = num_logging_workers
         self.episode_log_interval = episode_log_interval
+        self.log_format = log_format
+        self.chunk_size = chunk_size
+        self.log_batch_size = log_batch_size
+        self.max_pending = max_pending
+        self.backpressure = backpressure
+
+        # log writers by path and the writer of every open episode
+        self.writers = dict()
+        self.episode_writers = dict()
 
         self.worker_episode_numbers = dict()
         self.episode_count = 0
@@ -170,45 +219,94 @@ class LoggingCallback:
     def on_episode_step(self, *, worker: "RolloutWorker", base_env: BaseEnv, episode: MultiAgentEpisode,
                         env_index: Optional[int] = None, **kwargs) -> None:
 
-        if episode.episode_id not in self.worker_episode_numbers:
-            self.worker_episode_numbers[episode.episode_id] = self.episode_count
-            self.episode_count += 1
-
-        # get environment instance and set up log path
         episode_id = episode.episode_id
-        worker_index = worker.worker_index
-
-        # determine output location
-        if worker.policy_config["in_evaluation"]:
-            output_dir = worker._original_kwargs["log_dir"] + "../evaluation_logs/"
-        else:
-            output_dir = worker._original_kwargs["log_dir"] + "../training_logs/"
-
-        worker_file = "worker_" + str(worker_index) + ".log"
-        step_num = episode.length
+        if episode_id not in self.worker_episode_numbers:
+            self.worker_episode_numbers[episode_id] = self.episode_count
+            self.episode_count += 1
 
         # handle logging options
-        if worker_index <= self.num_logging_workers \
+        if worker.worker_index <= self.num_logging_workers \
                 and self.worker_episode_numbers[episode_id] % self.episode_log_interval == 0 \
-                and step_num:
-            state = {}
-            if self.log_actions:
-                state["actions"] = episode.last_action_for('agent0').tolist()  # TODO: 'agent0' should not be hardcoded
-            if self.log_obs:
-                state["obs"] = episode.last_raw_obs_for('agent0').tolist()
-            if self.log_info:
-                # check if jsonable and convert if necessary
-                info = episode.last_info_for('agent0')
-
-                if is_jsonable(info) is True:
-                    state["info"] = info
-                else:
-                    state["info"] = jsonify(info)
-
-            state["episode_ID"] = episode_id
-            state["step_number"] = step_num
-            state["worker_episode_number"] = self.worker_episode_numbers[episode_id]
-            state["time"] = time.time()
+                and episode.length:
+            state = self._log_entry(episode)
 
             # save environment state to file
-            log_to_jsonlines(state, output_dir, worker_file)
+            writer = self._writer(worker, episode_id)
+            if self.log_format == "columnar":
+                writer.write(state, episode=episode_id)
+            else:
+                writer.write(state)
+
+    def _log_entry(self, episode):
+        """
+        Log entry of the last step of an episode, with the configured contents.
+        """
+        # single agent episodes keep the flat log format, multi-agent entries are keyed by agent id
+        agents = episode.get_agents()
+        multi_agent = len(agents) > 1
+
+        def per_agent(getter):
+            if multi_agent:
+                return {agent_id: getter(agent_id) for agent_id in agents}
+            return getter(agents[0])
+
+        # columnar logs store numpy values directly
+        raw = self.log_format == "columnar"
+
+        def to_log(array):
+            return array if raw else array.tolist()
+
+        state = {}
+        if self.log_actions:
+            state["actions"] = per_agent(lambda agent_id: to_log(episode.last_action_for(agent_id)))
+        if self.log_obs:
+            state["obs"] = per_agent(lambda agent_id: to_log(episode.last_raw_obs_for(agent_id)))
+        if self.log_info:
+            info = per_agent(episode.last_info_for)
+            state["info"] = info if raw else to_jsonable(info)
+
+        state["episode_ID"] = episode.episode_id
+        state["step_number"] = episode.length
+        state["worker_episode_number"] = self.worker_episode_numbers[episode.episode_id]
+        state["time"] = time.time()
+
+        return state
+
+    def _writer(self, worker, episode_id):
+        """
+        Log writer of an episode, shared by all episodes of the worker. The worker's log is opened on first use.
+        """
+        if episode_id not in self.episode_writers:
+            # determine output location
+            if worker.policy_config["in_evaluation"]:
+                output_dir = worker._original_kwargs["log_dir"] + "../evaluation_logs/"
+            else:
+                output_dir = worker._original_kwargs["log_dir"] + "../training_logs/"
+            path = output_dir + "worker_" + str(worker.worker_index) + ".log"
+
+            if path not in self.writers:
+                os.makedirs(output_dir, exist_ok=True)
+                self.writers[path] = self._open_writer(path)
+            self.episode_writers[episode_id] = self.writers[path]
+        return self.episode_writers[episode_id]
+
+    def _open_writer(self, path):
+        # append to logs of earlier runs of the worker
+        if self.log_format == "columnar":
+            writer = ColumnarLogWriter(path, chunk_size=self.chunk_size, episode_key="episode_ID", auto_end=False,
+                                       mode="a")
+            atexit.register(writer.close)
+            return writer
+        return BackgroundLogWriter(path, batch_size=self.log_batch_size, max_pending=self.max_pending,
+                                   backpressure=self.backpressure, mode="a")
+
+    def on_episode_end(self, *, worker: RolloutWorker, base_env: BaseEnv,
+                       policies: Dict[str, Policy], episode: MultiAgentEpisode,
+                       env_index: int, **kwargs):
+        writer = self.episode_writers.pop(episode.episode_id, None)
+        if writer is None:
+            return
+        if self.log_format == "columnar":
+            writer.end_episode(episode.episode_id)
+        else:
+            writer.flush(wait=False)
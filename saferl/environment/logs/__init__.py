@@ -0,0 +1 @@
+from saferl.environment.logs import columnar, writer, index, replay, compaction  # noqa: F401
@@ -0,0 +1,487 @@
+"""
+Chunked columnar binary format for rollout logs.
+
+A columnar log is a zip archive of NumPy arrays. Log entries (the nested dicts written by scripts/eval.py and
+LoggingCallback) are flattened into columns keyed by '/' joined paths, e.g. 'info/status/success'. Whole episodes are
+buffered into chunks of at least chunk_size steps, and every chunk is appended to the archive as one compressed
+array per column plus an episode offset table:
+
+    chunk_000000/episodes.npy                   structured (episode, start, length) rows
+    chunk_000000/num/info/status/success.npy    fixed shape numeric column, (steps, ...) array
+    chunk_000000/str/info/failure.npy           string column
+    chunk_000000/ragged_values/<column>.npy     numeric column of varying shape, flattened values...
+    chunk_000000/ragged_shapes/<column>.npy     ...and the (steps, ndim) shape of every value
+    chunk_000000/json/<column>.npy              fallback for mixed type or missing values, JSON text per step
+
+Archives compacted by saferl.environment.logs.compaction additionally use delta encoded ('delta', 'delta_scale' and
+'xor') and dictionary encoded ('dict_codes', 'dict_values') columns, which are decoded by the same reader.
+
+Column types are inferred once per chunk, so no per value type dispatch or text conversion happens while writing.
+The archive is closed after every chunk and is therefore always readable, at most the unflushed chunk is lost if the
+writing process dies.
+"""
+
+import json
+import os
+import re
+import shutil
+import zipfile
+import numpy as np
+
+SEPARATOR = '/'
+EPISODE_DTYPE = np.dtype([('episode', np.int64), ('start', np.int64), ('length', np.int64)])
+KINDS = ('num', 'str', 'ragged_values', 'ragged_shapes', 'json', 'delta', 'delta_scale', 'xor', 'dict_codes',
+         'dict_values')
+
+_MISSING = object()
+_SCALAR_TYPES = (bool, int, float, np.number, np.bool_)
+
+
+def flatten(entry, prefix=''):
+    """
+    Flatten a nested dict into a dict of '/' joined key paths to leaf values.
+    """
+    flat = {}
+    for key, value in entry.items():
+        name = prefix + str(key)
+        if isinstance(value, dict) and value:
+            flat.update(flatten(value, name + SEPARATOR))
+        else:
+            flat[name] = value
+    return flat
+
+
+def unflatten(flat):
+    """
+    Inverse of flatten, for keys without '/' in them.
+    """
+    entry = {}
+    for name, value in flat.items():
+        node = entry
+        *parents, leaf = name.split(SEPARATOR)
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[leaf] = value
+    return entry
+
+
+def _json_default(value):
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError("{} is not JSON serializable".format(type(value).__name__))
+
+
+def encode_column(values, name=None, starts=None):
+    """
+    Encode the values of one column across the steps of a chunk.
+
+    Parameters
+    ----------
+    values : list
+        the column value of every step of the chunk
+    name : str
+        column name, unused by the default encoding
+    starts : list
+        first row of every episode in the chunk, unused by the default encoding
+
+    Returns
+    -------
+    dict
+        kind -> array of the encoded column
+
+    Notes
+    -----
+    Numeric values are stored in one array of their common dtype: a column mixing int and float values, e.g. a reward
+    component that is an int 0 until its first nonzero value, is read back as floats. Bools are only stored as numbers
+    in columns of bools, columns mixing bools and numbers fall back to JSON. The same holds for the elements of
+    array values.
+    """
+    if all(v is not _MISSING and v is not None and isinstance(v, _SCALAR_TYPES) for v in values) \
+            and len({isinstance(v, (bool, np.bool_)) for v in values}) == 1:
+        return {'num': np.asarray(values)}
+    if all(isinstance(v, str) for v in values):
+        return {'str': np.asarray(values, dtype=np.str_)}
+
+    if all(isinstance(v, (list, tuple, np.ndarray)) for v in values):
+        arrays = [np.asarray(v) for v in values]
+        if all(a.dtype.kind in 'biuf' for a in arrays) and len({a.dtype.kind == 'b' for a in arrays}) == 1:
+            shapes = {a.shape for a in arrays}
+            if len(shapes) == 1:
+                return {'num': np.stack(arrays)}
+            if len({a.ndim for a in arrays}) == 1:
+                return {
+                    'ragged_values': np.concatenate([a.ravel() for a in arrays]),
+                    'ragged_shapes': np.array([a.shape for a in arrays], dtype=np.int64).reshape(len(arrays), -1),
+                }
+
+    # missing values are read back as None
+    return {'json': np.asarray([json.dumps(None if v is _MISSING else v, default=_json_default) for v in values],
+                               dtype=np.str_)}
+
+
+def _write_array(archive, name, array):
+    with archive.open(name, 'w', force_zip64=True) as f:
+        np.lib.format.write_array(f, np.ascontiguousarray(array), allow_pickle=False)
+
+
+def _read_array(archive, name):
+    with archive.open(name, 'r') as f:
+        return np.lib.format.read_array(f, allow_pickle=False)
+
+
+class ColumnarLogWriter:
+    """
+    Writer of columnar rollout logs with the write / write_all / close interface of jsonlines.Writer.
+
+    Entries are grouped into episodes by their episode_key value. With auto_end, an episode ends as soon as an entry
+    of another episode is written, which suits sequential rollouts. For interleaved episodes, e.g. several
+    environments per RLlib worker, disable auto_end and call end_episode explicitly.
+    """
+
+    # log entries may hold numpy values, no JSON conversion is needed
+    accepts_numpy = True
+
+    def __init__(self, path, chunk_size=4096, episode_key='rollout_num', auto_end=True, compress=True, mode='w',
+                 encoder=encode_column):
+        """
+        Parameters
+        ----------
+        path : str
+            path of the log archive
+        chunk_size : int
+            minimum number of steps per chunk, chunks always hold whole episodes
+        episode_key : str
+            top level entry key holding the integer episode id
+        auto_end : bool
+            end the current episode when an entry of another episode is written
+        compress : bool
+            deflate compress the column arrays
+        mode : str
+            'w' to truncate an existing log or 'a' to append chunks to it
+        encoder : callable
+            column encoder with the signature of encode_column
+        """
+        assert mode in ('w', 'a'), "mode must be 'w' or 'a'"
+        self.path = path
+        self.chunk_size = chunk_size
+        self.episode_key = episode_key
+        self.auto_end = auto_end
+        self.compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        self.encoder = encoder
+
+        self.open_episodes = {}
+        self.current_episode = None
+
+        self.chunk_rows = []
+        self.chunk_episodes = []
+
+        self.num_chunks = 0
+        if mode == 'a' and os.path.isfile(path):
+            with zipfile.ZipFile(path, 'r') as archive:
+                self.num_chunks = len(_chunk_names(archive))
+        else:
+            # an empty archive is a valid log without episodes
+            with zipfile.ZipFile(path, 'w'):
+                pass
+
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, entry, episode=None):
+        """
+        Append one step entry.
+
+        Parameters
+        ----------
+        entry : dict
+            nested log entry
+        episode : int
+            episode id, read from entry[episode_key] if None
+        """
+        if episode is None:
+            episode = entry[self.episode_key]
+
+        if self.auto_end and self.current_episode is not None and episode != self.current_episode:
+            self.end_episode(self.current_episode)
+        self.current_episode = episode
+
+        self.open_episodes.setdefault(episode, []).append(flatten(entry))
+
+    def write_all(self, entries):
+        for entry in entries:
+            self.write(entry)
+
+    def end_episode(self, episode):
+        """
+        Move a finished episode into the current chunk, flushing the chunk once it holds chunk_size steps.
+        """
+        rows = self.open_episodes.pop(episode, None)
+        if episode == self.current_episode:
+            self.current_episode = None
+        if not rows:
+            return
+
+        self.chunk_episodes.append((episode, len(self.chunk_rows), len(rows)))
+        self.chunk_rows += rows
+
+        if len(self.chunk_rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Append the buffered episodes to the archive as one chunk.
+        """
+        if not self.chunk_rows:
+            return
+
+        columns = {}
+        for row in self.chunk_rows:
+            for name in row:
+                columns.setdefault(name, None)
+
+        prefix = "chunk_{:06d}/".format(self.num_chunks)
+        with zipfile.ZipFile(self.path, 'a', compression=self.compression) as archive:
+            _write_array(archive, prefix + 'episodes.npy', np.array(self.chunk_episodes, dtype=EPISODE_DTYPE))
+            for name in columns:
+                encoded = self.encoder([row.get(name, _MISSING) for row in self.chunk_rows], name=name,
+                                       starts=[start for _, start, _ in self.chunk_episodes])
+                for kind, array in encoded.items():
+                    _write_array(archive, "{}{}/{}.npy".format(prefix, kind, name), array)
+
+        self.num_chunks += 1
+        self.chunk_rows = []
+        self.chunk_episodes = []
+
+    def close(self):
+        """
+        End all open episodes and flush the last chunk.
+        """
+        if self.closed:
+            return
+        for episode in list(self.open_episodes.keys()):
+            self.end_episode(episode)
+        self.flush()
+        self.closed = True
+
+
+def _chunk_names(archive):
+    return sorted({name.split('/', 1)[0] for name in archive.namelist() if name.startswith('chunk_')})
+
+
+class ColumnarLogReader:
+    """
+    Reader of columnar rollout logs, returning per episode column arrays.
+
+    Numeric and string columns are returned as arrays with one row per step, ragged columns as lists of arrays and
+    JSON fallback columns as lists of values.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.archive = zipfile.ZipFile(path, 'r')
+
+        self.chunk_names = _chunk_names(self.archive)
+        chunk_indices = {chunk_name: i for i, chunk_name in enumerate(self.chunk_names)}
+
+        # column name -> kind -> archive entry name, per chunk
+        self.chunk_columns = [{} for _ in self.chunk_names]
+        pattern = re.compile(r'^(chunk_\d+)/({})/(.+)\.npy$'.format('|'.join(KINDS)))
+        for name in self.archive.namelist():
+            match = pattern.match(name)
+            if match is not None:
+                chunk_name, kind, column = match.groups()
+                self.chunk_columns[chunk_indices[chunk_name]].setdefault(column, {})[kind] = name
+
+        tables = []
+        for chunk_index, chunk_name in enumerate(self.chunk_names):
+            episodes = _read_array(self.archive, chunk_name + '/episodes.npy')
+            table = np.empty((len(episodes),), dtype=[('chunk', np.int64)] + EPISODE_DTYPE.descr)
+            table['chunk'] = chunk_index
+            for field in EPISODE_DTYPE.names:
+                table[field] = episodes[field]
+            tables.append(table)
+
+        # episode offset table of the whole log: chunk, episode id, start row within the chunk, length
+        if tables:
+            self.episode_table = np.concatenate(tables)
+        else:
+            self.episode_table = np.zeros((0,), dtype=[('chunk', np.int64)] + EPISODE_DTYPE.descr)
+
+        self._cached_chunk = None
+        self._cached_arrays = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.archive.close()
+
+    def __len__(self):
+        return len(self.episode_table)
+
+    @property
+    def episode_ids(self):
+        return self.episode_table['episode']
+
+    @property
+    def columns(self):
+        names = set()
+        for columns in self.chunk_columns:
+            names.update(columns.keys())
+        return sorted(names)
+
+    def _chunk_array(self, chunk, name):
+        # chunks are mostly read sequentially, keep the arrays of the last one
+        if chunk != self._cached_chunk:
+            self._cached_chunk = chunk
+            self._cached_arrays = {}
+        if name not in self._cached_arrays:
+            self._cached_arrays[name] = _read_array(self.archive, name)
+        return self._cached_arrays[name]
+
+    def _read_column(self, chunk, start, length, kinds):
+        if 'num' in kinds:
+            return self._chunk_array(chunk, kinds['num'])[start:start + length]
+        if 'str' in kinds:
+            return self._chunk_array(chunk, kinds['str'])[start:start + length]
+        if 'ragged_values' in kinds:
+            values = self._chunk_array(chunk, kinds['ragged_values'])
+            shapes = self._chunk_array(chunk, kinds['ragged_shapes'])
+            offsets = np.concatenate([[0], np.cumsum(np.prod(shapes, axis=1))])
+            return [values[offsets[i]:offsets[i + 1]].reshape(shapes[i]) for i in range(start, start + length)]
+        if 'delta' in kinds:
+            # the first row of every episode holds the absolute quantized value
+            deltas = self._chunk_array(chunk, kinds['delta'])[start:start + length]
+            return np.cumsum(deltas, axis=0) * self._chunk_array(chunk, kinds['delta_scale'])
+        if 'xor' in kinds:
+            bits = self._chunk_array(chunk, kinds['xor'])[start:start + length]
+            return np.bitwise_xor.accumulate(bits, axis=0).view(np.float64)
+        if 'dict_codes' in kinds:
+            vocabulary = [json.loads(text) for text in self._chunk_array(chunk, kinds['dict_values'])]
+            return [vocabulary[code] for code in self._chunk_array(chunk, kinds['dict_codes'])[start:start + length]]
+        return [json.loads(text) for text in self._chunk_array(chunk, kinds['json'])[start:start + length]]
+
+    def episode(self, index, columns=None):
+        """
+        Parameters
+        ----------
+        index : int
+            position of the episode in the log
+        columns : list
+            names of the columns to read, all by default
+
+        Returns
+        -------
+        dict
+            column name -> per step values
+        """
+        chunk, _, start, length = self.episode_table[index]
+        chunk_columns = self.chunk_columns[chunk]
+        names = chunk_columns.keys() if columns is None else columns
+        return {name: self._read_column(chunk, start, length, chunk_columns[name])
+                for name in names if name in chunk_columns}
+
+    def episodes(self, columns=None):
+        for index in range(len(self)):
+            yield self.episode(index, columns=columns)
+
+    def episode_entries(self, index):
+        """
+        Episode as a list of nested log entries, as parsed from a jsonlines log.
+        """
+        data = self.episode(index)
+        length = int(self.episode_table[index]['length'])
+        entries = []
+        for i in range(length):
+            flat = {}
+            for name, values in data.items():
+                value = values[i]
+                if isinstance(value, np.ndarray):
+                    value = value.tolist()
+                elif isinstance(value, np.generic):
+                    value = value.item()
+                flat[name] = value
+            entries.append(unflatten(flat))
+        return entries
+
+
+def is_columnar_log(path):
+    """
+    True for columnar logs, which are zip archives, and False for jsonlines logs.
+    """
+    return zipfile.is_zipfile(path)
+
+
+def merge_logs(paths, output_path, remove=False):
+    """
+    Concatenate columnar logs chunk by chunk, preserving their order.
+    """
+    with zipfile.ZipFile(output_path, 'w', compression=zipfile.ZIP_DEFLATED) as merged:
+        num_chunks = 0
+        for path in paths:
+            with zipfile.ZipFile(path, 'r') as archive:
+                for chunk_name in _chunk_names(archive):
+                    prefix = "chunk_{:06d}/".format(num_chunks)
+                    for name in archive.namelist():
+                        if name.startswith(chunk_name + '/'):
+                            with archive.open(name, 'r') as src, \
+                                    merged.open(prefix + name.split('/', 1)[1], 'w', force_zip64=True) as dst:
+                                shutil.copyfileobj(src, dst)
+                    num_chunks += 1
+            if remove:
+                os.remove(path)
+
+
+def convert_jsonlines(log_path, output_path, chunk_size=4096, episode_key=None, interleaved=False):
+    """
+    Convert a jsonlines log written by scripts/eval.py or LoggingCallback to the columnar format.
+
+    Parameters
+    ----------
+    log_path : str
+        path of the jsonlines log
+    output_path : str
+        path of the columnar log to write
+    chunk_size : int
+        minimum number of steps per chunk
+    episode_key : str
+        entry key of the episode id, by default 'rollout_num' for eval logs and 'episode_ID' for training logs. Logs
+        without either start a new episode at every step_number 1.
+    interleaved : bool
+        True if entries of several episodes are interleaved, as in training logs of workers with several environments.
+        Episodes are then only ended at the end of the log.
+
+    Returns
+    -------
+    int
+        number of converted steps
+    """
+    import jsonlines
+
+    num_steps = 0
+    episode_count = -1
+    with jsonlines.open(log_path, 'r') as log, \
+            ColumnarLogWriter(output_path, chunk_size=chunk_size, auto_end=not interleaved) as writer:
+        for entry in log:
+            if episode_key is None:
+                episode_key = next((k for k in ('rollout_num', 'episode_ID') if k in entry), '')
+
+            if episode_key in entry:
+                episode = entry[episode_key]
+            else:
+                if entry.get('step_number') == 1 or episode_count < 0:
+                    episode_count += 1
+                episode = episode_count
+
+            writer.write(entry, episode=episode)
+            num_steps += 1
+
+    return num_steps
@@ -0,0 +1,221 @@
+"""
+Compaction of jsonlines rollout logs into compressed columnar archives for long term storage.
+
+Logs are converted to the columnar format of saferl.environment.logs.columnar with additional column encodings:
+  - slowly varying float channels (positions, velocities, angles and observations by default) are quantized to a
+    configurable precision and delta encoded within every episode. Deltas of the integer quantized values are summed
+    exactly when decoding, so decoded values lie exactly on the quantization grid, within precision / 2 of the
+    original, without drift along the episode. With precision None, channels are delta encoded losslessly by
+    XOR of consecutive float64 bit patterns.
+  - string and mixed type scalar columns, e.g. failure codes, are dictionary encoded
+  - all other columns (integers, booleans, other floats) are stored exactly
+The episode index (episode id and number, length, success, failure) is stored in the archive. Compacted logs are
+read through LogReader like any other log, or decompressed back to jsonlines.
+"""
+
+import fnmatch
+import json
+import os
+import time
+import zipfile
+import numpy as np
+
+from saferl.environment.logs.columnar import ColumnarLogWriter, ColumnarLogReader, encode_column, _MISSING, \
+    _write_array
+from saferl.environment.logs.index import LogReader, INDEX_FIELDS
+
+DEFAULT_PRECISION = 1e-3
+DEFAULT_CHANNELS = (
+    '*/x', '*/y', '*/z', '*/x_dot', '*/y_dot', '*/z_dot',
+    '*/heading', '*/gamma', '*/roll', '*/v', '*/theta', '*/theta_dot',
+    'obs', 'obs/*',
+)
+
+
+class CompactionEncoder:
+    """
+    Column encoder for ColumnarLogWriter applying channel delta encoding and dictionary encoding.
+    """
+
+    def __init__(self, precision=DEFAULT_PRECISION, channels=DEFAULT_CHANNELS):
+        """
+        Parameters
+        ----------
+        precision : float
+            quantization step of channels, None for lossless delta encoding
+        channels : list
+            fnmatch patterns of the '/' joined column names of channels
+        """
+        self.precision = precision
+        self.channels = channels
+
+    def is_channel(self, name):
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in self.channels)
+
+    def __call__(self, values, name=None, starts=None):
+        if any(isinstance(v, str) for v in values) \
+                and all(v is _MISSING or v is None or isinstance(v, (str, bool, int, float)) for v in values):
+            return self._dictionary(values)
+
+        encoded = encode_column(values)
+        if 'num' in encoded and encoded['num'].dtype.kind == 'f' and name is not None and self.is_channel(name):
+            return self._delta(encoded['num'], starts)
+        return encoded
+
+    def _dictionary(self, values):
+        texts = [json.dumps(None if v is _MISSING else v) for v in values]
+        vocabulary, codes = np.unique(texts, return_inverse=True)
+        return {'dict_codes': codes.astype(np.int32), 'dict_values': vocabulary.astype(np.str_)}
+
+    def _delta(self, array, starts):
+        array = array.astype(np.float64)
+        first_rows = np.zeros((len(array),), dtype=bool)
+        first_rows[starts if starts else [0]] = True
+
+        if self.precision is None:
+            bits = array.view(np.uint64)
+            deltas = bits.copy()
+            deltas[1:] ^= bits[:-1]
+            deltas[first_rows] = bits[first_rows]
+            return {'xor': deltas}
+
+        if not np.all(np.isfinite(array)):
+            # non finite values cannot be quantized
+            return {'num': array}
+
+        quantized = np.round(array / self.precision).astype(np.int64)
+        deltas = quantized.copy()
+        deltas[1:] -= quantized[:-1]
+        deltas[first_rows] = quantized[first_rows]
+
+        # narrow deltas of slowly varying channels compress better
+        if np.all(np.abs(deltas) < 2 ** 31):
+            deltas = deltas.astype(np.int32)
+        return {'delta': deltas, 'delta_scale': np.float64(self.precision)}
+
+
+def compact_log(log_path, output_path, precision=DEFAULT_PRECISION, channels=DEFAULT_CHANNELS, chunk_size=16384):
+    """
+    Compact a jsonlines (or columnar) log into a compressed columnar archive.
+
+    Parameters
+    ----------
+    log_path : str
+        path of the log to compact
+    output_path : str
+        path of the archive to write
+    precision : float
+        quantization step of channels, None for lossless compaction
+    channels : list
+        fnmatch patterns of the '/' joined column names of channels, e.g. 'info/wingman/x'
+    chunk_size : int
+        minimum number of steps per chunk
+
+    Returns
+    -------
+    int
+        number of compacted steps
+    """
+    num_steps = 0
+    encoder = CompactionEncoder(precision=precision, channels=channels)
+    with LogReader(log_path) as reader:
+        with ColumnarLogWriter(output_path, chunk_size=chunk_size, auto_end=False, encoder=encoder) as writer:
+            for i, episode in enumerate(reader):
+                episode_id = int(reader.episode_ids[i])
+                for entry in episode:
+                    writer.write(entry, episode=episode_id)
+                writer.end_episode(episode_id)
+                num_steps += len(episode)
+
+        with zipfile.ZipFile(output_path, 'a', compression=zipfile.ZIP_DEFLATED) as archive:
+            for field in INDEX_FIELDS:
+                _write_array(archive, 'index/{}.npy'.format(field), reader.index[field])
+
+    return num_steps
+
+
+def decompress_log(path, output_path):
+    """
+    Write a compacted archive back to a jsonlines log.
+    """
+    import jsonlines
+
+    with LogReader(path) as reader, jsonlines.open(output_path, 'w') as writer:
+        for episode in reader:
+            writer.write_all(episode)
+
+
+def _compare(original, decoded, tolerance, path=''):
+    if isinstance(original, dict):
+        if not isinstance(decoded, dict) or set(original.keys()) != set(decoded.keys()):
+            return path or '/'
+        for key in original:
+            mismatch = _compare(original[key], decoded[key], tolerance, path + '/' + str(key))
+            if mismatch is not None:
+                return mismatch
+        return None
+
+    if isinstance(original, float) and not isinstance(decoded, bool) and isinstance(decoded, (int, float)):
+        # allow for the rounding of the decoded grid value
+        return None if abs(original - decoded) <= tolerance + 1e-12 * abs(original) or original == decoded else path
+    if isinstance(original, list) and isinstance(decoded, list) and len(original) == len(decoded):
+        for i, (o, d) in enumerate(zip(original, decoded)):
+            mismatch = _compare(o, d, tolerance, "{}/{}".format(path, i))
+            if mismatch is not None:
+                return mismatch
+        return None
+    return None if original == decoded else path
+
+
+def verify_compaction(log_path, compacted_path, precision=DEFAULT_PRECISION):
+    """
+    Check that every field of a compacted log decodes to its original value, exactly or, for quantized channels,
+    within precision / 2.
+
+    Raises
+    ------
+    ValueError
+        at the first mismatching field
+    """
+    tolerance = 0 if precision is None else precision / 2
+    with LogReader(log_path) as original, LogReader(compacted_path) as compacted:
+        if len(original) != len(compacted):
+            raise ValueError("compacted log holds {} episodes, the original log {}".format(
+                len(compacted), len(original)))
+        for i in range(len(original)):
+            for step, (entry, decoded) in enumerate(zip(original.episode(i), compacted.episode(i))):
+                mismatch = _compare(entry, decoded, tolerance)
+                if mismatch is not None:
+                    raise ValueError("field '{}' of step {} of episode {} differs after compaction".format(
+                        mismatch, step, i))
+
+
+def compaction_report(log_path, compacted_path):
+    """
+    Compression ratio and decode throughput of a compacted log.
+
+    Returns
+    -------
+    dict
+        'original_bytes', 'compacted_bytes', 'ratio', 'steps', 'decode_time' (s) and 'decode_steps_per_s' of decoding
+        every episode to column arrays
+    """
+    original_bytes = os.path.getsize(log_path)
+    compacted_bytes = os.path.getsize(compacted_path)
+
+    start = time.time()
+    steps = 0
+    with ColumnarLogReader(compacted_path) as reader:
+        for i in range(len(reader)):
+            reader.episode(i)
+            steps += int(reader.episode_table[i]['length'])
+    decode_time = time.time() - start
+
+    return {
+        'original_bytes': original_bytes,
+        'compacted_bytes': compacted_bytes,
+        'ratio': original_bytes / max(compacted_bytes, 1),
+        'steps': steps,
+        'decode_time': decode_time,
+        'decode_steps_per_s': steps / decode_time if decode_time > 0 else float('inf'),
+    }
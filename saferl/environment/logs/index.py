@@ -0,0 +1,326 @@
+"""
+Random access to the episodes of evaluation and training logs through a sidecar index.
+
+The first read of a jsonlines log scans it once and writes <log>.index.npz next to it, holding the byte offset and
+length of every episode segment and per episode metadata: episode id and number, number of steps, success and
+failure. Later reads load only the index and seek to the requested episodes. The index is rebuilt whenever the size or
+modification time of the log changes.
+
+Episodes are identified by the 'episode_ID' (training logs) or 'rollout_num' (evaluation logs) entry keys, or
+otherwise start at every step_number 1. Episodes of training logs interleaved by workers with several environments
+are split into several segments.
+
+Columnar logs (see saferl.environment.logs.columnar) carry their own episode table and are read through the same
+LogReader interface.
+"""
+
+import json
+import os
+import numpy as np
+
+from saferl.environment.logs.columnar import ColumnarLogReader, is_columnar_log
+
+INDEX_SUFFIX = '.index.npz'
+INDEX_VERSION = 1
+EPISODE_KEYS = ('episode_ID', 'rollout_num')
+EPISODE_NUMBER_KEYS = ('rollout_num', 'worker_episode_number')
+# per episode fields of the index, also stored in compacted logs
+INDEX_FIELDS = ('episode_id', 'episode_number', 'length', 'success', 'failure')
+
+
+def index_path(log_path):
+    return log_path + INDEX_SUFFIX
+
+
+def _outcome(info):
+    """success and failure of a (single or multi-agent) info dict, failure as a string, '' if none"""
+    if 'success' not in info and info:
+        # multi-agent logs hold one info per agent, episode outcomes are shared
+        info = next(iter(info.values()))
+    failure = info.get('failure', False)
+    return bool(info.get('success', False)), failure if isinstance(failure, str) else ('failure' if failure else '')
+
+
+def build_index(log_path):
+    """
+    Scan a jsonlines log and build its episode index.
+
+    Returns
+    -------
+    dict
+        index arrays, see load_index
+    """
+    segment_offsets = []
+    segment_lengths = []
+    segment_episodes = []
+
+    episodes = {}
+    episode_order = []
+
+    episode_key = None
+    ordinal = -1
+    current = None
+
+    with open(log_path, 'rb') as log:
+        offset = 0
+        for line in log:
+            line_length = len(line)
+            if not line.strip():
+                offset += line_length
+                continue
+
+            state = json.loads(line)
+            if episode_key is None:
+                episode_key = next((k for k in EPISODE_KEYS if k in state), '')
+
+            if episode_key:
+                key = state[episode_key]
+            else:
+                if state.get('step_number') == 1 or ordinal < 0:
+                    ordinal += 1
+                key = ordinal
+
+            if key not in episodes:
+                number = next((state[k] for k in EPISODE_NUMBER_KEYS if k in state), len(episode_order))
+                episodes[key] = {'position': len(episode_order), 'number': number, 'segments': [], 'steps': 0,
+                                 'outcome': (False, '')}
+                episode_order.append(key)
+            episode = episodes[key]
+
+            # consecutive lines of the same episode extend its last segment
+            if key != current:
+                episode['segments'].append(len(segment_offsets))
+                segment_offsets.append(offset)
+                segment_lengths.append(0)
+                segment_episodes.append(episode['position'])
+                current = key
+            segment_lengths[episode['segments'][-1]] += line_length
+
+            episode['steps'] += 1
+            if 'info' in state:
+                episode['outcome'] = _outcome(state['info'])
+
+            offset += line_length
+
+    stat = os.stat(log_path)
+    return {
+        'version': np.int64(INDEX_VERSION),
+        'log_size': np.int64(stat.st_size),
+        'log_mtime': np.float64(stat.st_mtime),
+        'episode_id': np.array(episode_order, dtype=np.int64),
+        'episode_number': np.array([episodes[key]['number'] for key in episode_order], dtype=np.int64),
+        'length': np.array([episodes[key]['steps'] for key in episode_order], dtype=np.int64),
+        'success': np.array([episodes[key]['outcome'][0] for key in episode_order], dtype=bool),
+        'failure': np.array([episodes[key]['outcome'][1] for key in episode_order], dtype=np.str_),
+        'segment_offset': np.array(segment_offsets, dtype=np.int64),
+        'segment_length': np.array(segment_lengths, dtype=np.int64),
+        'segment_episode': np.array(segment_episodes, dtype=np.int64),
+    }
+
+
+def load_index(log_path, rebuild=False):
+    """
+    Load the sidecar index of a jsonlines log, building and saving it if missing or stale.
+
+    Returns
+    -------
+    dict
+        'episode_id', 'episode_number', 'length', 'success' and 'failure' arrays with one entry per episode in log
+        order, and 'segment_offset', 'segment_length' and 'segment_episode' arrays of the byte ranges of episodes
+    """
+    path = index_path(log_path)
+    stat = os.stat(log_path)
+
+    if not rebuild and os.path.isfile(path):
+        with np.load(path) as cached:
+            index = {k: cached[k] for k in cached.files}
+        if int(index['version']) == INDEX_VERSION and int(index['log_size']) == stat.st_size \
+                and float(index['log_mtime']) == stat.st_mtime:
+            return index
+
+    index = build_index(log_path)
+    try:
+        # write to a temporary file first so concurrent readers never load a partial index
+        tmp_path = "{}.{}.tmp.npz".format(path[:-len('.npz')], os.getpid())
+        np.savez(tmp_path, **index)
+        os.replace(tmp_path, path)
+    except OSError:
+        # read only log directories are indexed in memory only
+        pass
+    return index
+
+
+class LogReader:
+    """
+    Episode level random access to jsonlines and columnar rollout logs.
+
+    Episodes are returned as lists of log entries (dicts) in step order.
+    """
+
+    def __init__(self, log_path, rebuild_index=False):
+        self.log_path = log_path
+        self.columnar = None
+        self.file = None
+
+        if is_columnar_log(log_path):
+            self.columnar = ColumnarLogReader(log_path)
+            self.index = self._columnar_index()
+        else:
+            self.index = load_index(log_path, rebuild=rebuild_index)
+            self.file = open(log_path, 'rb')
+
+            # segments of every episode in log order
+            order = np.argsort(self.index['segment_episode'], kind='stable')
+            bounds = np.searchsorted(self.index['segment_episode'][order], np.arange(len(self) + 1))
+            self.episode_segments = [order[bounds[i]:bounds[i + 1]] for i in range(len(self))]
+
+    def _columnar_index(self):
+        # compacted logs carry the index of the original log
+        names = set(self.columnar.archive.namelist())
+        if all('index/{}.npy'.format(field) in names for field in INDEX_FIELDS):
+            index = {}
+            for field in INDEX_FIELDS:
+                with self.columnar.archive.open('index/{}.npy'.format(field), 'r') as f:
+                    index[field] = np.lib.format.read_array(f, allow_pickle=False)
+            return index
+
+        table = self.columnar.episode_table
+        success = []
+        failure = []
+        numbers = []
+        for i in range(len(self.columnar)):
+            data = self.columnar.episode(i, columns=['info/success', 'info/failure', 'rollout_num',
+                                                     'worker_episode_number'])
+            outcome = _outcome({'success': data['info/success'][-1] if 'info/success' in data else False,
+                                'failure': data['info/failure'][-1] if 'info/failure' in data else False})
+            success.append(outcome[0])
+            failure.append(outcome[1])
+            number = data.get('rollout_num', data.get('worker_episode_number'))
+            numbers.append(int(number[0]) if number is not None else i)
+
+        return {
+            'episode_id': table['episode'].copy(),
+            'episode_number': np.array(numbers, dtype=np.int64),
+            'length': table['length'].copy(),
+            'success': np.array(success, dtype=bool),
+            'failure': np.array(failure, dtype=np.str_),
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+        if self.columnar is not None:
+            self.columnar.close()
+
+    def __len__(self):
+        return len(self.index['episode_id'])
+
+    def __getitem__(self, i):
+        return self.episode(i)
+
+    def __iter__(self):
+        return self.episodes()
+
+    @property
+    def episode_ids(self):
+        return self.index['episode_id']
+
+    @property
+    def lengths(self):
+        return self.index['length']
+
+    @property
+    def success(self):
+        return self.index['success']
+
+    @property
+    def failure(self):
+        return self.index['failure']
+
+    def episode(self, i):
+        """
+        Parameters
+        ----------
+        i : int
+            position of the episode in the log, negative values count from the end
+
+        Returns
+        -------
+        list
+            the log entries of the episode
+        """
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("episode index {} out of range for log of {} episodes".format(i, len(self)))
+
+        if self.columnar is not None:
+            return self.columnar.episode_entries(i)
+
+        entries = []
+        for segment in self.episode_segments[i]:
+            self.file.seek(self.index['segment_offset'][segment])
+            data = self.file.read(self.index['segment_length'][segment])
+            entries += [json.loads(line) for line in data.splitlines() if line.strip()]
+        return entries
+
+    def episodes(self, indices=None):
+        """
+        Lazily iterate over the episodes at indices, all episodes by default.
+        """
+        if indices is None:
+            indices = range(len(self))
+        for i in indices:
+            yield self.episode(int(i))
+
+    def find(self, episode_id=None, episode_number=None):
+        """
+        Index of the first episode with the given episode id or number (rollout_num or worker_episode_number).
+        """
+        if episode_id is not None:
+            matches = np.flatnonzero(self.index['episode_id'] == episode_id)
+        else:
+            matches = np.flatnonzero(self.index['episode_number'] == episode_number)
+        if len(matches) == 0:
+            raise KeyError("no episode with id {} / number {} in {}".format(episode_id, episode_number, self.log_path))
+        return int(matches[0])
+
+    def filter(self, success=None, failure=None, min_length=None, max_length=None):
+        """
+        Indices of the episodes matching an outcome.
+
+        Parameters
+        ----------
+        success : bool
+            keep successful (True) or unsuccessful (False) episodes
+        failure : bool or str
+            keep failed (True), not failed (False) episodes, or episodes with the given failure code, e.g. 'timeout'
+        min_length : int
+            minimum number of steps
+        max_length : int
+            maximum number of steps
+
+        Returns
+        -------
+        numpy.ndarray
+            matching episode indices in log order
+        """
+        mask = np.ones((len(self),), dtype=bool)
+        if success is not None:
+            mask &= self.index['success'] == bool(success)
+        if failure is not None:
+            if isinstance(failure, str):
+                mask &= self.index['failure'] == failure
+            else:
+                mask &= (self.index['failure'] != '') == bool(failure)
+        if min_length is not None:
+            mask &= self.index['length'] >= min_length
+        if max_length is not None:
+            mask &= self.index['length'] <= max_length
+        return np.flatnonzero(mask)
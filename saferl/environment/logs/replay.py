@@ -0,0 +1,225 @@
+"""
+Replay logs: compact evaluation logs from which full rollout logs are regenerated by deterministic re-simulation.
+
+Environments draw all randomness from the numpy global RNG, which BaseEnv.seed sets. Given the seed an episode was
+reset with and its action sequence, replaying the actions in an identically configured environment reproduces every
+step. A replay log holds one jsonlines record per episode instead of one per step:
+
+    {"rollout_num": 3, "env": "saferl.aerospace.tasks.docking.task.DockingEnv", "seed": 1234,
+     "initial_state": {"deputy": [...], ...}, "actions": [[...], ...],
+     "outcome": {"success": true, "failure": false, "episode_reward": 1.5, "length": 120}}
+
+initial_state holds the state vectors of the environment objects after reset and is used, together with the
+recorded outcome, to check that a replay reproduces the original episode.
+"""
+
+import json
+import numpy as np
+
+from saferl.environment.utils import to_jsonable
+
+
+class ReplayMismatchError(Exception):
+    pass
+
+
+def env_class_name(env):
+    return "{}.{}".format(type(env).__module__, type(env).__name__)
+
+
+def initial_conditions(env):
+    """
+    State vectors of the environment objects, captured right after reset.
+    """
+    conditions = {}
+    for name, obj in env.env_objs.items():
+        vector = getattr(getattr(obj, 'state', None), 'vector', None)
+        if vector is not None:
+            conditions[name] = np.asarray(vector).tolist()
+    return conditions
+
+
+def episode_header(env, seed):
+    """
+    The replay information of an episode, to be attached to its first log entry under 'replay'.
+    """
+    return {'env': env_class_name(env), 'seed': seed, 'initial_state': initial_conditions(env)}
+
+
+class ReplayLogWriter:
+    """
+    Writer of replay logs with the write / write_all / close interface of jsonlines.Writer.
+
+    Receives the per step log entries built by scripts/eval.py log_state. The first entry of every episode must carry
+    the episode_header under 'replay', from later entries only the actions and outcome are kept.
+    """
+
+    accepts_numpy = True
+    replay = True
+
+    def __init__(self, path, mode='w'):
+        self.file = open(path, mode, encoding='utf-8')
+        self.record = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _end_episode(self):
+        if self.record is not None:
+            self.file.write(json.dumps(self.record) + '\n')
+            self.record = None
+
+    def write(self, entry):
+        if 'replay' in entry:
+            self._end_episode()
+            header = entry['replay']
+            self.record = {
+                'rollout_num': entry['rollout_num'],
+                'env': header['env'],
+                'seed': header['seed'],
+                'initial_state': header['initial_state'],
+                'actions': [],
+                'outcome': None,
+            }
+        elif self.record is None:
+            raise ValueError("the first entry of an episode must carry its replay header")
+
+        self.record['actions'].append(to_jsonable(entry['actions']))
+        self.record['outcome'] = episode_outcome(entry['info'], entry['episode_reward'], entry['step_number'])
+
+    def write_all(self, entries):
+        for entry in entries:
+            self.write(entry)
+
+    def close(self):
+        self._end_episode()
+        self.file.close()
+
+
+def episode_outcome(info, episode_reward, length):
+    return {
+        'success': bool(info['success']),
+        'failure': info['failure'] if isinstance(info['failure'], str) else bool(info['failure']),
+        'episode_reward': float(episode_reward),
+        'length': int(length),
+    }
+
+
+def load_replay_log(path):
+    """
+    Returns
+    -------
+    list
+        the episode records of a replay log
+    """
+    with open(path, 'r', encoding='utf-8') as log:
+        return [json.loads(line) for line in log if line.strip()]
+
+
+def _restore_action(action_space, action):
+    """
+    Rebuild an action of action_space from its logged form, a flat list holding the index of every Discrete action
+    and the elements of every Box action, e.g. one float per actuator of a Tuple action space.
+    """
+    restored, size = _restore_subaction(action_space, action, 0)
+    if size != len(action):
+        raise ReplayMismatchError("recorded action {} does not match the action space {}".format(action, action_space))
+    return restored
+
+
+def _restore_subaction(space, action, start):
+    from gym import spaces
+
+    if isinstance(space, spaces.Tuple):
+        values = []
+        for subspace in space.spaces:
+            value, start = _restore_subaction(subspace, action, start)
+            values.append(value)
+        return tuple(values), start
+    if isinstance(space, spaces.Discrete):
+        return int(action[start]), start + 1
+    if isinstance(space, spaces.Box):
+        # float32 actions are logged exactly as float64, casting back restores the original values
+        size = int(np.prod(space.shape))
+        return np.asarray(action[start:start + size], dtype=space.dtype).reshape(space.shape), start + size
+    raise NotImplementedError("replay of {} actions is not supported".format(type(space).__name__))
+
+
+def replay_episode(env, record, steps=None, verify=True, rtol=1e-9, atol=1e-9):
+    """
+    Re-simulate a recorded episode.
+
+    Parameters
+    ----------
+    env : BaseEnv
+        environment configured like the one the episode was recorded in
+    record : dict
+        episode record of a replay log
+    steps : list
+        step numbers (starting at 1) to regenerate log entries for, all steps if None
+    verify : bool
+        check the initial state and the outcome against the record, raising ReplayMismatchError on differences.
+        Without verification, the replay stops after the last requested step.
+    rtol : float
+        relative tolerance of the initial state and episode reward checks
+    atol : float
+        absolute tolerance of the initial state and episode reward checks
+
+    Returns
+    -------
+    list
+        full log entries, in the format of scripts/eval.py log_state, of the requested steps
+    """
+    if record['env'] != env_class_name(env):
+        raise ReplayMismatchError("episode was recorded in {}, not {}".format(record['env'], env_class_name(env)))
+
+    env.seed(record['seed'])
+    obs = env.reset()
+
+    if verify:
+        replayed = initial_conditions(env)
+        for name, vector in record['initial_state'].items():
+            if name not in replayed or not np.allclose(replayed[name], vector, rtol=rtol, atol=atol):
+                raise ReplayMismatchError("initial state of '{}' differs from the record of rollout {}".format(
+                    name, record['rollout_num']))
+
+    selected = None if steps is None else set(steps)
+    last_step = len(record['actions']) if verify or steps is None else min(max(selected), len(record['actions']))
+
+    entries = []
+    episode_reward = 0
+    done = False
+    info = None
+    step_num = 0
+    for step_num in range(1, last_step + 1):
+        if done:
+            raise ReplayMismatchError("rollout {} ended after {} of {} steps".format(
+                record['rollout_num'], step_num - 1, len(record['actions'])))
+
+        action = record['actions'][step_num - 1]
+        obs, reward, done, info = env.step(_restore_action(env.action_space, action))
+        episode_reward += reward
+
+        if selected is None or step_num in selected:
+            entries.append({
+                'info': to_jsonable(info),
+                'actions': action,
+                'obs': obs.tolist(),
+                'rollout_num': record['rollout_num'],
+                'step_number': step_num,
+                'episode_reward': episode_reward,
+            })
+
+    if verify:
+        outcome = episode_outcome(info, episode_reward, step_num) if info is not None else None
+        expected = record['outcome']
+        if outcome is None or not done or outcome['success'] != expected['success'] \
+                or outcome['failure'] != expected['failure'] or outcome['length'] != expected['length'] \
+                or not np.isclose(outcome['episode_reward'], expected['episode_reward'], rtol=rtol, atol=atol):
+            raise ReplayMismatchError("replayed outcome {} of rollout {} differs from the recorded outcome {}".format(
+                outcome, record['rollout_num'], expected))
+
+    return entries
@@ -0,0 +1,155 @@
+"""
+Buffered jsonlines writer encoding and writing records on a background thread.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+
+
+class BackgroundLogWriter:
+    """
+    Appends records to a jsonlines file through a background thread.
+
+    Records are collected into batches of batch_size on the calling thread and handed to the writer thread through a
+    queue of at most max_pending batches. The writer thread keeps the file open, encodes every batch with a single
+    write call and flushes it to the OS once the queue runs empty. When the queue is full, write either blocks until
+    the writer thread catches up ('block') or drops the batch ('drop'). Dropped records and time spent blocked are
+    counted in dropped_records and blocked_time.
+
+    The file content is identical to jsonlines.Writer output. Records are encoded later on the writer thread and must
+    not be modified after they are written.
+    """
+
+    def __init__(self, path, batch_size=256, max_pending=64, backpressure='block', mode='a'):
+        """
+        Parameters
+        ----------
+        path : str
+            path of the jsonlines file, parent directories are created
+        batch_size : int
+            number of records per batch handed to the writer thread
+        max_pending : int
+            maximum number of batches queued for the writer thread
+        backpressure : str
+            'block' or 'drop' behavior when max_pending batches are queued
+        mode : str
+            file open mode, 'a' or 'w'
+        """
+        if backpressure not in ('block', 'drop'):
+            raise ValueError("invalid backpressure '{}', should be 'block' or 'drop'".format(backpressure))
+
+        self.path = path
+        self.batch_size = batch_size
+        self.backpressure = backpressure
+
+        self.batch = []
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.error = None
+        self.dropped_records = 0
+        self.blocked_time = 0.
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, mode, encoding='utf-8')
+        self.encoder = json.JSONEncoder(ensure_ascii=False)
+
+        self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self.thread.start()
+
+        self.closed = False
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _run(self):
+        while True:
+            batch = self.queue.get()
+            try:
+                if batch is None:
+                    return
+                if self.error is None:
+                    self.file.write(''.join(self.encoder.encode(record) + '\n' for record in batch))
+                    if self.queue.empty():
+                        self.file.flush()
+            except Exception as e:
+                # raised on the calling thread at the next write or flush
+                self.error = e
+            finally:
+                self.queue.task_done()
+
+    def _check_error(self):
+        if self.error is not None:
+            raise self.error
+
+    def _submit(self, block):
+        batch = self.batch
+        self.batch = []
+
+        if self.backpressure == 'drop' and not block:
+            try:
+                self.queue.put_nowait(batch)
+            except queue.Full:
+                self.dropped_records += len(batch)
+            return
+
+        start = time.time()
+        self.queue.put(batch)
+        self.blocked_time += time.time() - start
+
+    def write(self, record):
+        """
+        Queue a JSON serializable record.
+        """
+        if self.closed:
+            raise ValueError("write to closed log writer")
+        self._check_error()
+
+        self.batch.append(record)
+        if len(self.batch) >= self.batch_size:
+            self._submit(block=False)
+
+    def write_all(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self, wait=True):
+        """
+        Hand over the current batch to the writer thread.
+
+        Parameters
+        ----------
+        wait : bool
+            wait until all queued records are written and flushed to the OS
+        """
+        if self.closed:
+            return
+        if self.batch:
+            # explicit flushes never drop records
+            self._submit(block=True)
+        if wait:
+            self.queue.join()
+        self._check_error()
+
+    def close(self):
+        """
+        Flush all records, stop the writer thread and close the file.
+        """
+        if self.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self.closed = True
+            self.queue.put(None)
+            self.thread.join()
+            self.file.close()
+            atexit.unregister(self.close)
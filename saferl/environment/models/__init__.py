@@ -1 +1 @@
-from saferl.environment.models import platforms, geometry  # noqa: F401
+from saferl.environment.models import platforms, geometry, events, obstacles, scene, spatial, koopman  # noqa: F401
@@ -0,0 +1,174 @@
+import abc
+import numpy as np
+
+
+class IntegrationEvent(abc.ABC):
+    """
+    Zero crossing event evaluated on a platform's continuous state trajectory during integration.
+
+    Events are registered with a platform and located by the platform's dynamics within each integration step, so
+    crossings that occur between step endpoints are not missed at coarse step sizes.
+    """
+
+    def __init__(self, name, direction=-1, substeps=10):
+        """
+        Parameters
+        ----------
+        name : str
+            name of the event, unique per platform
+        direction : int
+            -1 triggers on positive to negative crossings, 1 on negative to positive crossings, 0 on both
+        substeps : int
+            number of points per integration step the event function is sampled at to detect crossings
+        """
+        assert direction in [-1, 0, 1], "direction must be one of -1, 0, 1"
+        assert substeps > 0, "substeps must be positive"
+
+        self.name = name
+        self.direction = direction
+        self.substeps = substeps
+
+        self.platform = None
+        self.step_start_time = 0
+        self.triggered = False
+        self.time = None
+
+    def reset(self):
+        self.step_start_time = 0
+        self.triggered = False
+        self.time = None
+
+    def bind(self, platform, sim_state):
+        """
+        Prepare the event for the upcoming integration step. Called before the platform's dynamics are stepped.
+
+        Parameters
+        ----------
+        platform : BasePlatform
+            platform whose state trajectory the event is evaluated on
+        sim_state : SimulationState
+            simulation state at the start of the step
+        """
+        self.platform = platform
+        self.step_start_time = sim_state.time_elapsed
+        self.triggered = False
+        self.time = None
+
+    def crosses(self, value_start, value_end):
+        if self.direction <= 0 and value_start > 0 >= value_end:
+            return True
+        if self.direction >= 0 and value_start < 0 <= value_end:
+            return True
+        return False
+
+    def trigger(self, t):
+        """
+        Record a crossing at time t relative to the start of the current step.
+        """
+        self.triggered = True
+        self.time = self.step_start_time + t
+
+    def __call__(self, t, state_vec):
+        state = self.platform.state.__class__(vector=state_vec, vector_deep_copy=False)
+        return self.evaluate(t, state)
+
+    @abc.abstractmethod
+    def evaluate(self, t, state):
+        """
+        Parameters
+        ----------
+        t : float
+            time relative to the start of the current step
+        state : BasePlatformState
+            platform state at time t
+
+        Returns
+        -------
+        float
+            event function value, an event occurs where it crosses zero
+        """
+        raise NotImplementedError
+
+
+class DistanceEvent(IntegrationEvent):
+    """
+    Distance between the platform and a target env object crossing a threshold.
+    The target is assumed to move with constant velocity over the integration step.
+    """
+
+    def __init__(self, name, target, threshold=None, direction=-1, substeps=10):
+        """
+        Parameters
+        ----------
+        target : str
+            name of the target env object
+        threshold : float
+            distance threshold. Defaults to the target's radius if it has one, 0 otherwise
+        """
+        super().__init__(name, direction=direction, substeps=substeps)
+        self.target = target
+        self.threshold = threshold
+
+        self.target_position = None
+        self.target_velocity = None
+        self.step_threshold = None
+
+    def bind(self, platform, sim_state):
+        super().bind(platform, sim_state)
+        target_obj = sim_state.env_objs[self.target]
+
+        self.target_position = target_obj.position
+        self.target_velocity = getattr(target_obj, 'velocity', np.zeros(3))
+
+        if self.threshold is None:
+            self.step_threshold = getattr(target_obj, 'radius', 0)
+        else:
+            self.step_threshold = self.threshold
+
+    def evaluate(self, t, state):
+        target_position = self.target_position + t * self.target_velocity
+        return np.linalg.norm(state.position - target_position) - self.step_threshold
+
+
+class VelocityLimitEvent(IntegrationEvent):
+    """
+    Velocity relative to a reference env object exceeding a distance dependent limit of the form
+    vel_threshold + slope * max(0, distance - threshold_dist).
+    The reference is assumed to move with constant velocity over the integration step.
+    """
+
+    def __init__(self, name, ref, vel_threshold, threshold_dist, slope, direction=1, substeps=10):
+        """
+        Parameters
+        ----------
+        ref : str
+            name of the reference env object
+        vel_threshold : float
+            velocity limit at distances within threshold_dist
+        threshold_dist : float
+            distance beyond which the velocity limit increases linearly
+        slope : float
+            rate of increase of the velocity limit with distance
+        """
+        super().__init__(name, direction=direction, substeps=substeps)
+        self.ref = ref
+        self.vel_threshold = vel_threshold
+        self.threshold_dist = threshold_dist
+        self.slope = slope
+
+        self.ref_position = None
+        self.ref_velocity = None
+
+    def bind(self, platform, sim_state):
+        super().bind(platform, sim_state)
+        ref_obj = sim_state.env_objs[self.ref]
+        self.ref_position = ref_obj.position
+        self.ref_velocity = ref_obj.velocity
+
+    def evaluate(self, t, state):
+        ref_position = self.ref_position + t * self.ref_velocity
+        dist = np.linalg.norm(state.position - ref_position)
+        vel_limit = self.vel_threshold + self.slope * max(0, dist - self.threshold_dist)
+
+        # positive while exceeding the limit
+        return np.linalg.norm(state.velocity - self.ref_velocity) - vel_limit
@@ -43,6 +43,82 @@ class BaseGeometry(BaseEnvObj):
     def generate_info(self):
         raise NotImplementedError
 
+    def contains_batch(self, points):
+        """
+        Parameters
+        ----------
+        points : numpy.ndarray
+            (M, 3) array of positions
+
+        Returns
+        -------
+        numpy.ndarray
+            (M,) boolean array, True where the position lies within the geometry
+        """
+        return self.contains_kernel(points, *self.kernel_params())[:, 0]
+
+    def distance_batch(self, points):
+        """
+        Parameters
+        ----------
+        points : numpy.ndarray
+            (M, 3) array of positions
+
+        Returns
+        -------
+        numpy.ndarray
+            (M,) array of signed distances to the geometry surface, negative inside the geometry
+        """
+        return self.distance_kernel(points, *self.kernel_params())[:, 0]
+
+    @abc.abstractmethod
+    def kernel_params(self):
+        """
+        Returns
+        -------
+        tuple
+            (centers, radii, heights) struct-of-arrays parameters of this single geometry for the batch kernels
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def contains_kernel(points, centers, radii, heights):
+        """
+        Vectorized containment test of M points against K geometries of the same type.
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            (M, 3) array of positions
+        centers : numpy.ndarray
+            (K, 3) array of geometry centers
+        radii : numpy.ndarray
+            (K,) array of geometry radii, unused by points
+        heights : numpy.ndarray
+            (K,) array of geometry heights, unused by all but cylinders
+
+        Returns
+        -------
+        numpy.ndarray
+            (M, K) boolean array, True where point m lies within geometry k
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def distance_kernel(points, centers, radii, heights):
+        """
+        Vectorized signed surface distance of M points to K geometries of the same type.
+        Parameters are as in contains_kernel.
+
+        Returns
+        -------
+        numpy.ndarray
+            (M, K) array of signed distances, negative inside the geometry
+        """
+        raise NotImplementedError
+
 
 class Point(BaseGeometry):
 
@@ -86,7 +162,7 @@ class Point(BaseGeometry):
         pass
 
     def contains(self, other):
-        distance = np.linalg.norm(self.position - other.position)
+        distance = np.linalg.norm(self._center - other.position)
         is_contained = distance < POINT_CONTAINS_DISTANCE
         return is_contained
 
@@ -99,6 +175,17 @@ class Point(BaseGeometry):
 
         return info
 
+    def kernel_params(self):
+        return self._center[None, :], np.zeros((1,)), np.zeros((1,))
+
+    @staticmethod
+    def contains_kernel(points, centers, radii, heights):
+        return Point.distance_kernel(points, centers, radii, heights) < POINT_CONTAINS_DISTANCE
+
+    @staticmethod
+    def distance_kernel(points, centers, radii, heights):
+        return np.linalg.norm(points[:, None, :] - centers[None, :, :], axis=2)
+
 
 class Circle(Point):
 
@@ -107,7 +194,7 @@ class Circle(Point):
         self.radius = radius
 
     def contains(self, other):
-        radial_distance = np.linalg.norm(self.position[0:2] - other.position[0:2])
+        radial_distance = np.linalg.norm(self._center[0:2] - other.position[0:2])
         is_contained = radial_distance <= self.radius
         return is_contained
 
@@ -117,14 +204,37 @@ class Circle(Point):
 
         return info
 
+    def kernel_params(self):
+        return self._center[None, :], np.array([self.radius], dtype=np.float64), np.zeros((1,))
+
+    @staticmethod
+    def _radial_distance(points, centers):
+        return np.linalg.norm(points[:, None, 0:2] - centers[None, :, 0:2], axis=2)
+
+    @staticmethod
+    def contains_kernel(points, centers, radii, heights):
+        return Circle._radial_distance(points, centers) <= radii[None, :]
+
+    @staticmethod
+    def distance_kernel(points, centers, radii, heights):
+        return Circle._radial_distance(points, centers) - radii[None, :]
+
 
 class Sphere(Circle):
 
     def contains(self, other):
-        distance = np.linalg.norm(self.position - other.position)
+        distance = np.linalg.norm(self._center - other.position)
         is_contained = distance <= self.radius
         return is_contained
 
+    @staticmethod
+    def contains_kernel(points, centers, radii, heights):
+        return Point.distance_kernel(points, centers, radii, heights) <= radii[None, :]
+
+    @staticmethod
+    def distance_kernel(points, centers, radii, heights):
+        return Point.distance_kernel(points, centers, radii, heights) - radii[None, :]
+
 
 class Cylinder(Circle):
 
@@ -133,8 +243,9 @@ class Cylinder(Circle):
         super().__init__(name, x=x, y=y, z=z, radius=radius)
 
     def contains(self, other):
-        radial_distance = np.linalg.norm(self.position[0:2] - other.position[0:2])
-        axial_distance = abs(self.position[2] - other.position[2])
+        other_position = other.position
+        radial_distance = np.linalg.norm(self._center[0:2] - other_position[0:2])
+        axial_distance = abs(self._center[2] - other_position[2])
 
         is_contained = (radial_distance <= self.radius) and (axial_distance <= (self.height / 2))
         return is_contained
@@ -145,6 +256,96 @@ class Cylinder(Circle):
 
         return info
 
+    def kernel_params(self):
+        return self._center[None, :], np.array([self.radius], dtype=np.float64), \
+            np.array([self.height], dtype=np.float64)
+
+    @staticmethod
+    def contains_kernel(points, centers, radii, heights):
+        radial_distance = Circle._radial_distance(points, centers)
+        axial_distance = np.abs(points[:, None, 2] - centers[None, :, 2])
+        return (radial_distance <= radii[None, :]) & (axial_distance <= heights[None, :] / 2)
+
+    @staticmethod
+    def distance_kernel(points, centers, radii, heights):
+        radial_excess = Circle._radial_distance(points, centers) - radii[None, :]
+        axial_excess = np.abs(points[:, None, 2] - centers[None, :, 2]) - heights[None, :] / 2
+
+        outside_distance = np.hypot(np.maximum(radial_excess, 0), np.maximum(axial_excess, 0))
+        inside_distance = np.minimum(np.maximum(radial_excess, axial_excess), 0)
+        return outside_distance + inside_distance
+
+
+class GeometrySet:
+    """
+    Struct-of-arrays collection of K geometries of a single type, answering containment and distance queries for
+    M points against all K geometries in one vectorized call.
+    """
+
+    def __init__(self, shape_cls, centers, radii=None, heights=None):
+        """
+        Parameters
+        ----------
+        shape_cls : type
+            geometry class providing the batch kernels, one of Point, Circle, Sphere, Cylinder
+        centers : numpy.ndarray
+            (K, 3) array of geometry centers
+        radii : numpy.ndarray
+            (K,) array of geometry radii
+        heights : numpy.ndarray
+            (K,) array of geometry heights
+        """
+        centers = np.asarray(centers, dtype=np.float64)
+        assert centers.ndim == 2 and centers.shape[1] == 3, "centers must have shape (K, 3)"
+        num_shapes = centers.shape[0]
+
+        self.shape_cls = shape_cls
+        self.centers = centers
+        self.radii = np.zeros((num_shapes,)) if radii is None else np.asarray(radii, dtype=np.float64)
+        self.heights = np.zeros((num_shapes,)) if heights is None else np.asarray(heights, dtype=np.float64)
+
+        assert self.radii.shape == (num_shapes,), "radii must have shape (K,)"
+        assert self.heights.shape == (num_shapes,), "heights must have shape (K,)"
+
+    @classmethod
+    def from_shapes(cls, shapes):
+        """
+        Build a GeometrySet from a list of geometries (or relative geometries) of the same type.
+        """
+        shapes = [shape.shape if isinstance(shape, RelativeGeometry) else shape for shape in shapes]
+        shape_cls = type(shapes[0])
+        assert all(type(shape) is shape_cls for shape in shapes), "all shapes must be of the same type"
+
+        params = [shape.kernel_params() for shape in shapes]
+        centers = np.concatenate([p[0] for p in params])
+        radii = np.concatenate([p[1] for p in params])
+        heights = np.concatenate([p[2] for p in params])
+
+        return cls(shape_cls, centers, radii=radii, heights=heights)
+
+    def __len__(self):
+        return self.centers.shape[0]
+
+    def contains(self, points):
+        """
+        Returns
+        -------
+        numpy.ndarray
+            (M, K) boolean array, True where point m lies within geometry k
+        """
+        points = np.atleast_2d(points)
+        return self.shape_cls.contains_kernel(points, self.centers, self.radii, self.heights)
+
+    def distance(self, points):
+        """
+        Returns
+        -------
+        numpy.ndarray
+            (M, K) array of signed surface distances, negative inside the geometry
+        """
+        points = np.atleast_2d(points)
+        return self.shape_cls.distance_kernel(points, self.centers, self.radii, self.heights)
+
 
 class RelativeGeometry(BaseEnvObj):
 
@@ -237,6 +438,15 @@ class RelativeGeometry(BaseEnvObj):
         self.euler_decomp_axis = euler_decomp_axis
 
         self._cartesian_offset = np.array([x_offset, y_offset, z_offset], dtype=np.float64)
+        self._has_offset = bool(np.any(self._cartesian_offset))
+        self._offset_homogeneous = np.append(self._cartesian_offset, 1)
+
+        # pose tracking, the geometry is only updated when the pose version of its ref changed
+        self.dependent_objs = []
+        self.pose_version = 0
+        self._ref_pose_version = None
+        self._world_transform = None
+        self._world_transform_version = None
 
         self.shape = shape
 
@@ -248,21 +458,33 @@ class RelativeGeometry(BaseEnvObj):
         self.ref.register_dependent_obj(self)
         # self.update()
 
-    def update(self):
-        ref_orientation = self.ref.orientation
-
+    def update(self, force=False):
         if self.euler_decomp_axis == 'z':
             raise NotImplementedError
         elif self.euler_decomp_axis is not None:
             raise ValueError("Invalid euler_decomp_axis {}".format(self.euler_decomp_axis))
 
-        offset = ref_orientation.apply(self._cartesian_offset)
-
-        self.shape.position = self.ref.position + offset
+        # skip the update if the ref pose is unchanged, refs without pose tracking are always updated
+        ref_pose_version = getattr(self.ref, 'pose_version', None)
+        if not force and ref_pose_version is not None and ref_pose_version == self._ref_pose_version:
+            return False
+        self._ref_pose_version = ref_pose_version
+
+        if self._has_offset:
+            if hasattr(self.ref, 'world_transform'):
+                self.shape.position = np.matmul(self.ref.world_transform, self._offset_homogeneous)[0:3]
+            else:
+                self.shape.position = self.ref.position + self.ref.orientation.apply(self._cartesian_offset)
+        else:
+            # no rotation needed for geometries centered on their ref
+            self.shape.position = self.ref.position
 
         if self.track_orientation:
             self.shape.orientation = self.ref.orientation
 
+        self.pose_version += 1
+        return True
+
     def step(self, *args, **kwargs):
         self.step_compute()
         self.step_apply()
@@ -270,11 +492,33 @@ class RelativeGeometry(BaseEnvObj):
     def step_compute(self, *args, **kwargs):
         pass
 
-    def step_apply(self, *args, **kwargs):
+    def step_apply(self, *args, propagate=True, **kwargs):
         self.update()
 
+        if propagate:
+            for obj in self.dependent_objs:
+                obj.step_apply()
+
     def reset(self, **kwargs):
-        self.update()
+        self.update(force=True)
+
+        for obj in self.dependent_objs:
+            obj.reset(**kwargs)
+
+    def register_dependent_obj(self, obj):
+        self.dependent_objs.append(obj)
+
+    @property
+    def world_transform(self):
+        """
+        Homogeneous 4x4 transform from the geometry frame to the world frame, cached per pose version.
+        """
+        if self._world_transform_version != self.pose_version:
+            self._world_transform = np.eye(4)
+            self._world_transform[0:3, 0:3] = self.orientation.as_matrix()
+            self._world_transform[0:3, 3] = self.position
+            self._world_transform_version = self.pose_version
+        return self._world_transform
 
     def generate_info(self):
         return self.shape.generate_info()
@@ -306,6 +550,12 @@ class RelativeGeometry(BaseEnvObj):
     def contains(self, other):
         return self.shape.contains(other)
 
+    def contains_batch(self, points):
+        return self.shape.contains_batch(points)
+
+    def distance_batch(self, points):
+        return self.shape.distance_batch(points)
+
 
 class RelativePoint(RelativeGeometry):
     def __init__(self,
@@ -0,0 +1,212 @@
+import numpy as np
+
+from saferl.environment.models.platforms import BaseDynamics
+
+
+class KoopmanSurrogateDynamics(BaseDynamics):
+    """
+    Discrete time Koopman surrogate of a platform's dynamics, loaded from a .npz artifact written by
+    autokoopman/export.py.
+
+    States are lifted with the identity plus random Fourier features (RFF)
+        z = [x, sqrt(2 / D) * cos(w x + u)]
+    and advanced with the learned linear operators
+        z' = A z + B c
+    The first state dim entries of z' are the predicted next state.
+
+    The artifact holds the arrays 'A', 'B', 'w', 'u', 'sampling_period' and optionally 'state_indices', the entries of
+    the platform state vector modeled by the surrogate. Unmodeled state entries are held constant.
+    Models fit on normalized states also hold the MinMax normalization 'scale' and 'offset', the states are then
+    normalized with x_n = scale * x + offset before lifting and the predicted states are mapped back.
+    """
+
+    def __init__(self, model, relift=True, check_step_size=True):
+        """
+        Parameters
+        ----------
+        model : str
+            path to the .npz model artifact
+        relift : bool
+            lift the predicted state again at every step. If False, multistep rollouts stay in lifted space and are
+            purely linear.
+        check_step_size : bool
+            raise a ValueError when stepped with a step size other than the model's sampling period
+        """
+        super().__init__()
+        artifact = np.load(model)
+
+        self.A = np.asarray(artifact['A'], dtype=np.float64)
+        self.B = np.asarray(artifact['B'], dtype=np.float64)
+        self.w = np.asarray(artifact['w'], dtype=np.float64)
+        self.u = np.asarray(artifact['u'], dtype=np.float64)
+        self.sampling_period = float(artifact['sampling_period'])
+        self.state_indices = np.asarray(artifact['state_indices'], dtype=np.int64) \
+            if 'state_indices' in artifact.files else None
+        self.scale = np.asarray(artifact['scale'], dtype=np.float64) if 'scale' in artifact.files else None
+        self.offset = np.asarray(artifact['offset'], dtype=np.float64) if 'offset' in artifact.files else None
+
+        self.state_dim = self.w.shape[1]
+        self.lift_dim = self.state_dim + self.w.shape[0]
+        self.rff_scale = np.sqrt(2 / self.w.shape[0])
+
+        if self.A.shape != (self.lift_dim, self.lift_dim) or self.B.shape[0] != self.lift_dim:
+            raise ValueError("model operators of shape {} and {} do not match lifted dimension {}".format(
+                self.A.shape, self.B.shape, self.lift_dim))
+
+        if (self.scale is None) != (self.offset is None):
+            raise ValueError("model normalization requires both 'scale' and 'offset'")
+
+        self.relift = relift
+        self.check_step_size = check_step_size
+
+    def normalize(self, state_vecs):
+        """map (N, state dim) modeled states to the normalized coordinates of the model"""
+        return state_vecs if self.scale is None else state_vecs * self.scale + self.offset
+
+    def denormalize(self, state_vecs):
+        """map (N, state dim) normalized states back to modeled states"""
+        return state_vecs if self.scale is None else (state_vecs - self.offset) / self.scale
+
+    def lift(self, state_vecs):
+        """
+        Parameters
+        ----------
+        state_vecs : numpy.ndarray
+            (N, state dim) array of modeled states, normalized for models with normalization
+
+        Returns
+        -------
+        numpy.ndarray
+            (N, lift dim) array of lifted states
+        """
+        rff = self.rff_scale * np.cos(state_vecs @ self.w.T + self.u)
+        return np.concatenate([state_vecs, rff], axis=1)
+
+    def _validate_step_size(self, step_size):
+        if self.check_step_size and not np.isclose(step_size, self.sampling_period):
+            raise ValueError("Koopman surrogate was trained with sampling period {}, got step size {}".format(
+                self.sampling_period, step_size))
+
+    def _modeled(self, state_vecs):
+        return state_vecs if self.state_indices is None else state_vecs[:, self.state_indices]
+
+    def _unmodeled_update(self, state_vecs, modeled_next):
+        if self.state_indices is None:
+            return modeled_next
+        next_state_vecs = np.array(state_vecs, dtype=np.float64)
+        next_state_vecs[:, self.state_indices] = modeled_next
+        return next_state_vecs
+
+    def step_batch(self, step_size, state_vecs, controls):
+        """
+        Advances a batch of states by one sampling period with a single pair of matrix multiplies.
+
+        Parameters
+        ----------
+        step_size : float
+            step size, must equal the sampling period unless check_step_size is False
+        state_vecs : numpy.ndarray
+            (N, platform state dim) array of state vectors
+        controls : numpy.ndarray
+            (N, control dim) array of controls
+
+        Returns
+        -------
+        numpy.ndarray
+            (N, platform state dim) array of next state vectors
+        """
+        self._validate_step_size(step_size)
+        state_vecs = np.asarray(state_vecs, dtype=np.float64)
+        z = self.lift(self.normalize(self._modeled(state_vecs)))
+        z_next = z @ self.A.T + np.asarray(controls, dtype=np.float64) @ self.B.T
+        return self._unmodeled_update(state_vecs, self.denormalize(z_next[:, :self.state_dim]))
+
+    def step(self, step_size, state, control):
+        state.vector = self.step_batch(step_size, state.vector[None, :], np.asarray(control)[None, :])[0]
+        return state
+
+    def rollout_batch(self, step_size, state_vecs, controls):
+        """
+        Rolls out a batch of states under a sequence of controls.
+
+        Parameters
+        ----------
+        step_size : float
+            step size, must equal the sampling period unless check_step_size is False
+        state_vecs : numpy.ndarray
+            (N, platform state dim) array of initial state vectors
+        controls : numpy.ndarray
+            (T, N, control dim) array of controls for each step
+
+        Returns
+        -------
+        numpy.ndarray
+            (T + 1, N, platform state dim) array of states, starting with the initial states
+        """
+        self._validate_step_size(step_size)
+        state_vecs = np.asarray(state_vecs, dtype=np.float64)
+        controls = np.asarray(controls, dtype=np.float64)
+
+        trajectory = np.empty((controls.shape[0] + 1,) + state_vecs.shape, dtype=np.float64)
+        trajectory[0] = state_vecs
+
+        z = self.lift(self.normalize(self._modeled(state_vecs)))
+        for i in range(controls.shape[0]):
+            if self.relift and i > 0:
+                z = self.lift(self.normalize(self._modeled(trajectory[i])))
+            z = z @ self.A.T + controls[i] @ self.B.T
+            trajectory[i + 1] = self._unmodeled_update(trajectory[i], self.denormalize(z[:, :self.state_dim]))
+
+        return trajectory
+
+    def propagate(self, state_vec, control, step_size, num_steps):
+        controls = np.broadcast_to(np.asarray(control, dtype=np.float64), (num_steps, 1, len(control)))
+        return self.rollout_batch(step_size, np.asarray(state_vec)[None, :], controls)[1:, 0]
+
+
+def fidelity_report(surrogate, reference, state_vecs, controls, step_size, state_cls):
+    """
+    Compares rollouts of a Koopman surrogate against the true dynamics from the same initial states and controls.
+
+    Parameters
+    ----------
+    surrogate : KoopmanSurrogateDynamics
+        surrogate dynamics
+    reference : BaseDynamics
+        true dynamics
+    state_vecs : numpy.ndarray
+        (N, state dim) array of initial state vectors
+    controls : numpy.ndarray
+        (T, N, control dim) array of controls for each step
+    step_size : float
+        simulation step size
+    state_cls : type
+        platform state class used to step the reference dynamics
+
+    Returns
+    -------
+    dict
+        'rmse' per step (T,), 'rmse_per_state' per state entry, 'final_error' per rollout (N,) and the relative
+        euclidean error 'relative_error' over the whole rollouts
+    """
+    controls = np.asarray(controls, dtype=np.float64)
+    predicted = surrogate.rollout_batch(step_size, state_vecs, controls)
+
+    actual = np.empty_like(predicted)
+    actual[0] = state_vecs
+    for n in range(actual.shape[1]):
+        state = state_cls(vector=np.array(state_vecs[n], dtype=np.float64))
+        for i in range(controls.shape[0]):
+            state = reference.step(step_size, state, controls[i, n])
+            actual[i + 1, n] = state.vector
+
+    errors = predicted[1:] - actual[1:]
+
+    report = {
+        'rmse': np.sqrt(np.mean(errors ** 2, axis=(1, 2))),
+        'rmse_per_state': np.sqrt(np.mean(errors ** 2, axis=(0, 1))),
+        'final_error': np.linalg.norm(errors[-1], axis=1),
+        'relative_error': float(np.linalg.norm(errors) / max(np.linalg.norm(actual[1:]), np.finfo(float).eps)),
+    }
+
+    return report
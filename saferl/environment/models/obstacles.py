@@ -0,0 +1,271 @@
+import heapq
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from saferl.environment.models.platforms import BaseEnvObj
+from saferl.environment.models.geometry import Circle, Sphere, Cylinder
+
+# obstacle type codes, index into OBSTACLE_SHAPES
+OBSTACLE_TYPES = ['sphere', 'cylinder', 'circle']
+OBSTACLE_SHAPES = [Sphere, Cylinder, Circle]
+
+
+class ObstacleField(BaseEnvObj):
+    """
+    Static field of sphere, cylinder and circle keep-out zones.
+
+    Obstacles are stored in struct-of-arrays form and indexed by an array based bounding volume hierarchy (BVH) of
+    axis aligned bounding boxes, built at every reset. Nearest obstacle queries traverse the BVH best-first, which
+    scales logarithmically with the number of obstacles.
+    Circles only constrain the xy plane, their bounding boxes extend infinitely along z.
+    """
+
+    def __init__(self, name, obstacles=None, distribution=None, leaf_size=8):
+        """
+        Parameters
+        ----------
+        name : str
+            name of the env object
+        obstacles : list
+            list of obstacle dicts with keys 'type' (one of 'sphere', 'cylinder', 'circle'), 'x', 'y', 'z', 'radius'
+            and, for cylinders, 'height'
+        distribution : dict
+            randomly generated obstacles, resampled at every reset (e.g. every episode when configured with an empty
+            init dict). Keys are 'count', 'type' (type name or list of type names sampled uniformly) and 'x', 'y',
+            'z', 'radius', 'height' given as values or [low, high] bounds
+        leaf_size : int
+            maximum number of obstacles per BVH leaf
+        """
+        super().__init__(name)
+        assert (obstacles is not None) or (distribution is not None), \
+            "at least one of obstacles or distribution must be specified"
+        assert leaf_size >= 1, "leaf_size must be positive"
+
+        self.obstacles_config = [] if obstacles is None else obstacles
+        self.distribution = distribution
+        self.leaf_size = leaf_size
+
+        self.types = None
+        self.centers = None
+        self.radii = None
+        self.heights = None
+
+        # BVH node arrays
+        self.node_min = None
+        self.node_max = None
+        self.node_children = None
+        self.node_start = None
+        self.node_count = None
+        self.node_order = None
+
+        self.reset()
+
+    def reset(self, **kwargs):
+        obstacles = list(self.obstacles_config)
+        if self.distribution is not None:
+            obstacles += self._sample_distribution()
+
+        num_obstacles = len(obstacles)
+        self.types = np.empty((num_obstacles,), dtype=np.int64)
+        self.centers = np.empty((num_obstacles, 3), dtype=np.float64)
+        self.radii = np.empty((num_obstacles,), dtype=np.float64)
+        self.heights = np.zeros((num_obstacles,), dtype=np.float64)
+
+        for i, obstacle in enumerate(obstacles):
+            if obstacle['type'] not in OBSTACLE_TYPES:
+                raise ValueError("invalid obstacle type '{}'".format(obstacle['type']))
+            self.types[i] = OBSTACLE_TYPES.index(obstacle['type'])
+            self.centers[i] = [obstacle.get('x', 0), obstacle.get('y', 0), obstacle.get('z', 0)]
+            self.radii[i] = obstacle['radius']
+            self.heights[i] = obstacle.get('height', 0)
+
+        self._build_bvh()
+
+    def _sample_distribution(self):
+        count = self.distribution['count']
+        obstacle_types = self.distribution.get('type', 'sphere')
+        if not isinstance(obstacle_types, list):
+            obstacle_types = [obstacle_types]
+
+        def sample(key, default):
+            value = self.distribution.get(key, default)
+            if isinstance(value, list):
+                return np.random.uniform(value[0], value[1], size=count)
+            return np.full((count,), value, dtype=np.float64)
+
+        types = np.random.randint(0, len(obstacle_types), size=count)
+        x = sample('x', 0)
+        y = sample('y', 0)
+        z = sample('z', 0)
+        radius = sample('radius', 1)
+        height = sample('height', 0)
+
+        return [{'type': obstacle_types[types[i]], 'x': x[i], 'y': y[i], 'z': z[i], 'radius': radius[i],
+                 'height': height[i]} for i in range(count)]
+
+    def _bounding_boxes(self):
+        half_extents = np.stack([self.radii, self.radii, self.heights / 2], axis=1)
+        half_extents[self.types == OBSTACLE_TYPES.index('sphere'), 2] = \
+            self.radii[self.types == OBSTACLE_TYPES.index('sphere')]
+        half_extents[self.types == OBSTACLE_TYPES.index('circle'), 2] = np.inf
+
+        return self.centers - half_extents, self.centers + half_extents
+
+    def _build_bvh(self):
+        num_obstacles = len(self.types)
+        box_min, box_max = self._bounding_boxes()
+
+        max_nodes = max(1, 2 * num_obstacles)
+        self.node_min = np.empty((max_nodes, 3), dtype=np.float64)
+        self.node_max = np.empty((max_nodes, 3), dtype=np.float64)
+        self.node_children = np.full((max_nodes, 2), -1, dtype=np.int64)
+        self.node_start = np.zeros((max_nodes,), dtype=np.int64)
+        self.node_count = np.zeros((max_nodes,), dtype=np.int64)
+        self.node_order = np.arange(num_obstacles)
+
+        num_nodes = 1
+        stack = [(0, 0, num_obstacles)]
+
+        while stack:
+            node, start, end = stack.pop()
+            idx = self.node_order[start:end]
+
+            if end > start:
+                self.node_min[node] = box_min[idx].min(axis=0)
+                self.node_max[node] = box_max[idx].max(axis=0)
+            else:
+                self.node_min[node] = np.inf
+                self.node_max[node] = -np.inf
+            self.node_start[node] = start
+            self.node_count[node] = end - start
+
+            if end - start <= self.leaf_size:
+                continue
+
+            # split at the median center along the axis of largest center spread
+            centers = self.centers[idx]
+            axis = np.argmax(centers.max(axis=0) - centers.min(axis=0))
+            mid = (end - start) // 2
+            self.node_order[start:end] = idx[np.argpartition(centers[:, axis], mid)]
+
+            left, right = num_nodes, num_nodes + 1
+            num_nodes += 2
+            self.node_children[node] = [left, right]
+            stack.append((left, start, start + mid))
+            stack.append((right, start + mid, end))
+
+        self.num_nodes = num_nodes
+
+    def _box_distance(self, point, node):
+        excess = np.maximum(np.maximum(self.node_min[node] - point, point - self.node_max[node]), 0)
+        return np.sqrt(np.sum(excess ** 2))
+
+    def signed_distance(self, point, idx=None):
+        """
+        Parameters
+        ----------
+        point : numpy.ndarray
+            (3,) position
+        idx : numpy.ndarray
+            indices of the obstacles to measure, all obstacles if None
+
+        Returns
+        -------
+        numpy.ndarray
+            signed surface distance from point to each obstacle, negative inside the obstacle
+        """
+        if idx is None:
+            idx = np.arange(len(self.types))
+        distances = np.empty((len(idx),), dtype=np.float64)
+        types = self.types[idx]
+
+        for type_code, shape_cls in enumerate(OBSTACLE_SHAPES):
+            mask = types == type_code
+            if np.any(mask):
+                sel = idx[mask]
+                distances[mask] = shape_cls.distance_kernel(
+                    point[None, :], self.centers[sel], self.radii[sel], self.heights[sel])[0]
+
+        return distances
+
+    def nearest(self, point, k=1):
+        """
+        Best-first BVH search for the k obstacles with the smallest signed surface distance to point.
+
+        Returns
+        -------
+        tuple
+            (indices, distances) of the nearest obstacles sorted by distance. Fewer than k are returned if the field
+            holds fewer obstacles.
+        """
+        point = np.asarray(point, dtype=np.float64)
+
+        # max heap of the best candidates found so far, stored as (-distance, index)
+        best = []
+        # nodes overlapping the point get a -inf bound since contained obstacles have negative distances
+        queue = [(-np.inf, 0)]
+
+        while queue:
+            bound, node = heapq.heappop(queue)
+            if len(best) == k and bound > -best[0][0]:
+                break
+
+            left, right = self.node_children[node]
+            if left < 0:
+                start = self.node_start[node]
+                idx = self.node_order[start:start + self.node_count[node]]
+                if len(idx) == 0:
+                    continue
+                for obstacle, dist in zip(idx, self.signed_distance(point, idx)):
+                    if len(best) < k:
+                        heapq.heappush(best, (-dist, obstacle))
+                    elif dist < -best[0][0]:
+                        heapq.heapreplace(best, (-dist, obstacle))
+            else:
+                for child in (left, right):
+                    child_bound = self._box_distance(point, child)
+                    heapq.heappush(queue, (-np.inf if child_bound == 0 else child_bound, child))
+
+        best.sort(key=lambda item: -item[0])
+        indices = np.array([item[1] for item in best], dtype=np.int64)
+        distances = np.array([-item[0] for item in best], dtype=np.float64)
+
+        return indices, distances
+
+    def nearest_distance(self, point):
+        _, distances = self.nearest(point, k=1)
+        return distances[0] if len(distances) > 0 else np.inf
+
+    def contains(self, other):
+        return self.nearest_distance(other.position) <= 0
+
+    def generate_info(self):
+        info = {
+            'num_obstacles': len(self.types),
+        }
+
+        return info
+
+    @property
+    def x(self):
+        return 0
+
+    @property
+    def y(self):
+        return 0
+
+    @property
+    def z(self):
+        return 0
+
+    @property
+    def position(self):
+        return np.zeros((3,), dtype=np.float64)
+
+    @property
+    def orientation(self):
+        return Rotation.from_quat([0, 0, 0, 1])
+
+    @property
+    def velocity(self):
+        return np.zeros((3,), dtype=np.float64)
@@ -3,6 +3,8 @@ import copy
 import gym
 import scipy.spatial
 import scipy.integrate
+import scipy.optimize
+import scipy.linalg
 import numpy as np
 
 
@@ -311,6 +313,14 @@ class BasePlatform(BaseEnvObj):
         self.action_space = controller.action_space
 
         self.dependent_objs = []
+        self.events = {}
+
+        # pose version is incremented whenever the platform pose may have changed, see pose_version
+        self._pose_version = 0
+        self._state = None
+        self._state_version = None
+        self._world_transform = None
+        self._world_transform_version = None
 
         self.dynamics = dynamics
         self.actuator_set = actuator_set
@@ -339,9 +349,31 @@ class BasePlatform(BaseEnvObj):
         self.current_control = self.actuator_set.gen_control()
         self.untrimmed_control = copy.deepcopy(self.current_control)
 
+        if self.rta is not None:
+            self.rta.reset()
+
+        for event in self.events.values():
+            event.reset()
+
         for obj in self.dependent_objs:
             obj.reset(**kwargs)
 
+    def register_event(self, event):
+        """
+        Register a zero crossing event to be located by the platform dynamics during integration.
+        An event registered under an existing name replaces the previous event.
+
+        Parameters
+        ----------
+        event : IntegrationEvent
+            event to register
+        """
+        assert isinstance(self.dynamics, BaseODESolverDynamics), \
+            "events are only supported by ODE solver dynamics"
+
+        self.events[event.name] = event
+        self.dynamics.events = list(self.events.values())
+
     def step(self, sim_state, step_size, action=None):
         self.step_compute(sim_state, step_size, action=action)
         self.step_apply()
@@ -360,6 +392,9 @@ class BasePlatform(BaseEnvObj):
         #self.current_actuation = copy.deepcopy(actuation)
         self.untrimmed_control = copy.deepcopy(control)
 
+        for event in self.events.values():
+            event.bind(self, sim_state)
+
         # compute new state if dynamics were applied
         self.next_state = self.dynamics.step(step_size, copy.deepcopy(self.state), control)
         
@@ -372,17 +407,71 @@ class BasePlatform(BaseEnvObj):
         for obj in self.dependent_objs:
             obj.step_compute(sim_state, action=action)
 
-    def step_apply(self):
-
+    def step_apply(self, propagate=True):
         # overwrite platform state with new state from dynamics
         self.state = self.next_state
 
-        for obj in self.dependent_objs:
-            obj.step_apply()
+        # dependents may instead be updated by a SceneGraph flush
+        if propagate:
+            for obj in self.dependent_objs:
+                obj.step_apply()
+
+    @staticmethod
+    def _same_state(state_a, state_b):
+        if state_a is state_b:
+            return True
+        if isinstance(state_a, BasePlatformStateVectorized) and isinstance(state_b, BasePlatformStateVectorized):
+            return np.array_equal(state_a._vector, state_b._vector)
+        return False
 
     def register_dependent_obj(self, obj):
         self.dependent_objs.append(obj)
 
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, value):
+        # sync with pending writes to the previous state before comparing poses
+        pose_version = self.pose_version
+        if not self._same_state(self._state, value):
+            self._pose_version = pose_version + 1
+        self._state = value
+        self._state_version = getattr(value, 'version', None)
+
+    @property
+    def pose_version(self):
+        """
+        Version of the platform pose, incremented whenever the pose may have changed.
+        Assigning a new state or writing to the state through its attributes (e.g. state.vector, state.x, or
+        state.reset) increments the version. In-place writes to a state vector shared with vector_deep_copy=False
+        bypass the state and must be followed by mark_pose_changed.
+        """
+        state_version = getattr(self._state, 'version', None)
+        if state_version != self._state_version:
+            self._state_version = state_version
+            self._pose_version += 1
+        return self._pose_version
+
+    def mark_pose_changed(self):
+        """
+        Increment the pose version after in-place writes to shared state storage.
+        """
+        self._pose_version += 1
+
+    @property
+    def world_transform(self):
+        """
+        Homogeneous 4x4 transform from the platform body frame to the world frame, cached per pose version.
+        """
+        if self._world_transform_version != self.pose_version:
+            self._world_transform = np.eye(4)
+            self._world_transform[0:3, 0:3] = self.orientation.as_matrix()
+            self._world_transform[0:3, 3] = self.position
+            self._world_transform_version = self.pose_version
+        return self._world_transform
+
     def generate_info(self):
         info = {
             'x': self.x,
@@ -430,6 +519,11 @@ class BasePlatformState(BaseEnvObj):
     def __init__(self, **kwargs):
         self.reset(**kwargs)
 
+    def __setattr__(self, name, value):
+        # every attribute write, including property setters, increments the state version
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, 'version', self.__dict__.get('version', 0) + 1)
+
     @abc.abstractmethod
     def reset(self, **kwargs):
         raise NotImplementedError
@@ -471,11 +565,34 @@ class BaseDynamics(abc.ABC):
     def step(self, step_size, state, control):
         raise NotImplementedError
 
+    def propagate(self, state_vec, control, step_size, num_steps):
+        """
+        Closed form propagation of a state under constant control, used to schedule passive platforms analytically.
+
+        Parameters
+        ----------
+        state_vec : numpy.ndarray
+            initial state vector
+        control : numpy.ndarray
+            control held constant over the whole propagation
+        step_size : float
+            time between propagated states
+        num_steps : int
+            number of states to propagate
+
+        Returns
+        -------
+        numpy.ndarray
+            (num_steps, state dim) array of states at times step_size * [1, ..., num_steps]
+        """
+        raise NotImplementedError("{} does not support closed form propagation".format(type(self).__name__))
+
 
 class BaseODESolverDynamics(BaseDynamics):
 
     def __init__(self, integration_method='Euler'):
         self.integration_method = integration_method
+        self.events = []
         super().__init__()
 
     @abc.abstractmethod
@@ -483,19 +600,111 @@ class BaseODESolverDynamics(BaseDynamics):
         raise NotImplementedError
 
     def step(self, step_size, state, control):
+        state_vec_init = state.vector
+        trajectory = None
 
         if self.integration_method == "RK45":
-            sol = scipy.integrate.solve_ivp(self.dx, (0, step_size), state.vector, args=(control,))
+            sol = scipy.integrate.solve_ivp(
+                self.dx, (0, step_size), state_vec_init, args=(control,), dense_output=bool(self.events))
 
             state.vector = sol.y[:, -1]  # save last timestep of integration solution
+            trajectory = sol.sol
+        elif self.integration_method == 'RK4':
+            state.vector = self.rk4_step(step_size, state_vec_init, control)
         elif self.integration_method == 'Euler':
-            state_dot = self.dx(0, state.vector, control)
-            state.vector = state.vector + step_size * state_dot
+            state_dot = self.dx(0, state_vec_init, control)
+            state.vector = state_vec_init + step_size * state_dot
         else:
             raise ValueError("invalid integration method '{}'".format(self.integration_method))
 
+        if self.events:
+            if trajectory is None:
+                trajectory = self.step_trajectory(step_size, state_vec_init, state.vector, control)
+            self.detect_events(step_size, trajectory)
+
         return state
 
+    def step_trajectory(self, step_size, state_vec_init, state_vec_final, control):
+        """
+        Continuous approximation of the state over a fixed integration step. Euler steps are interpolated linearly,
+        higher order steps with a cubic Hermite spline using the derivatives at both endpoints.
+
+        Returns
+        -------
+        callable
+            function mapping time relative to the start of the step to a state vector
+        """
+        if self.integration_method == 'Euler':
+            state_vec_delta = state_vec_final - state_vec_init
+            return lambda t: state_vec_init + (t / step_size) * state_vec_delta
+
+        dx_init = self.dx(0, state_vec_init, control)
+        dx_final = self.dx(step_size, state_vec_final, control)
+
+        def trajectory(t):
+            s = t / step_size
+            h00 = 2 * s**3 - 3 * s**2 + 1
+            h10 = s**3 - 2 * s**2 + s
+            h01 = -2 * s**3 + 3 * s**2
+            h11 = s**3 - s**2
+            return h00 * state_vec_init + h10 * step_size * dx_init + h01 * state_vec_final + \
+                h11 * step_size * dx_final
+
+        return trajectory
+
+    def detect_events(self, step_size, trajectory):
+        """
+        Locate the first crossing of each registered event within the step. Event functions are sampled along the
+        step trajectory and crossings between samples are refined with Brent's method.
+
+        Parameters
+        ----------
+        step_size : float
+            integration step size
+        trajectory : callable
+            function mapping time relative to the start of the step to a state vector
+        """
+        num_substeps = max(event.substeps for event in self.events)
+        sample_times = np.linspace(0, step_size, num_substeps + 1)
+        sample_states = [trajectory(t) for t in sample_times]
+
+        for event in self.events:
+            values = [event(t, state_vec) for t, state_vec in zip(sample_times, sample_states)]
+
+            for i in range(num_substeps):
+                if event.crosses(values[i], values[i + 1]):
+                    if values[i + 1] == 0:
+                        t_event = sample_times[i + 1]
+                    else:
+                        t_event = scipy.optimize.brentq(
+                            lambda t: event(t, trajectory(t)), sample_times[i], sample_times[i + 1])
+                    event.trigger(t_event)
+                    break
+
+    def rk4_step(self, step_size, state_vec, control):
+        """
+        Single fixed step of the classic 4th order Runge-Kutta method.
+
+        Parameters
+        ----------
+        step_size : float
+            integration step size
+        state_vec : numpy.ndarray
+            state vector at the start of the step
+        control : numpy.ndarray
+            control held constant over the step
+
+        Returns
+        -------
+        numpy.ndarray
+            state vector at the end of the step
+        """
+        k1 = self.dx(0, state_vec, control)
+        k2 = self.dx(step_size / 2, state_vec + step_size / 2 * k1, control)
+        k3 = self.dx(step_size / 2, state_vec + step_size / 2 * k2, control)
+        k4 = self.dx(step_size, state_vec + step_size * k3, control)
+        return state_vec + step_size / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
 
 class BaseLinearODESolverDynamics(BaseODESolverDynamics):
 
@@ -515,5 +724,23 @@ class BaseLinearODESolverDynamics(BaseODESolverDynamics):
         dx = np.matmul(self.A, state_vec) + np.matmul(self.B, control)
         return dx
 
+    def propagate(self, state_vec, control, step_size, num_steps):
+        # exact discretization of the affine system x' = Ax + Bu with the augmented state [x, 1]
+        self.update_dynamics_matrices(state_vec)
+        state_dim = state_vec.shape[0]
+
+        augmented = np.zeros((state_dim + 1, state_dim + 1), dtype=np.float64)
+        augmented[:state_dim, :state_dim] = self.A
+        augmented[:state_dim, state_dim] = np.matmul(self.B, control)
+        transition = scipy.linalg.expm(augmented * step_size)
+
+        states = np.empty((num_steps, state_dim), dtype=np.float64)
+        state_aug = np.append(state_vec, 1)
+        for i in range(num_steps):
+            state_aug = np.matmul(transition, state_aug)
+            states[i] = state_aug[:state_dim]
+
+        return states
+
     def step(self, step_size, state, control):
         return super().step(step_size, state, control)
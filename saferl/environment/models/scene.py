@@ -0,0 +1,34 @@
+class SceneGraph:
+    """
+    Flushes the poses of relative env objects (objects with a 'ref' and an 'update' method) in a single pass.
+    Objects are ordered once at construction so that every object is updated after its ref. Each object only
+    recomputes its pose when the pose version of its ref changed since its last update.
+    """
+
+    def __init__(self, env_objs):
+        depths = {}
+
+        def depth(obj):
+            if id(obj) not in depths:
+                ref = getattr(obj, 'ref', None)
+                depths[id(obj)] = 0 if ref is None else depth(ref) + 1
+            return depths[id(obj)]
+
+        dependents = [obj for obj in env_objs.values()
+                      if getattr(obj, 'ref', None) is not None and callable(getattr(obj, 'update', None))]
+        self.dependents = sorted(dependents, key=depth)
+
+    def flush(self, force=False):
+        """
+        Update dependent object poses in topological order.
+
+        Returns
+        -------
+        int
+            number of objects whose pose was recomputed
+        """
+        num_updated = 0
+        for obj in self.dependents:
+            if obj.update(force=force):
+                num_updated += 1
+        return num_updated
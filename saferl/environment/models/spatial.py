@@ -0,0 +1,162 @@
+import itertools
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class SpatialHash:
+    """
+    Uniform grid spatial hash over a set of 2D or 3D points.
+
+    Points are bucketed by cell and sorted by cell key, so candidate pairs in the same or adjacent cells are found
+    with vectorized range lookups. Pair queries within a radius up to the cell size cost roughly O(N) for bounded
+    point density.
+    """
+
+    def __init__(self, cell_size):
+        assert cell_size > 0, "cell_size must be positive"
+        self.cell_size = cell_size
+
+        self.points = None
+        self.order = None
+        self.sorted_keys = None
+        self.cell_coords = None
+        self.key_strides = None
+        self.key_origin = None
+
+        self._candidate_pairs = None
+
+    def build(self, points):
+        """
+        Parameters
+        ----------
+        points : numpy.ndarray
+            (N, 2) or (N, 3) array of positions
+        """
+        points = np.asarray(points, dtype=np.float64)
+        assert points.ndim == 2 and points.shape[1] in (2, 3), "points must have shape (N, 2) or (N, 3)"
+
+        self.points = points
+        self.cell_coords = np.floor(points / self.cell_size).astype(np.int64)
+        self._candidate_pairs = None
+
+        if len(points) == 0:
+            self.order = np.zeros((0,), dtype=np.int64)
+            self.sorted_keys = np.zeros((0,), dtype=np.int64)
+            return
+
+        # linear cell keys with a one cell border so neighboring cell keys never wrap
+        self.key_origin = self.cell_coords.min(axis=0) - 1
+        extents = self.cell_coords.max(axis=0) - self.key_origin + 2
+        self.key_strides = np.cumprod(np.concatenate([[1], extents[:0:-1]]))[::-1]
+
+        keys = self._cell_keys(self.cell_coords)
+        self.order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[self.order]
+
+    def _cell_keys(self, cell_coords):
+        return np.sum((cell_coords - self.key_origin) * self.key_strides, axis=1)
+
+    def _neighbor_offsets(self):
+        # half of the neighboring cells, each unordered pair of cells is visited once
+        dim = self.points.shape[1]
+        offsets = []
+        for offset in itertools.product([-1, 0, 1], repeat=dim):
+            nonzero = [o for o in offset if o != 0]
+            if len(nonzero) == 0 or nonzero[0] > 0:
+                offsets.append(offset)
+        return np.array(offsets, dtype=np.int64)
+
+    def candidate_pairs(self):
+        """
+        Returns
+        -------
+        numpy.ndarray
+            (P, 2) array of index pairs (i, j), i < j, of points in the same or adjacent cells
+        """
+        if self._candidate_pairs is not None:
+            return self._candidate_pairs
+
+        num_points = len(self.points)
+        pairs_list = []
+
+        for offset in self._neighbor_offsets():
+            query_keys = self._cell_keys(self.cell_coords + offset)
+            start = np.searchsorted(self.sorted_keys, query_keys, side='left')
+            end = np.searchsorted(self.sorted_keys, query_keys, side='right')
+            counts = end - start
+
+            # expand each point's range of sorted neighbors into explicit pairs
+            first = np.repeat(np.arange(num_points), counts)
+            range_offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            second = self.order[np.repeat(start, counts) + range_offsets]
+
+            if not np.any(offset):
+                keep = first < second
+                first, second = first[keep], second[keep]
+
+            pairs_list.append(np.stack([np.minimum(first, second), np.maximum(first, second)], axis=1))
+
+        if pairs_list:
+            self._candidate_pairs = np.concatenate(pairs_list)
+        else:
+            self._candidate_pairs = np.zeros((0, 2), dtype=np.int64)
+
+        return self._candidate_pairs
+
+    def pairs_within(self, radius):
+        """
+        Parameters
+        ----------
+        radius : float
+            maximum pair distance, may not exceed the cell size
+
+        Returns
+        -------
+        tuple
+            (pairs, distances) with pairs a (P, 2) array of index pairs (i, j), i < j, at most radius apart
+        """
+        assert radius <= self.cell_size, "radius may not exceed the cell size"
+
+        pairs = self.candidate_pairs()
+        distances = np.linalg.norm(self.points[pairs[:, 0]] - self.points[pairs[:, 1]], axis=1)
+        within = distances <= radius
+
+        return pairs[within], distances[within]
+
+    def nearest_neighbors(self):
+        """
+        Exact nearest neighbor of every point. Neighbors are resolved from adjacent cells, points without a neighbor
+        within one cell size fall back to a k-d tree query.
+
+        Returns
+        -------
+        tuple
+            (indices, distances) arrays of shape (N,), index -1 and distance inf for a single point
+        """
+        num_points = len(self.points)
+        nn_distances = np.full((num_points,), np.inf)
+        nn_indices = np.full((num_points,), -1, dtype=np.int64)
+
+        pairs = self.candidate_pairs()
+        if len(pairs) > 0:
+            distances = np.linalg.norm(self.points[pairs[:, 0]] - self.points[pairs[:, 1]], axis=1)
+
+            # minimum over both pair members, sorted by point then distance to take the first entry per point
+            both = np.concatenate([pairs, pairs[:, ::-1]])
+            both_distances = np.concatenate([distances, distances])
+            sort_idx = np.lexsort((both_distances, both[:, 0]))
+            points_sorted = both[sort_idx, 0]
+            _, first_idx = np.unique(points_sorted, return_index=True)
+            nn_indices[points_sorted[first_idx]] = both[sort_idx[first_idx], 1]
+            nn_distances[points_sorted[first_idx]] = both_distances[sort_idx[first_idx]]
+
+        # points further than a cell from any candidate may have a closer neighbor outside adjacent cells
+        unresolved = np.nonzero(nn_distances > self.cell_size)[0]
+        if num_points > 1 and len(unresolved) > 0:
+            distances, indices = cKDTree(self.points).query(self.points[unresolved], k=2)
+            # the closest result is the point itself unless coincident points are returned first
+            self_first = indices[:, 0] == unresolved
+            nn_indices[unresolved] = np.where(self_first, indices[:, 1], indices[:, 0])
+            nn_distances[unresolved] = np.where(self_first, distances[:, 1], distances[:, 0])
+
+        return nn_indices, nn_distances
@@ -0,0 +1,263 @@
+"""
+Lightweight policy runtime for exported policies, free of ray and tensorflow.
+
+Loads the policy networks exported by scripts/model_conversion (.mat and .h5 weights of the RLlib fully connected
+network, or ONNX models with pre/post processing built in) and evaluates them in batches. All policies share the
+compute_actions / compute_single_action interface used by scripts/eval.py.
+"""
+
+import os
+import re
+import gym.spaces
+import numpy as np
+
+ACTIVATIONS = {
+    'tanh': np.tanh,
+    'relu': lambda x: np.maximum(x, 0),
+    'linear': lambda x: x,
+}
+
+
+class BasePolicy:
+    """
+    Base class of exported policies.
+
+    Parameters
+    ----------
+    action_split : str
+        'tuple' to return every action as a tuple of 1d arrays, one per actuator, matching the Tuple action spaces of
+        AgentController, or 'array' to return a single array
+    """
+
+    def __init__(self, action_split='tuple'):
+        if action_split not in ['tuple', 'array']:
+            raise ValueError("invalid action_split '{}', should be 'tuple' or 'array'".format(action_split))
+        self.action_split = action_split
+
+    def compute_action_batch(self, obs_batch):
+        """
+        Parameters
+        ----------
+        obs_batch : numpy.ndarray
+            (B, obs dim) array of observations
+
+        Returns
+        -------
+        numpy.ndarray
+            (B, action dim) array of deterministic actions
+        """
+        raise NotImplementedError
+
+    def _split(self, action):
+        if self.action_split == 'tuple':
+            return tuple(np.split(action, len(action)))
+        return action
+
+    def compute_actions(self, obs_list):
+        obs_batch = np.stack([np.asarray(obs, dtype=np.float64).flatten() for obs in obs_list])
+        return [self._split(action) for action in self.compute_action_batch(obs_batch)]
+
+    def compute_single_action(self, obs):
+        return self.compute_actions([obs])[0]
+
+
+class NumpyMLPPolicy(BasePolicy):
+    """
+    NumPy evaluation of the policy branch of an RLlib fully connected network.
+
+    The network outputs action distribution inputs, of which the deterministic actions are selected. Given the action
+    space, the outputs are laid out like RLlib's action distributions: the means followed by the log stds of every Box,
+    the logits of every Discrete, concatenated over the subspaces of a Tuple. Box actions are then the means, clipped
+    to the space bounds unless another clip is given, and Discrete actions the argmax of the logits.
+    Without action space, all actions are continuous: for Tuple action spaces of scalar actions, mean and log std are
+    interleaved per actuator ('interleaved' output layout), for a single Box action space the means come first
+    ('concatenated').
+    """
+
+    def __init__(self, kernels, biases, activation='tanh', output_layout='interleaved', clip=None,
+                 action_split='tuple', action_space=None):
+        """
+        Parameters
+        ----------
+        kernels : list
+            (in, out) weight matrices of the hidden layers followed by the output layer
+        biases : list
+            bias vectors matching kernels
+        activation : str
+            hidden layer activation, one of 'tanh', 'relu', 'linear'
+        output_layout : str
+            'interleaved' or 'concatenated' layout of action means and log stds in the network output
+        clip : list
+            optional [low, high] bounds applied to the continuous actions
+        action_split : str
+            see BasePolicy, 'tuple' returns actions structured like the action space if given
+        action_space : gym.spaces.Space
+            optional action space of Box, Discrete and Tuple spaces, which determines the output layout instead of
+            output_layout
+        """
+        super().__init__(action_split=action_split)
+        if activation not in ACTIVATIONS:
+            raise ValueError("invalid activation '{}', should be one of {}".format(activation, list(ACTIVATIONS)))
+        if output_layout not in ['interleaved', 'concatenated']:
+            raise ValueError("invalid output_layout '{}', should be 'interleaved' or 'concatenated'".format(
+                output_layout))
+
+        self.kernels = [np.asarray(k, dtype=np.float64) for k in kernels]
+        self.biases = [np.asarray(b, dtype=np.float64).flatten() for b in biases]
+        self.activation = ACTIVATIONS[activation]
+        self.output_layout = output_layout
+        self.clip = clip
+
+        self.action_space = action_space
+        self.action_segments = None
+        if action_space is not None:
+            self.action_segments = _action_segments(action_space)
+            output_size = sum(output_size for _, output_size in self.action_segments)
+            if output_size != self.kernels[-1].shape[1]:
+                raise ValueError("network output of size {} does not match the {} action distribution inputs of "
+                                 "action space {}".format(self.kernels[-1].shape[1], output_size, action_space))
+
+    @classmethod
+    def from_weights(cls, weights, **kwargs):
+        """
+        Build from a dict of RLlib fully connected network weights, e.g. as saved by rllib_model_to_keras.py with
+        names like 'default_policy_fc_1_kernel' and 'default_policy_fc_out_bias'. Value branch weights are ignored.
+        """
+        hidden = {}
+        output = {}
+        for name, value in weights.items():
+            match = re.search(r'(?:^|_)fc_(\d+|out)_(kernel|bias)$', name)
+            if match is None:
+                continue
+            layer, kind = match.groups()
+            if layer == 'out':
+                output[kind] = value
+            else:
+                hidden.setdefault(int(layer), {})[kind] = value
+
+        if 'kernel' not in output or 'bias' not in output:
+            raise ValueError("no policy output layer 'fc_out' found in weights")
+
+        layers = [hidden[i] for i in sorted(hidden)] + [output]
+        return cls([layer['kernel'] for layer in layers], [layer['bias'] for layer in layers], **kwargs)
+
+    @classmethod
+    def from_mat(cls, path, **kwargs):
+        from scipy.io import loadmat
+        weights = {k: v for k, v in loadmat(path).items() if not k.startswith('__')}
+        return cls.from_weights(weights, **kwargs)
+
+    @classmethod
+    def from_h5(cls, path, **kwargs):
+        import h5py
+
+        weights = {}
+        with h5py.File(path, 'r') as f:
+            group = f['model_weights'] if 'model_weights' in f else f
+
+            def visit(name, obj):
+                if isinstance(obj, h5py.Dataset):
+                    # keras names weights <layer>/<layer>/kernel:0
+                    parts = name.split('/')
+                    weights["{}_{}".format(parts[0], parts[-1].split(':')[0])] = obj[()]
+
+            group.visititems(visit)
+
+        return cls.from_weights(weights, **kwargs)
+
+    def compute_action_batch(self, obs_batch):
+        x = obs_batch
+        for kernel, bias in zip(self.kernels[:-1], self.biases[:-1]):
+            x = self.activation(x @ kernel + bias)
+        out = x @ self.kernels[-1] + self.biases[-1]
+
+        if self.action_segments is not None:
+            return self._select_actions(out)
+
+        if self.output_layout == 'interleaved':
+            actions = out[:, ::2]
+        else:
+            actions = out[:, :out.shape[1] // 2]
+
+        if self.clip is not None:
+            actions = np.clip(actions, self.clip[0], self.clip[1])
+
+        return actions
+
+    def _select_actions(self, out):
+        actions = []
+        start = 0
+        for space, output_size in self.action_segments:
+            logits = out[:, start:start + output_size]
+            if isinstance(space, gym.spaces.Discrete):
+                actions.append(np.argmax(logits, axis=1)[:, None].astype(np.float64))
+            else:
+                means = logits[:, :output_size // 2]
+                low, high = self.clip if self.clip is not None else (space.low.flatten(), space.high.flatten())
+                actions.append(np.clip(means, low, high))
+            start += output_size
+        return np.concatenate(actions, axis=1)
+
+    def _split(self, action):
+        if self.action_space is None or self.action_split == 'array':
+            return super()._split(action)
+        structured, _ = _structure_action(self.action_space, action, 0)
+        return structured
+
+
+def _action_segments(space):
+    """flat list of (Box or Discrete space, number of distribution inputs) in RLlib's action distribution layout"""
+    if isinstance(space, gym.spaces.Tuple):
+        return [segment for subspace in space.spaces for segment in _action_segments(subspace)]
+    if isinstance(space, gym.spaces.Discrete):
+        return [(space, space.n)]
+    if isinstance(space, gym.spaces.Box):
+        return [(space, 2 * int(np.prod(space.shape)))]
+    raise ValueError("unsupported action space {}, should be composed of Box, Discrete and Tuple spaces".format(space))
+
+
+def _structure_action(space, action, start):
+    """rebuild an action of space from a flat action array, returning the action and the end index"""
+    if isinstance(space, gym.spaces.Tuple):
+        values = []
+        for subspace in space.spaces:
+            value, start = _structure_action(subspace, action, start)
+            values.append(value)
+        return tuple(values), start
+    if isinstance(space, gym.spaces.Discrete):
+        return int(action[start]), start + 1
+    size = int(np.prod(space.shape))
+    return action[start:start + size].reshape(space.shape).astype(space.dtype), start + size
+
+
+class OnnxPolicy(BasePolicy):
+    """
+    onnxruntime evaluation of an exported policy whose first output holds the actions, e.g. the models with built in
+    normalization and tanh clipping written by keras_model_include_pre_post_processing.py.
+    """
+
+    def __init__(self, path, action_split='tuple'):
+        super().__init__(action_split=action_split)
+        import onnxruntime
+
+        self.session = onnxruntime.InferenceSession(path)
+        self.input_name = self.session.get_inputs()[0].name
+
+    def compute_action_batch(self, obs_batch):
+        return self.session.run(None, {self.input_name: obs_batch.astype(np.float32)})[0].astype(np.float64)
+
+
+def load_policy(path, action_space=None, **kwargs):
+    """
+    Load an exported policy by file extension: '.mat' and '.h5' into a NumpyMLPPolicy, '.onnx' into an OnnxPolicy.
+    The action space is only used by NumpyMLPPolicy, ONNX models include their own post processing.
+    """
+    ext = os.path.splitext(path)[1]
+    if ext == '.mat':
+        return NumpyMLPPolicy.from_mat(path, action_space=action_space, **kwargs)
+    elif ext == '.h5':
+        return NumpyMLPPolicy.from_h5(path, action_space=action_space, **kwargs)
+    elif ext == '.onnx':
+        return OnnxPolicy(path, **kwargs)
+    else:
+        raise ValueError("unrecognized policy format '{}', should be '.mat', '.h5' or '.onnx'".format(ext))
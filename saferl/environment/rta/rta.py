@@ -1,16 +1,30 @@
 import abc
+import time
 import numpy as np
 
+from saferl.environment.rta.telemetry import RTATelemetry
+
 
 class RTAModule(abc.ABC):
 
-    def __init__(self):
+    def __init__(self, debug_info_interval=None):
+        """
+        Parameters
+        ----------
+        debug_info_interval : int
+            If set, full debug data (e.g. projected trajectories) is included in the info dict every
+            debug_info_interval steps. Debug data is omitted from the info dict when None.
+        """
         self.platform = None
+        self.debug_info_interval = debug_info_interval
 
         self.enable = True
         self.intervening = False
         self.control_desired = None
         self.control_actual = None
+        self.monitor_latency = None
+
+        self.telemetry = RTATelemetry()
 
         self.reset()
 
@@ -19,17 +33,28 @@ class RTAModule(abc.ABC):
         self.intervening = False
         self.control_desired = None
         self.control_actual = None
+        self.monitor_latency = None
+
+        self.telemetry.reset()
 
     def setup(self, platform):
         self.platform = platform
 
     def filter_control(self, sim_state, step_size, control):
         self.control_desired = np.copy(control)
+        self.monitor_latency = None
 
         if self.enable:
+            start_time = time.perf_counter()
             self.control_actual = np.copy(self._filter_control(sim_state, step_size, control))
+            if self.monitor_latency is None:
+                self.monitor_latency = time.perf_counter() - start_time
         else:
             self.control_actual = np.copy(control)
+            self.monitor_latency = 0
+
+        self.telemetry.record(
+            step_size, self.intervening, self.control_desired, self.control_actual, self.monitor_latency)
 
         return np.copy(self.control_actual)
 
@@ -47,11 +72,15 @@ class RTAModule(abc.ABC):
 
         return info
 
+    @property
+    def debug_info_active(self):
+        return self.debug_info_interval is not None and (self.telemetry.steps % self.debug_info_interval == 0)
+
 
 class SimplexModule(RTAModule):
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
 
     def reset(self):
         super().reset()
@@ -65,7 +94,9 @@ class SimplexModule(RTAModule):
             return control
 
     def monitor(self, sim_state, step_size, control):
+        start_time = time.perf_counter()
         self.intervening = self._monitor(sim_state, step_size, control, self.intervening)
+        self.monitor_latency = time.perf_counter() - start_time
 
     def backup_control(self, sim_state, step_size, control):
         return self._backup_control(sim_state, step_size, control)
@@ -0,0 +1,116 @@
+import math
+import numpy as np
+
+
+class RTATelemetry:
+    """
+    Fixed size per-episode counters describing the behavior of an RTA module.
+
+    Every quantity is accumulated in constant memory so telemetry can be recorded on every step without the cost of
+    logging the full RTA info dict. Monitor latency percentiles are estimated from a log spaced histogram.
+    """
+
+    # latency histogram bin edges in seconds (1 microsecond to 1 second)
+    LATENCY_BIN_EDGES = np.logspace(-6, 0, 61)
+
+    def __init__(self):
+        self.latency_hist = np.zeros(len(self.LATENCY_BIN_EDGES) + 1, dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        self.steps = 0
+        self.intervening_steps = 0
+        self.intervention_count = 0
+        self.switch_count = 0
+        self.time_total = 0
+        self.time_intervening = 0
+
+        self.latency_hist[:] = 0
+        self.latency_max = 0
+
+        self.deviation_sum = 0
+        self.deviation_max = 0
+
+        self.was_intervening = False
+
+    def record(self, step_size, intervening, control_desired, control_actual, monitor_latency):
+        """
+        Accumulate a single RTA filter step.
+
+        Parameters
+        ----------
+        step_size : float
+            simulation time covered by the filtered control
+        intervening : bool
+            whether the RTA module intervened during this step
+        control_desired : numpy.ndarray
+            control requested by the agent
+        control_actual : numpy.ndarray
+            control passed on to the platform dynamics
+        monitor_latency : float
+            wall clock time spent in the monitor in seconds
+        """
+        self.steps += 1
+        self.time_total += step_size
+
+        if intervening:
+            self.intervening_steps += 1
+            self.time_intervening += step_size
+
+        if intervening != self.was_intervening:
+            self.switch_count += 1
+            if intervening:
+                self.intervention_count += 1
+        self.was_intervening = intervening
+
+        self.latency_hist[np.searchsorted(self.LATENCY_BIN_EDGES, monitor_latency)] += 1
+        self.latency_max = max(self.latency_max, monitor_latency)
+
+        deviation = float(np.linalg.norm(control_actual - control_desired))
+        self.deviation_sum += deviation
+        self.deviation_max = max(self.deviation_max, deviation)
+
+    def latency_percentile(self, q):
+        """
+        Estimate a monitor latency percentile from the latency histogram.
+
+        Parameters
+        ----------
+        q : float
+            percentile in the range [0, 100]
+
+        Returns
+        -------
+        float
+            upper edge of the histogram bin containing the requested percentile, in seconds
+        """
+        if self.steps == 0:
+            return 0
+
+        rank = max(1, math.ceil(q / 100 * self.steps))
+        bin_idx = int(np.searchsorted(np.cumsum(self.latency_hist), rank))
+
+        if bin_idx >= len(self.LATENCY_BIN_EDGES):
+            return self.latency_max
+        return min(float(self.LATENCY_BIN_EDGES[bin_idx]), self.latency_max)
+
+    def summary(self):
+        steps = max(self.steps, 1)
+        time_total = self.time_total if self.time_total > 0 else 1
+
+        summary = {
+            'intervention_count': self.intervention_count,
+            'intervening_steps': self.intervening_steps,
+            'intervening_ratio': self.intervening_steps / steps,
+            'time_intervening': self.time_intervening,
+            'switch_count': self.switch_count,
+            'switch_frequency': self.switch_count / time_total,
+            'monitor_latency_p50': self.latency_percentile(50),
+            'monitor_latency_p90': self.latency_percentile(90),
+            'monitor_latency_p99': self.latency_percentile(99),
+            'monitor_latency_max': self.latency_max,
+            'control_deviation_mean': self.deviation_sum / steps,
+            'control_deviation_max': self.deviation_max,
+        }
+
+        return summary
@@ -7,18 +7,16 @@ from saferl.environment.tasks.processor.status import TimeoutStatusProcessor, Ne
 from saferl.environment.utils import setup_env_objs_from_config
 from saferl.environment.constants import STATUS, REWARD, OBSERVATION, VERBOSE, RENDER
 from saferl.environment.tasks.initializers import RandBoundsInitializer
-from saferl.environment.models.platforms import BasePlatform
+from saferl.environment.tasks.scheduler import PlatformScheduler
+from saferl.environment.models.scene import SceneGraph
 
 
 class BaseEnv(gym.Env):
 
     def __init__(self, env_config):
 
-        # Set time step size
-        if 'step_size' in env_config:
-            self.step_size = env_config['step_size']
-        else:
-            self.step_size = 1
+        # Set time step size, substeps per agent decision and their reward aggregation
+        self._setup_stepping(env_config)
 
         # Initialize simulation state
         self.sim_state = SimulationState()
@@ -31,7 +29,7 @@ class BaseEnv(gym.Env):
 
         # Create managers
         self.observation_manager = ObservationManager(env_config[OBSERVATION])
-        self.reward_manager = RewardManager(env_config[REWARD])
+        self.reward_manager = RewardManager(env_config[REWARD], aggregation=self.reward_aggregation)
         self.status_manager = StatusManager(env_config[STATUS])
 
         # Create renderer
@@ -66,6 +64,9 @@ class BaseEnv(gym.Env):
             config=env_config,
             default_initializer=RandBoundsInitializer)
 
+        # Setup platform stepping schedule and relative object pose updates
+        self._setup_scheduler(env_config)
+
         # Setup action and observation space
         self._setup_action_space()
         self._setup_obs_space()
@@ -73,6 +74,27 @@ class BaseEnv(gym.Env):
         # Reset environment
         self.reset()
 
+    def _setup_stepping(self, env_config):
+        self.step_size = env_config.get('step_size', 1)
+
+        # number of simulation substeps per agent decision and how their rewards are aggregated
+        self.action_repeat = env_config.get('action_repeat', 1)
+        self.reward_aggregation = env_config.get('reward_aggregation', 'sum')
+
+        if not (isinstance(self.action_repeat, int) and self.action_repeat >= 1):
+            raise ValueError("action_repeat must be a positive integer, got '{}'".format(self.action_repeat))
+        if self.reward_aggregation not in ['sum', 'last']:
+            raise ValueError("invalid reward_aggregation '{}'".format(self.reward_aggregation))
+
+    def _setup_scheduler(self, env_config):
+        self.scheduler = PlatformScheduler(
+            env_objs_config=env_config["env_objs"],
+            env_objs=self.sim_state.env_objs,
+            agent=self.sim_state.agent,
+            step_size=self.step_size)
+
+        self.scene_graph = SceneGraph(self.sim_state.env_objs)
+
     def seed(self, seed=None):
         np.random.seed(seed)
         # note that python random should not be used (use numpy random instead)
@@ -82,29 +104,30 @@ class BaseEnv(gym.Env):
         return [seed]
 
     def _step_sim(self, action):
-        agent_name = self.sim_state.agent.name
-        platforms = [obj_item for obj_item in self.sim_state.env_objs.items() if isinstance(obj_item[1], BasePlatform)]
-        for obj_name, obj in platforms:
-            if obj_name == agent_name:
-                self.sim_state.env_objs[obj_name].step_compute(self.sim_state, self.step_size, action)
-            else:
-                self.sim_state.env_objs[obj_name].step_compute(self.sim_state, self.step_size)
-
-        for obj_name, obj in platforms:
-            self.sim_state.env_objs[obj_name].step_apply()
+        self.scheduler.step(self.sim_state, self.step_size, action, propagate=False)
+        self.scene_graph.flush()
 
     def step(self, action):
-
-        self._step_sim(action)
-
-        # update time metrics - timesteps and time_elapsed
-        self.time_elapsed += self.step_size
-        self.timesteps_elapsed += 1
-
-        # update status and generate logs
-        self.sim_state.status = self._generate_status()
-        reward = self._generate_reward()
-        obs = self._generate_obs()
+        decision_step_size = 0
+
+        for _ in range(self.action_repeat):
+            self._step_sim(action)
+
+            # update time metrics - timesteps and time_elapsed
+            self.time_elapsed += self.step_size
+            self.timesteps_elapsed += 1
+            decision_step_size += self.step_size
+
+            # update termination relevant status and rewards, stop substepping on termination
+            self.sim_state.status = self.status_manager.substep(self.sim_state, self.step_size)
+            self.reward_manager.substep(self.sim_state, self.step_size)
+            if self.status['success'] or self.status['failure']:
+                break
+
+        # update deferred status and generate logs at decision point
+        self.sim_state.status = self.status_manager.flush(self.sim_state)
+        reward = self.reward_manager.flush()
+        obs = self._generate_obs(decision_step_size)
         info = self.generate_info()
 
         # determine if done
@@ -146,36 +169,22 @@ class BaseEnv(gym.Env):
         for initializer in self.initializers:
             initializer.initialize()
 
+        self.scheduler.reset()
+
     def _setup_obs_space(self):
         self.observation_space = self.observation_manager.observation_space
 
     def _setup_action_space(self):
         self.action_space = self.agent.action_space
 
-    def _generate_obs(self):
+    def _generate_obs(self, step_size=None):
         # TODO: Handle multiple observations
         self.observation_manager.step(
             self.sim_state,
-            self.step_size,
+            self.step_size if step_size is None else step_size,
         )
         return self.observation_manager.obs
 
-    def _generate_reward(self):
-        self.reward_manager.step(
-            self.sim_state,
-            self.step_size,
-        )
-        return self.reward_manager.step_value
-
-    def _generate_status(self):
-
-        status = self.status_manager.step(
-            self.sim_state,
-            self.step_size,
-        )
-
-        return status
-
     def generate_info(self):
         info = {
             'failure': self.status['failure'],
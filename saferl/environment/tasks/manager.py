@@ -62,14 +62,15 @@ class ObservationManager(Manager):
         obs_list = []
         for processor in self.processors:
             obs_list.append(processor.step(sim_state, step_size))
-        self.obs = np.concatenate(obs_list)
+        # batched processors return (N, k) observations of N agents, concatenated per agent
+        self.obs = np.concatenate(obs_list, axis=-1)
         return self.obs
 
     def process(self, sim_state):
         obs_list = []
         for processor in self.processors:
             obs_list.append(processor.process(sim_state))
-        obs = np.concatenate(obs_list)
+        obs = np.concatenate(obs_list, axis=-1)
         return obs
 
 
@@ -78,12 +79,64 @@ class StatusManager(Manager):
         super().__init__(processors=processors)
         self.status = {}
 
+        # processors configured with 'substep: False' are only stepped at decision points
+        self.deferred_processors = set(p["name"] for p in processors if not p.get("substep", True))
+        self.deferred_step_size = 0
+
+        for name in ['success', 'failure']:
+            if name in self.deferred_processors:
+                raise ValueError("'{}' status processor is required at every substep and cannot be deferred"
+                                 .format(name))
+
     def reset(self, sim_state):
         # construct new status from initial environment
+        self.deferred_step_size = 0
         return self._compute_status(sim_state, reset=True)
 
     def step(self, sim_state, step_size):
-        return self._compute_status(sim_state, step_size=step_size)
+        self.substep(sim_state, step_size)
+        return self.flush(sim_state)
+
+    def substep(self, sim_state, step_size):
+        """
+        Step all processors except deferred processors, which keep their last values while their step size
+        accumulates until the next flush.
+        Processors evaluated at every substep, including reward processors, should not depend on deferred processors.
+        """
+        status_prev = self.status
+        self.status = {}
+        sim_state_new = copy.copy(sim_state)
+        sim_state_new.status = self.status
+
+        for processor in self.processors:
+            if processor.name in self.deferred_processors:
+                # carry over the processor's value and any '<name>.' prefixed keys it wrote
+                for k, v in status_prev.items():
+                    if k == processor.name or k.startswith(processor.name + '.'):
+                        sim_state_new.status[k] = v
+            else:
+                sim_state_new.status[processor.name] = processor.step(sim_state_new, step_size)
+
+        self.deferred_step_size += step_size
+
+        return sim_state_new.status
+
+    def flush(self, sim_state):
+        """
+        Step deferred processors by the step size accumulated since the last flush.
+        """
+        if self.deferred_processors and self.deferred_step_size > 0:
+            self.status = dict(self.status)
+            sim_state_new = copy.copy(sim_state)
+            sim_state_new.status = self.status
+
+            for processor in self.processors:
+                if processor.name in self.deferred_processors:
+                    sim_state_new.status[processor.name] = processor.step(sim_state_new, self.deferred_step_size)
+
+        self.deferred_step_size = 0
+
+        return self.status
 
     def process(self, sim_state):
         return self._compute_status(sim_state)
@@ -113,22 +166,29 @@ class StatusManager(Manager):
 
 
 class RewardManager(Manager):
-    def __init__(self, processors):
+    def __init__(self, processors, aggregation='sum'):
         super().__init__(processors=processors)
+        self.aggregation = aggregation
         self.step_value = 0
         self.total_value = 0
+        self.step_components = {p.name: 0 for p in self.processors}
+        self.total_components = {p.name: 0 for p in self.processors}
+        self.flushed = True
 
     def reset(self, sim_state):
         super().reset(sim_state)
         self.step_value = 0
         self.total_value = 0
+        self.step_components = {p.name: 0 for p in self.processors}
+        self.total_components = {p.name: 0 for p in self.processors}
+        self.flushed = True
 
     def generate_components(self):
         """helper method to organize reward components"""
         components = {"step": {}, "total": {}}
         for p in self.processors:
-            components["step"][p.name] = p.get_step_value()
-            components["total"][p.name] = p.get_total_value()
+            components["step"][p.name] = self.step_components[p.name]
+            components["total"][p.name] = self.total_components[p.name]
         return components
 
     def generate_info(self):
@@ -141,11 +201,36 @@ class RewardManager(Manager):
         return info
 
     def step(self, sim_state, step_size):
-        self.step_value = 0
+        self.substep(sim_state, step_size)
+        return self.flush()
+
+    def substep(self, sim_state, step_size):
+        """
+        Step all processors over one simulation substep. The step value of the current decision is the sum of the
+        substep values ('sum' aggregation) or the value of the latest substep ('last' aggregation).
+        Terminal rewards are always included, as substepping stops at the substep an episode terminates in.
+        """
+        if self.flushed or self.aggregation == 'last':
+            self.step_value = 0
+            self.step_components = dict.fromkeys(self.step_components, 0)
+            self.flushed = False
+
         for processor in self.processors:
-            self.step_value += processor.step(sim_state, step_size)
+            value = processor.step(sim_state, step_size)
+            self.step_value += value
+            self.step_components[processor.name] += value
             sim_state = self._update_sim_state_with_reward_terminal(sim_state, processor)
+        return self.step_value
+
+    def flush(self):
+        """
+        Complete the current decision and return its step value. Totals accumulate the aggregated decision values,
+        so that component totals add up to the episode reward.
+        """
         self.total_value += self.step_value
+        for name, value in self.step_components.items():
+            self.total_components[name] += value
+        self.flushed = True
         return self.step_value
 
     def process(self, sim_state):
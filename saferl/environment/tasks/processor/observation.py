@@ -229,3 +229,58 @@ class VelocityObservationProcessor(SpatialObservationProcessor):
             value = value[0:2]
 
         return value
+
+
+class NearestObstaclesObservationProcessor(ObservationProcessor):
+    """
+    Observe the k obstacles of an ObstacleField nearest to a reference object. Each obstacle is represented by the
+    obstacle center relative to the reference, rotated into the reference frame, followed by its signed surface
+    distance. Fields with fewer than k obstacles are padded with zero positions and 'pad_distance'.
+    """
+    def __init__(self,
+                 name=None,
+                 normalization=None,
+                 clip=None,
+                 post_processors=None,
+                 obstacle_field=None,
+                 reference=None,
+                 k=1,
+                 two_d=False,
+                 pad_distance=1e6):
+
+        assert type(two_d) is bool, "Expected bool for 'two_d' parameter, but found {}".format(type(two_d))
+        self.two_d = two_d
+        self.k = k
+        self.obstacle_field = obstacle_field
+        self.reference = reference
+        self.pad_distance = pad_distance
+
+        super().__init__(name=name,
+                         normalization=normalization,
+                         clip=clip,
+                         post_processors=post_processors)
+
+    def define_observation_space(self) -> gym.spaces.Box:
+        obstacle_dim = 3 if self.two_d else 4
+        observation_space = gym.spaces.Box(shape=(self.k * obstacle_dim,), low=-math.inf, high=math.inf)
+        return observation_space
+
+    def _process(self, sim_state) -> np.ndarray:
+        obstacle_field = sim_state.env_objs[self.obstacle_field]
+        reference = sim_state.env_objs[self.reference]
+        reference_position = reference.position
+
+        indices, distances = obstacle_field.nearest(reference_position, k=self.k)
+
+        obs = np.zeros((self.k, 4), dtype=np.float64)
+        obs[:, 3] = self.pad_distance
+
+        if len(indices) > 0:
+            rel_positions = obstacle_field.centers[indices] - reference_position[None, :]
+            obs[:len(indices), 0:3] = reference.orientation.apply(rel_positions, inverse=True)
+            obs[:len(indices), 3] = distances
+
+        if self.two_d:
+            obs = obs[:, [0, 1, 3]]
+
+        return obs.flatten()
@@ -75,12 +75,13 @@ class Normalize(PostProcessor):
         assert type(input_array) == np.ndarray, \
             "Expected \'input_array\' to be type numpy.ndarray, but instead received {}.".format(type(input_array))
 
-        # check that dims line up for mu and sigma (or that they're scalars)
+        # check that dims line up for mu and sigma (or that they're scalars), batched (N, k) arrays of several agents
+        # are normalized per row
         if type(self.mu) == np.ndarray:
-            assert input_array.shape == self.mu.shape, \
+            assert input_array.shape[-1:] == self.mu.shape, \
                 "Incompatible shapes for \'input_array\' and \'mu\': {} vs {}".format(input_array, self.mu)
         if type(self.sigma) == np.ndarray:
-            assert input_array.shape == self.sigma.shape, \
+            assert input_array.shape[-1:] == self.sigma.shape, \
                 "Incompatible shapes for \'input_array\' and \'sigma\': {} vs {}".format(input_array, self.sigma)
 
         # apply normalization
@@ -345,7 +345,8 @@ class RewardProcessor(Processor):
 
     def _reward_bound_terminal_status(self):
         status = {}
-        if self.total_value > self.upper_bound and self.upper_bound_terminal:
+        # batched processors of several agents terminate once any agent total crosses the bound
+        if self.upper_bound_terminal and np.any(self.total_value > self.upper_bound):
             if self.upper_bound_terminal == 'success':
                 status['success'] = True
             elif self.upper_bound_terminal == 'failure':
@@ -353,7 +354,7 @@ class RewardProcessor(Processor):
             else:
                 raise ValueError(f"upper_bound_terminal {self.upper_bound_terminal} is an invalid value")
 
-        if self.total_value < self.lower_bound and self.lower_bound_terminal:
+        if self.lower_bound_terminal and np.any(self.total_value < self.lower_bound):
             if self.lower_bound_terminal == 'success':
                 status['success'] = True
             elif self.lower_bound_terminal == 'failure':
@@ -1,4 +1,8 @@
+import numpy as np
+
 from saferl.environment.tasks.processor import StatusProcessor
+from saferl.environment.models.platforms import BasePlatform
+from saferl.environment.models.spatial import SpatialHash
 
 
 # Used a default failure processor
@@ -41,3 +45,142 @@ class NeverSuccessStatusProcessor(StatusProcessor):
         # since a default , will always return false
         success = False
         return success
+
+
+class EventStatusProcessor(StatusProcessor):
+    """
+    Registers an integration event with a platform and reports the simulation time of its crossing during the last
+    step, or None if the event did not occur.
+    """
+
+    def __init__(self, name=None, platform=None, event=None):
+        super().__init__(name=name)
+        self.platform = platform
+
+        event_kwargs = dict(event.get('config', {}))
+        event_kwargs.setdefault('name', name)
+        self.event = event['class'](**event_kwargs)
+
+    def reset(self, sim_state):
+        sim_state.env_objs[self.platform].register_event(self.event)
+
+    def _increment(self, sim_state, step_size):
+        # event state is updated by the platform dynamics
+        pass
+
+    def _process(self, sim_state):
+        return self.event.time if self.event.triggered else None
+
+
+class ObstacleDistanceStatusProcessor(StatusProcessor):
+    """
+    Reports the signed surface distance from a platform to the nearest obstacle of an ObstacleField.
+    """
+
+    def __init__(self, name=None, obstacle_field=None, platform=None):
+        super().__init__(name=name)
+        self.obstacle_field = obstacle_field
+        self.platform = platform
+
+    def reset(self, sim_state):
+        pass
+
+    def _increment(self, sim_state, step_size):
+        # status derived directly from simulation state, therefore no state machine needed
+        pass
+
+    def _process(self, sim_state):
+        obstacle_field = sim_state.env_objs[self.obstacle_field]
+        return obstacle_field.nearest_distance(sim_state.env_objs[self.platform].position)
+
+
+class ObstacleCollisionStatusProcessor(StatusProcessor):
+    """
+    Reports whether a platform is within a safety margin of any obstacle of an ObstacleField.
+    Uses the distance reported by an ObstacleDistanceStatusProcessor if 'distance_status' is given.
+    """
+
+    def __init__(self, name=None, obstacle_field=None, platform=None, margin=0, distance_status=None):
+        super().__init__(name=name)
+        self.obstacle_field = obstacle_field
+        self.platform = platform
+        self.margin = margin
+        self.distance_status = distance_status
+
+    def reset(self, sim_state):
+        pass
+
+    def _increment(self, sim_state, step_size):
+        # status derived directly from simulation state, therefore no state machine needed
+        pass
+
+    def _process(self, sim_state):
+        if self.distance_status is not None:
+            distance = sim_state.status[self.distance_status]
+        else:
+            obstacle_field = sim_state.env_objs[self.obstacle_field]
+            distance = obstacle_field.nearest_distance(sim_state.env_objs[self.platform].position)
+
+        return bool(distance <= self.margin)
+
+
+class PairwiseSeparationStatusProcessor(StatusProcessor):
+    """
+    Reports the minimum separation between any two of a set of platforms.
+
+    Positions are bucketed in a uniform spatial hash with the safety margin as cell size, so violating pairs and
+    nearest neighbors are found in roughly linear time in the number of platforms. Besides the minimum separation
+    stored under its own name, the processor writes the status keys
+        '<name>.violating_pairs': list of platform name pairs closer than the safety margin
+        '<name>.nearest.<platform>': distance from each platform to its nearest neighbor
+        '<name>.neighbor.<platform>': name of the nearest neighbor of each platform
+    """
+
+    def __init__(self, name=None, platforms=None, safety_margin=100):
+        """
+        Parameters
+        ----------
+        name : str
+            status key of the minimum separation
+        platforms : list
+            names of the platforms to separate, all platforms in the environment if None
+        safety_margin : float
+            minimum allowed separation, also used as spatial hash cell size
+        """
+        super().__init__(name=name)
+        self.platforms = platforms
+        self.safety_margin = safety_margin
+        self.spatial_hash = SpatialHash(cell_size=safety_margin)
+
+        self.platform_names = None
+        self.nearest_keys = None
+        self.neighbor_keys = None
+        self.violating_pairs_key = "{}.violating_pairs".format(name)
+
+    def reset(self, sim_state):
+        if self.platforms is None:
+            self.platform_names = [k for k, v in sim_state.env_objs.items() if isinstance(v, BasePlatform)]
+        else:
+            self.platform_names = list(self.platforms)
+        self.nearest_keys = ["{}.nearest.{}".format(self.name, p) for p in self.platform_names]
+        self.neighbor_keys = ["{}.neighbor.{}".format(self.name, p) for p in self.platform_names]
+
+    def _increment(self, sim_state, step_size):
+        # status derived directly from simulation state, therefore no state machine needed
+        pass
+
+    def _process(self, sim_state):
+        positions = np.array([sim_state.env_objs[p].position for p in self.platform_names], dtype=np.float64)
+        self.spatial_hash.build(positions)
+
+        pairs, _ = self.spatial_hash.pairs_within(self.safety_margin)
+        nn_indices, nn_distances = self.spatial_hash.nearest_neighbors()
+
+        sim_state.status[self.violating_pairs_key] = [
+            (self.platform_names[i], self.platform_names[j]) for i, j in pairs]
+        for key, nn_distance in zip(self.nearest_keys, nn_distances):
+            sim_state.status[key] = float(nn_distance)
+        for key, nn_index in zip(self.neighbor_keys, nn_indices):
+            sim_state.status[key] = self.platform_names[nn_index] if nn_index >= 0 else None
+
+        return float(np.min(nn_distances)) if len(nn_distances) > 0 else np.inf
@@ -0,0 +1,145 @@
+from saferl.environment.models.platforms import BasePlatform, PassThroughController
+
+
+class PlatformSchedule:
+    """
+    Steps a platform at every simulation step. Default schedule for all platforms.
+    """
+
+    def __init__(self, platform):
+        self.platform = platform
+
+    def reset(self):
+        pass
+
+    def step_compute(self, sim_state, step_size, action=None):
+        self.platform.step_compute(sim_state, step_size, action)
+
+    def step_apply(self, propagate=True):
+        self.platform.step_apply(propagate=propagate)
+
+
+class IntervalPlatformSchedule(PlatformSchedule):
+    """
+    Steps a platform once every 'interval' simulation steps with the accumulated step size.
+    The platform state is held constant in between.
+    """
+
+    def __init__(self, platform, interval=1):
+        assert isinstance(interval, int) and interval >= 1, "interval must be a positive integer"
+        super().__init__(platform)
+        self.interval = interval
+        self.steps_pending = 0
+        self.stepped = False
+
+    def reset(self):
+        self.steps_pending = 0
+        self.stepped = False
+
+    def step_compute(self, sim_state, step_size, action=None):
+        self.steps_pending += 1
+        self.stepped = self.steps_pending >= self.interval
+
+        if self.stepped:
+            self.platform.step_compute(sim_state, self.steps_pending * step_size, action)
+            self.steps_pending = 0
+
+    def step_apply(self, propagate=True):
+        if self.stepped:
+            self.platform.step_apply(propagate=propagate)
+
+
+class AnalyticPlatformSchedule(PlatformSchedule):
+    """
+    Propagates a passive platform in closed form with its dynamics' propagate method.
+    The trajectory is precomputed in chunks of 'chunk_steps' steps and looked up every step.
+    Only platforms without an agent controller or rta module are supported, since their control is constant.
+    """
+
+    def __init__(self, platform, step_size, chunk_steps=1000):
+        if not isinstance(platform.controller, PassThroughController) or platform.rta is not None:
+            raise ValueError("analytic schedule of platform '{}' requires a passive platform without controller or "
+                             "rta".format(platform.name))
+        assert chunk_steps >= 1, "chunk_steps must be positive"
+
+        super().__init__(platform)
+        self.step_size = step_size
+        self.chunk_steps = chunk_steps
+
+        self.control = None
+        self.trajectory = None
+        self.trajectory_idx = 0
+
+    def reset(self):
+        actuation = self.platform.controller.gen_actuation(self.platform.state)
+        self.control = self.platform.actuator_set.gen_control(actuation)
+        self.trajectory = None
+        self.trajectory_idx = 0
+
+    def step_compute(self, sim_state, step_size, action=None):
+        if step_size != self.step_size:
+            raise ValueError("analytic schedule of platform '{}' was built for step size {}, got {}".format(
+                self.platform.name, self.step_size, step_size))
+
+        if self.trajectory is None or self.trajectory_idx >= len(self.trajectory):
+            self.trajectory = self.platform.dynamics.propagate(
+                self.platform.state.vector, self.control, self.step_size, self.chunk_steps)
+            self.trajectory_idx = 0
+
+        self.platform.next_state = self.platform.state.__class__(vector=self.trajectory[self.trajectory_idx])
+        self.trajectory_idx += 1
+
+
+class PlatformScheduler:
+    """
+    Steps the platforms of an environment according to the schedule declared in each env_objs entry, e.g.
+
+        - name: lead
+          class: saferl.aerospace.models.dubins.platforms.Dubins2dPlatform
+          schedule:
+            mode: analytic
+          config: ...
+
+    Supported modes are 'default', 'interval' (with an 'interval' in steps) and 'analytic' (with optional
+    'chunk_steps'). The platform list and stepping order are computed once at construction.
+    """
+
+    def __init__(self, env_objs_config, env_objs, agent, step_size):
+        self.agent = agent
+        self.schedules = []
+
+        for obj_config in env_objs_config:
+            platform = env_objs[obj_config["name"]]
+            if not isinstance(platform, BasePlatform):
+                continue
+
+            schedule_config = dict(obj_config.get("schedule", {}))
+            mode = schedule_config.pop("mode", "default")
+
+            if mode != "default" and platform is agent:
+                raise ValueError("agent platform '{}' must use the default schedule".format(platform.name))
+
+            if mode == "default":
+                schedule = PlatformSchedule(platform, **schedule_config)
+            elif mode == "interval":
+                schedule = IntervalPlatformSchedule(platform, **schedule_config)
+            elif mode == "analytic":
+                schedule = AnalyticPlatformSchedule(platform, step_size, **schedule_config)
+            else:
+                raise ValueError("invalid schedule mode '{}' for platform '{}'".format(mode, platform.name))
+
+            self.schedules.append(schedule)
+
+    def reset(self):
+        for schedule in self.schedules:
+            schedule.reset()
+
+    def step(self, sim_state, step_size, action=None, propagate=True):
+        for schedule in self.schedules:
+            if schedule.platform is self.agent:
+                schedule.step_compute(sim_state, step_size, action)
+            else:
+                schedule.step_compute(sim_state, step_size)
+
+        for schedule in self.schedules:
+            schedule.step_apply(propagate=propagate)
@@ -7,7 +7,7 @@ import yaml
 import jsonlines
 import numpy as np
 import json
-from ray import tune
+from scipy.spatial.transform import Rotation
 import saferl
 
 
@@ -69,6 +69,11 @@ def setup_env_objs_from_config(config, default_initializer):
         # Instantiate object
         obj = cls(**{k: v for k, v in cfg.items() if k != "init"})
         env_objs[name] = obj
+
+        # Optionally replace the platform dynamics, e.g. with a learned surrogate
+        if "dynamics" in obj_config:
+            dynamics_config = obj_config["dynamics"]
+            obj.dynamics = dynamics_config["class"](**dynamics_config.get("config", {}))
         if name == agent_name:
             agent = obj
 
@@ -169,6 +174,7 @@ class YAMLParser:
         return target
 
     def tune_search_space(self, method, arg_str):
+        from ray import tune
         arg_str = '['+arg_str+']'
         arg_values = ast.literal_eval(arg_str)
         return getattr(tune, method)(*arg_values)
@@ -188,6 +194,7 @@ class YAMLParser:
         if method in search_space_api_funcs:
             return self.tune_search_space(method, argument_str)
         else:
+            from ray import tune
             arg_values = ast.literal_eval(argument_str)
             return getattr(tune, method)(*arg_values)
 
@@ -256,6 +263,84 @@ def jsonify(map):
     return map
 
 
+def _encode_dict(obj, arrays, min_array_size):
+    encoded = {}
+    for key, value in obj.items():
+        if type(key) is not str and isinstance(key, np.generic):
+            key = key.item()
+        encoded[key] = _encode(value, arrays, min_array_size)
+    return encoded
+
+
+def _encode_list(obj, arrays, min_array_size):
+    return [_encode(value, arrays, min_array_size) for value in obj]
+
+
+def _encode_ndarray(obj, arrays, min_array_size):
+    if arrays is not None and obj.dtype.kind == 'f' and obj.size >= min_array_size:
+        arrays.append(obj.copy())
+        return {"__array__": len(arrays) - 1}
+    if obj.dtype.kind == 'O':
+        return _encode_list(obj.tolist(), arrays, min_array_size)
+    return obj.tolist()
+
+
+def _encode_identity(obj, arrays, min_array_size):
+    return obj
+
+
+_JSON_ENCODERS = {
+    dict: _encode_dict,
+    list: _encode_list,
+    tuple: _encode_list,
+    np.ndarray: _encode_ndarray,
+    str: _encode_identity,
+    int: _encode_identity,
+    float: _encode_identity,
+    bool: _encode_identity,
+    type(None): _encode_identity,
+    Rotation: lambda obj, arrays, min_array_size: obj.as_quat().tolist(),
+}
+
+
+def _encode(obj, arrays, min_array_size):
+    encoder = _JSON_ENCODERS.get(type(obj))
+    if encoder is not None:
+        return encoder(obj, arrays, min_array_size)
+
+    # subclasses and numpy scalars of any width
+    if isinstance(obj, np.generic):
+        return obj.item()
+    for obj_type, encoder in _JSON_ENCODERS.items():
+        if isinstance(obj, obj_type):
+            return encoder(obj, arrays, min_array_size)
+
+    raise TypeError("Object of type {} is not JSON serializable".format(type(obj).__name__))
+
+
+def to_jsonable(obj, arrays=None, min_array_size=1):
+    """
+    Convert an object of nested dicts, lists, numpy arrays and scalars and Rotations into JSON serializable types in a
+    single pass. Unlike jsonify, the input is not modified and a new object is returned.
+
+    Parameters
+    ----------
+    obj
+        The object to convert. Rotations are converted to their [x, y, z, w] quaternion.
+    arrays : list
+        Optional binary side channel. Float arrays of at least min_array_size elements are appended to this list
+        instead of being converted, and replaced by {"__array__": <index in arrays>}.
+    min_array_size : int
+        The minimum size of float arrays passed through the side channel.
+
+    Returns
+    -------
+    object
+        The JSON serializable copy of obj.
+    """
+    return _encode(obj, arrays, min_array_size)
+
+
 def is_jsonable(object):
     """
     A helper function to determine whether or not an object is JSON serializable.
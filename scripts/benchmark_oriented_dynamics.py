@@ -0,0 +1,245 @@
+import argparse
+import math
+import os
+import timeit
+import types
+import numpy as np
+import scipy.integrate
+
+from saferl.environment.utils import YAMLParser, build_lookup
+from saferl.aerospace.models.cwhspacecraft.platforms.oriented import CWHOriented2dState
+
+"""
+This script benchmarks the step path of CWHOriented2dDynamics on the oriented docking config, comparing the previous
+dx, which built state objects at every derivative evaluation, with the allocation-free dx_into kernel under RK45
+integration, and with the fixed step RK4 integration using preallocated buffers. Environment steps are timed with a
+seeded random action sequence.
+
+The new step paths are checked on the dynamics steps of that run, each step taken from the same state and control:
+  - dx_into derivatives and dx_into RK45 trajectories equal those of the previous dx, except for the steps on which
+    the previous dx clamped theta_dot inside the solver's state vector, where they agree within the RK45 tolerances
+  - RK4 steps agree with a tight tolerance RK45 reference, on steps that do not cross the angular velocity limit.
+    Steps crossing the limit, where the derivative is discontinuous, are reported separately.
+"""
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'configs', 'docking',
+                              'docking_oriented_default.yaml')
+# default tolerances of scipy.integrate.solve_ivp
+RK45_RTOL = 1e-3
+RK45_ATOL = 1e-6
+
+
+def get_args():
+    """
+    A function to process script args.
+
+    Returns
+    -------
+    argparse.Namespace
+        Collection of command line arguments and their values
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('--config', type=str, default=DEFAULT_CONFIG,
+                        help="The full path to an environment config file")
+    parser.add_argument('--num_steps', type=int, default=500, help="Number of environment steps per timing run")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of timing repetitions, the best is reported")
+    parser.add_argument('--seed', type=int, default=0, help="The seed of the environment and random actions")
+    parser.add_argument('--rk4_atol', type=float, default=1e-5,
+                        help="Absolute tolerance of RK4 steps not crossing the angular velocity limit")
+
+    return parser.parse_args()
+
+
+def legacy_dx(self, t, state_vec, control):
+    # CWHOriented2dDynamics.dx before the dx_into kernel
+    state_cur = CWHOriented2dState(vector=state_vec, vector_deep_copy=False)
+
+    pos_vel_state_vec = np.array([state_cur.x, state_cur.y, state_cur.x_dot, state_cur.y_dot], dtype=np.float64)
+
+    thrust_vector = control[0] * np.array([math.cos(state_cur.theta), math.sin(state_cur.theta)])
+    pos_vel_derivative = np.matmul(self.A, pos_vel_state_vec) + np.matmul(self.B, thrust_vector)
+
+    theta_dot_dot = control[1]
+
+    # check angular velocity limit
+    if state_cur.theta_dot >= self.ang_vel_limit:
+        theta_dot_dot = min(0, theta_dot_dot)
+        state_cur.theta_dot = self.ang_vel_limit
+    elif state_cur.theta_dot <= -self.ang_vel_limit:
+        theta_dot_dot = max(0, theta_dot_dot)
+        state_cur.theta_dot = -self.ang_vel_limit
+
+    state_derivative = CWHOriented2dState(
+        x=pos_vel_derivative[0],
+        y=pos_vel_derivative[1],
+        theta=state_cur.theta_dot,
+        x_dot=pos_vel_derivative[2],
+        y_dot=pos_vel_derivative[3],
+        theta_dot=theta_dot_dot,
+    )
+
+    return state_derivative.vector
+
+
+def set_step_path(dynamics, legacy, integration_method):
+    if legacy:
+        dynamics.dx = types.MethodType(legacy_dx, dynamics)
+    elif 'dx' in vars(dynamics):
+        del dynamics.dx
+    dynamics.integration_method = integration_method
+
+
+def sample_actions(env, num_steps, seed):
+    env.action_space.seed(seed)
+    return [env.action_space.sample() for _ in range(num_steps)]
+
+
+def run_steps(env, actions, seed):
+    """
+    Step the environment through the action sequence, resetting on episode ends.
+
+    Returns
+    -------
+    numpy.ndarray
+        (num_steps, 6) agent state vectors after every step
+    """
+    env.seed(seed)
+    env.reset()
+
+    states = np.empty((len(actions), 6), dtype=np.float64)
+    for i, action in enumerate(actions):
+        _, _, done, _ = env.step(action)
+        states[i] = env.agent.state.vector
+        if done:
+            env.reset()
+    return states
+
+
+def record_dynamics_steps(env, actions, seed):
+    """
+    Returns
+    -------
+    list
+        (step_size, state vector, control) of every dynamics step of the agent
+    """
+    dynamics = env.agent.dynamics
+    steps = []
+
+    def step(step_size, state, control):
+        steps.append((step_size, state.vector.copy(), np.array(control, dtype=np.float64)))
+        return type(dynamics).step(dynamics, step_size, state, control)
+
+    dynamics.step = step
+    try:
+        run_steps(env, actions, seed)
+    finally:
+        del dynamics.step
+    return steps
+
+
+def single_steps(dynamics, steps):
+    """state vectors after a single dynamics step from each recorded state"""
+    return np.array([dynamics.step(step_size, CWHOriented2dState(vector=state_vec), control).vector
+                     for step_size, state_vec, control in steps])
+
+
+def reference_steps(dynamics, steps):
+    """single steps with tight RK45 tolerances, followed by the limits and wrapping of CWHOriented2dDynamics.step"""
+    results = []
+    for step_size, state_vec, control in steps:
+        sol = scipy.integrate.solve_ivp(dynamics.dx, (0, step_size), state_vec,
+                                        args=(control,), rtol=1e-10, atol=1e-12)
+        state = CWHOriented2dState(vector=sol.y[:, -1])
+        state.theta_dot = np.clip(state.theta_dot, -dynamics.ang_vel_limit, dynamics.ang_vel_limit)
+        state.theta = (state.theta + np.pi) % (2 * np.pi) - np.pi
+        results.append(state.vector)
+    return np.array(results)
+
+
+def deviation(states, reference):
+    """absolute deviation per state element, of theta modulo 2 pi"""
+    dev = np.abs(states - reference)
+    dev[:, 2] = np.abs((states[:, 2] - reference[:, 2] + np.pi) % (2 * np.pi) - np.pi)
+    return dev
+
+
+def main():
+    args = get_args()
+
+    parser = YAMLParser(yaml_file=args.config, lookup=build_lookup())
+    config = parser.parse_env()
+    env = config['env'](config['env_config'])
+    dynamics = env.agent.dynamics
+    actions = sample_actions(env, args.num_steps, args.seed)
+
+    step_paths = [
+        ("previous dx, RK45", True, 'RK45'),
+        ("dx_into, RK45", False, 'RK45'),
+        ("dx_into, preallocated RK4", False, 'RK4'),
+    ]
+
+    step_times = {}
+    for name, legacy, integration_method in step_paths:
+        set_step_path(dynamics, legacy, integration_method)
+        step_times[name] = min(timeit.repeat(lambda: run_steps(env, actions, args.seed), number=1,
+                                             repeat=args.repeat)) / args.num_steps
+
+    set_step_path(dynamics, True, 'RK45')
+    steps = record_dynamics_steps(env, actions, args.seed)
+    legacy_trajectory = run_steps(env, actions, args.seed)
+    single = {}
+    for name, legacy, integration_method in step_paths:
+        set_step_path(dynamics, legacy, integration_method)
+        single[name] = single_steps(dynamics, steps)
+    set_step_path(dynamics, False, 'RK45')
+    trajectory = run_steps(env, actions, args.seed)
+    reference = reference_steps(dynamics, steps)
+
+    # derivative evaluations alone, on the recorded states
+    out = np.empty((6,), dtype=np.float64)
+    state_vecs = np.array([state_vec for _, state_vec, _ in steps])
+    controls = np.array([control for _, _, control in steps])
+    dx_funcs = {
+        "previous dx": lambda: [legacy_dx(dynamics, 0, s.copy(), c) for s, c in zip(state_vecs, controls)],
+        "dx_into": lambda: [dynamics.dx_into(s, c, out) for s, c in zip(state_vecs, controls)],
+        "dx_batch": lambda: dynamics.dx_batch(0, state_vecs, controls),
+    }
+    dx_times = {name: min(timeit.repeat(f, number=1, repeat=args.repeat)) / len(steps)
+                for name, f in dx_funcs.items()}
+
+    limit = dynamics.ang_vel_limit
+    saturated = (np.abs(state_vecs[:, 5]) >= limit) | (np.abs(reference[:, 5]) >= limit) | \
+        (np.abs(single["dx_into, preallocated RK4"][:, 5]) >= limit)
+
+    print("{} environment steps, {} dynamics steps crossing or at the angular velocity limit".format(
+        args.num_steps, int(saturated.sum())))
+    for name, _, _ in step_paths:
+        print("{:<28s} {:8.1f} us/step  {:5.2f}x".format(
+            name, 1e6 * step_times[name], step_times["previous dx, RK45"] / step_times[name]))
+    for name, dx_time in dx_times.items():
+        print("{:<28s} {:8.2f} us/evaluation  {:5.2f}x".format(name, 1e6 * dx_time, dx_times["previous dx"] / dx_time))
+    for name, _, _ in step_paths:
+        dev = deviation(single[name], reference)
+        print("{:<28s} max single step deviation from reference, x y theta x_dot y_dot theta_dot".format(name))
+        print("    within limit:   " + " ".join("{:.1e}".format(d) for d in dev[~saturated].max(axis=0, initial=0)))
+        print("    crossing limit: " + " ".join("{:.1e}".format(d) for d in dev[saturated].max(axis=0, initial=0)))
+
+    legacy_dxs = np.array([legacy_dx(dynamics, 0, s.copy(), c) for s, c in zip(state_vecs, controls)])
+    assert np.allclose(dynamics.dx_batch(0, state_vecs, controls), legacy_dxs, rtol=1e-12, atol=1e-12), \
+        "dx_batch derivatives differ from the previous dx"
+    for s, c, d in zip(state_vecs, controls, legacy_dxs):
+        assert np.allclose(dynamics.dx(0, s, c), d, rtol=1e-12, atol=1e-12), "dx_into derivatives differ"
+
+    assert np.allclose(single["dx_into, RK45"], single["previous dx, RK45"], rtol=RK45_RTOL, atol=RK45_ATOL), \
+        "dx_into RK45 steps differ from the previous RK45 steps beyond the solver tolerances"
+    assert np.array_equal(single["dx_into, RK45"][~saturated], single["previous dx, RK45"][~saturated]), \
+        "dx_into RK45 steps within the angular velocity limit differ from the previous RK45 steps"
+    assert np.allclose(trajectory, legacy_trajectory, rtol=RK45_RTOL, atol=1e-2), \
+        "dx_into RK45 trajectory diverges from the previous RK45 trajectory"
+    assert np.all(deviation(single["dx_into, preallocated RK4"], reference)[~saturated] <= args.rk4_atol), \
+        "RK4 steps within the angular velocity limit differ from the reference"
+
+
+if __name__ == "__main__":
+    main()
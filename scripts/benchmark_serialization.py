@@ -0,0 +1,94 @@
+import argparse
+import copy
+import json
+import timeit
+import numpy as np
+
+from saferl.environment.utils import jsonify, is_jsonable, to_jsonable, YAMLParser, build_lookup
+
+"""
+This script benchmarks the JSON conversion of info dicts, comparing the trial encoding of is_jsonable / jsonify (as
+previously used by eval.py and LoggingCallback) with the single pass to_jsonable. Info payloads are collected from
+random action rollouts of the environment in the given config.
+"""
+
+
+def get_args():
+    """
+    A function to process script args.
+
+    Returns
+    -------
+    argparse.Namespace
+        Collection of command line arguments and their values
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('config', type=str, help="The full path to an environment config file")
+    parser.add_argument('--num_steps', type=int, default=500, help="Number of info payloads to collect")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of timing repetitions, the best is reported")
+    parser.add_argument('--seed', type=int, default=0, help="The seed of the environment and random actions")
+
+    return parser.parse_args()
+
+
+def collect_infos(env, num_steps, seed):
+    env.seed(seed)
+    env.action_space.seed(seed)
+    env.reset()
+
+    infos = []
+    while len(infos) < num_steps:
+        _, _, done, info = env.step(env.action_space.sample())
+        infos.append(info)
+        if done:
+            env.reset()
+    return infos
+
+
+def legacy_convert(info):
+    if is_jsonable(info) is True:
+        return info
+    return jsonify(info)
+
+
+def main():
+    args = get_args()
+
+    parser = YAMLParser(yaml_file=args.config, lookup=build_lookup())
+    config = parser.parse_env()
+    env = config['env'](config['env_config'])
+    infos = collect_infos(env, args.num_steps, args.seed)
+
+    # jsonify converts in place, every timing run gets fresh copies
+    copies = [copy.deepcopy(infos) for _ in range(args.repeat)]
+
+    # both encodings must produce the same log contents, unless jsonify misses a type (e.g. numpy.float32)
+    for info in infos[:10]:
+        try:
+            legacy = json.dumps(legacy_convert(copy.deepcopy(info)))
+        except TypeError as e:
+            print("is_jsonable + jsonify cannot convert the payload: {}".format(e))
+            break
+        assert json.loads(json.dumps(to_jsonable(info))) == json.loads(legacy)
+
+    legacy_times = [timeit.timeit(lambda: [legacy_convert(info) for info in batch], number=1) for batch in copies]
+    fast_times = [timeit.timeit(lambda: [to_jsonable(info) for info in infos], number=1) for _ in range(args.repeat)]
+
+    arrays = []
+    side_channel_times = [timeit.timeit(lambda: [to_jsonable(info, arrays=arrays) for info in infos], number=1)
+                          for _ in range(args.repeat)]
+
+    encode_times = [timeit.timeit(lambda: [json.dumps(to_jsonable(info)) for info in infos], number=1)
+                    for _ in range(args.repeat)]
+
+    print("{} info payloads, {:.0f} bytes of JSON on average".format(
+        len(infos), np.mean([len(json.dumps(to_jsonable(info))) for info in infos])))
+    for name, times in [("is_jsonable + jsonify", legacy_times), ("to_jsonable", fast_times),
+                        ("to_jsonable, array side channel", side_channel_times),
+                        ("to_jsonable + json.dumps", encode_times)]:
+        print("{:<34s} {:8.2f} us/step".format(name, 1e6 * min(times) / len(infos)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import os
+import argparse
+from glob import glob
+
+from saferl.environment.logs.compaction import compact_log, verify_compaction, compaction_report, DEFAULT_PRECISION
+from saferl.environment.logs.index import index_path
+
+"""
+This script compacts the jsonlines training and evaluation logs of experiment output trees into compressed columnar
+archives (see saferl.environment.logs.compaction), reporting the compression ratio and decode throughput of each log.
+Compacted logs are written next to the originals and are read by the visualization scripts like jsonlines logs.
+"""
+
+LOG_PATTERNS = ['**/training_logs/worker_*.log', '**/evaluation_logs/worker_*.log', '**/eval*.log']
+
+
+def get_args():
+    """
+    A function to process script args.
+
+    Returns
+    -------
+    argparse.Namespace
+        Collection of command line arguments and their values
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('paths', type=str, nargs='+',
+                        help="Log files, or directories searched recursively for training and evaluation logs")
+    parser.add_argument('--precision', type=float, default=DEFAULT_PRECISION,
+                        help="Quantization step of position, velocity and observation channels, 0 for lossless"
+                             " compaction")
+    parser.add_argument('--suffix', type=str, default=".compact", help="Suffix appended to compacted log paths")
+    parser.add_argument('--verify', default=False, action="store_true",
+                        help="Decode every compacted log and compare it against the original")
+    parser.add_argument('--remove_original', default=False, action="store_true",
+                        help="Delete original logs after successful (and, with --verify, verified) compaction")
+
+    return parser.parse_args()
+
+
+def find_logs(paths):
+    logs = []
+    for path in paths:
+        if os.path.isdir(path):
+            for pattern in LOG_PATTERNS:
+                logs += glob(os.path.join(path, pattern), recursive=True)
+        else:
+            logs.append(path)
+    # skip sidecar indices and earlier compaction outputs
+    return sorted({log for log in logs if os.path.isfile(log) and log.endswith('.log')})
+
+
+def main():
+    args = get_args()
+    precision = args.precision if args.precision > 0 else None
+
+    total_original = 0
+    total_compacted = 0
+    for log_path in find_logs(args.paths):
+        output_path = log_path + args.suffix
+        compact_log(log_path, output_path, precision=precision)
+        if args.verify:
+            verify_compaction(log_path, output_path, precision=precision)
+
+        report = compaction_report(log_path, output_path)
+        total_original += report['original_bytes']
+        total_compacted += report['compacted_bytes']
+        print("{}: {:.1f} MB -> {:.1f} MB, ratio {:.1f}, decode {:.0f} steps/s".format(
+            log_path, report['original_bytes'] / 1e6, report['compacted_bytes'] / 1e6, report['ratio'],
+            report['decode_steps_per_s']))
+
+        if args.remove_original:
+            os.remove(log_path)
+            if os.path.isfile(index_path(log_path)):
+                os.remove(index_path(log_path))
+
+    if total_compacted:
+        print("total: {:.1f} MB -> {:.1f} MB, ratio {:.1f}".format(
+            total_original / 1e6, total_compacted / 1e6, total_original / total_compacted))
+
+
+if __name__ == "__main__":
+    main()
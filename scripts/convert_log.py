@@ -0,0 +1,42 @@
+import argparse
+
+from saferl.environment.logs.columnar import convert_jsonlines
+
+"""
+This script converts a jsonlines rollout log, as written by scripts/eval.py or LoggingCallback, to the chunked
+columnar format of saferl.environment.logs.columnar.
+"""
+
+
+def get_args():
+    """
+    A function to process script args.
+
+    Returns
+    -------
+    argparse.Namespace
+        Collection of command line arguments and their values
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('log', type=str, help="The full path to the jsonlines log")
+    parser.add_argument('output', type=str, help="The full path of the columnar log to write")
+    parser.add_argument('--chunk_size', type=int, default=4096, help="Minimum number of steps per chunk")
+    parser.add_argument('--episode_key', type=str, default=None,
+                        help="Entry key of the episode id, 'rollout_num' or 'episode_ID' by default")
+    parser.add_argument('--interleaved', default=False, action="store_true",
+                        help="Set for training logs of workers running several environments, whose episodes are"
+                             " interleaved")
+
+    return parser.parse_args()
+
+
+def main():
+    args = get_args()
+    num_steps = convert_jsonlines(args.log, args.output, chunk_size=args.chunk_size, episode_key=args.episode_key,
+                                  interleaved=args.interleaved)
+    print("Converted {} steps to {}".format(num_steps, args.output))
+
+
+if __name__ == "__main__":
+    main()
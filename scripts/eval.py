@@ -5,12 +5,15 @@ import jsonlines
 import tqdm
 from glob import glob
 import re
+import shutil
+import numpy as np
 
-import ray
-import ray.rllib.agents.ppo as ppo
-
-from saferl.environment.utils import jsonify, is_jsonable, YAMLParser, build_lookup
+from saferl.environment.utils import to_jsonable, YAMLParser, build_lookup
 from saferl.environment.constants import RENDER
+from saferl.environment.policies import load_policy
+from saferl.environment.logs.columnar import ColumnarLogWriter, merge_logs
+from saferl.environment.logs.index import LogReader
+from saferl.environment.logs.replay import ReplayLogWriter, episode_header
 
 """
 This script loads an agent's policy from a saved checkpoint in the specified experiment directory. It randomly
@@ -18,6 +21,10 @@ initializes the environment said policy was trained on and runs the specified nu
 evaluation rollout episodes are logged to a jsonlines eval.log file (found in experiment_dir/eval/chpt_<number> by
 default). Currently, only DubinsRejoin and DockingEnv are supported.
 
+With --policy, a policy exported by scripts/model_conversion (.mat, .h5 or .onnx) is evaluated with the lightweight
+saferl.environment.policies runtime instead, without starting ray. Combined with --alt_env_config, no experiment
+directory is needed at all.
+
 Author: John McCarroll
 """
 
@@ -39,7 +46,9 @@ def get_args():
     """
     parser = argparse.ArgumentParser()
 
-    parser.add_argument('--dir', type=str, default="", help="The full path to the experiment directory", required=True)
+    parser.add_argument('--dir', type=str, default=None,
+                        help="The full path to the experiment directory, required unless --policy and --alt_env_config"
+                             " are given")
     parser.add_argument(
         '--trial_index',
         type=int,
@@ -47,7 +56,8 @@ def get_args():
         help="The index corresponding to the desired experiment to load. Use when multiple experiments are run by Tune."
         )
     parser.add_argument('--ckpt_num', type=int, default=None, help="Specify a checkpoint to load")
-    parser.add_argument('--seed', type=int, default=None, help="The seed used to initialize evaluation environment")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="The seed the per episode seeds of the evaluation environment are spawned from")
     parser.add_argument('--explore', default=False, action="store_true", help="True for off-policy evaluation")
     parser.add_argument('--output_dir', type=str, default=None,
                         help="The full path to the directory to write evaluation logs in")
@@ -60,11 +70,119 @@ def get_args():
     parser.add_argument('--alt_env_config', type=str, default="",
                         help="Provide the full path to an alternative environment config file,"
                              " in which the loaded policy will be evaluated.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of parallel rollout workers. Episodes are seeded individually from --seed, so"
+                             " results do not depend on the number of workers.")
+    parser.add_argument('--policy', type=str, default=None,
+                        help="The full path to an exported .mat, .h5 or .onnx policy evaluated without ray")
+    parser.add_argument('--batch_size', type=int, default=1,
+                        help="Number of concurrent episodes per process whose observations are batched into a single"
+                             " policy call per step. Episodes are seeded individually from --seed, so results do not"
+                             " depend on the batch size.")
+
+    parser.add_argument('--log_format', type=str, default='jsonlines', choices=['jsonlines', 'columnar', 'replay'],
+                        help="Format of the evaluation log, 'columnar' writes compressed column arrays per chunk of"
+                             " episodes, see saferl.environment.logs.columnar. 'replay' only records the seed, initial"
+                             " state and actions of every episode, full logs are regenerated with scripts/replay.py.")
 
     return parser.parse_args()
 
 
-def run_rollouts(agent, env, log_dir, num_rollouts=1, render=False):
+def log_state(info, action, obs, rollout_num, step_num, episode_reward, raw=False):
+    """
+    A function to build the eval log entry of a single step.
+
+    Parameters
+    ----------
+    raw : bool
+        Keep numpy values in the entry, for writers which accept them (ColumnarLogWriter).
+
+    Returns
+    -------
+    dict
+        The JSON-friendly log entry, unless raw.
+    """
+    # store log contents in state
+    state = {}
+    state["info"] = info if raw else to_jsonable(info)
+    state["actions"] = [float(i) for i in action]
+    state["obs"] = obs if raw else obs.tolist()
+    state["rollout_num"] = rollout_num
+    state["step_number"] = step_num
+    state["episode_reward"] = episode_reward
+
+    return state
+
+
+def run_rollout(agent, env, writer, rollout_num, render=False, seed=None):
+    """
+    A function to run and log a single evaluation episode.
+
+    Parameters
+    ----------
+    agent : ray.rllib.agents.trainer_template.PPO
+        The trained agent which will be evaluated.
+    env : BaseEnv
+        The environment in which the agent will act.
+    writer : jsonlines.Writer or ColumnarLogWriter
+        The writer of the evaluation log.
+    rollout_num : int
+        The index of the episode within the evaluation.
+    render : bool
+        Flag to render the environment in a separate window during rollouts.
+    seed : int
+        The seed applied before the episode's reset, required by replay logs.
+    """
+    raw = getattr(writer, 'accepts_numpy', False)
+    replay = getattr(writer, 'replay', False)
+    if replay and seed is None:
+        raise ValueError("replay logs require a seed per episode")
+
+    if seed is not None:
+        env.seed(seed)
+
+    # run until episode ends
+    episode_reward = 0
+    done = False
+    obs = env.reset()
+    step_num = 0
+    header = episode_header(env, seed) if replay else None
+
+    while not done:
+        # progress environment state
+        action = agent.compute_single_action(obs)
+
+        obs, reward, done, info = env.step(action)
+        step_num += 1
+        episode_reward += reward
+
+        # write state to file
+        state = log_state(info, action, obs, rollout_num, step_num, episode_reward, raw=raw)
+        if header is not None:
+            state["replay"] = header
+            header = None
+        writer.write(state)
+
+        if render:
+            # attempt to render environment state
+            env.render()
+
+
+def open_log_writer(log_path, log_format='jsonlines'):
+    """
+    Open an evaluation log writer of the given format, 'jsonlines', 'columnar' or 'replay'.
+    """
+    if log_format == 'columnar':
+        return ColumnarLogWriter(log_path)
+    elif log_format == 'replay':
+        return ReplayLogWriter(log_path)
+    elif log_format == 'jsonlines':
+        return jsonlines.open(log_path, "w")
+    else:
+        raise ValueError("invalid log format '{}', should be 'jsonlines', 'columnar' or 'replay'".format(log_format))
+
+
+def run_rollouts(agent, env, log_dir, num_rollouts=1, render=False, log_format='jsonlines', seeds=None):
     """
     A function to coordinate policy evaluation via RLLib API.
 
@@ -80,41 +198,231 @@ def run_rollouts(agent, env, log_dir, num_rollouts=1, render=False):
         The number of randomly initialized episodes conducted to evaluate the agent on.
     render : bool
         Flag to render the environment in a separate window during rollouts.
+    log_format : str
+        The format of the evaluation log, 'jsonlines', 'columnar' or 'replay'.
+    seeds : list
+        Optional seed of each episode, applied at its reset. Otherwise the environment keeps its RNG state across
+        episodes.
     """
-    with jsonlines.open(log_dir, "w") as writer:
+    with open_log_writer(log_dir, log_format) as writer:
         for i in tqdm.tqdm(range(num_rollouts)):
-            # run until episode ends
-            episode_reward = 0
-            done = False
-            obs = env.reset()
-            step_num = 0
-
-            while not done:
-                # progress environment state
-                action = agent.compute_single_action(obs)
-                
-                obs, reward, done, info = env.step(action)
-                step_num += 1
-                episode_reward += reward
-
-                # store log contents in state
-                state = {}
-                if is_jsonable(info) is True:
-                    state["info"] = info
-                else:
-                    state["info"] = jsonify(info)
-                state["actions"] = [float(i) for i in action]
-                state["obs"] = obs.tolist()
-                state["rollout_num"] = i
-                state["step_number"] = step_num
-                state["episode_reward"] = episode_reward
+            run_rollout(agent, env, writer, i, render=render, seed=None if seeds is None else seeds[i])
+
+
+class RLlibBatchPolicy:
+    """
+    Batched action computation with a restored RLlib trainer, applying the same observation preprocessing,
+    filtering and action clipping as the trainer's compute_single_action.
+    """
+
+    def __init__(self, agent):
+        from ray.rllib.policy.policy import DEFAULT_POLICY_ID
+
+        local_worker = agent.workers.local_worker()
+        self.policy = agent.get_policy()
+        self.preprocessor = local_worker.preprocessors[DEFAULT_POLICY_ID]
+        self.obs_filter = local_worker.filters[DEFAULT_POLICY_ID]
+        self.clip_actions = agent.config["clip_actions"]
+
+    def compute_actions(self, obs_list):
+        from ray.rllib.utils.spaces.space_utils import clip_action, unbatch
+
+        obs_batch = np.stack([self.obs_filter(self.preprocessor.transform(obs), update=False) for obs in obs_list])
+        actions, _, _ = self.policy.compute_actions(obs_batch)
+        actions = unbatch(actions)
+        if self.clip_actions:
+            actions = [clip_action(action, self.policy.action_space_struct) for action in actions]
+        return actions
+
+
+def run_rollouts_batched(policy, envs, writer, rollout_nums, seeds, progress=None):
+    """
+    A function to run evaluation episodes in lockstep across several environments with one batched policy call per
+    step.
+
+    Finished episodes are replaced by the next pending rollout until all rollouts have started, after which the batch
+    shrinks, so no policy calls are spent on finished episodes. Episodes are written to the log in rollout order.
+
+    Parameters
+    ----------
+    policy : RLlibBatchPolicy
+        Object with a compute_actions method mapping a list of observations to a list of actions.
+    envs : list
+        The environment instances, one per concurrent episode.
+    writer : jsonlines.Writer or ColumnarLogWriter
+        The writer of the evaluation log.
+    rollout_nums : list
+        The indices of the episodes to run.
+    seeds : list
+        The seed of each episode, applied at its reset.
+    progress : tqdm.tqdm
+        Optional progress bar updated once per finished episode.
+    """
+    raw = getattr(writer, 'accepts_numpy', False)
+    replay = getattr(writer, 'replay', False)
+    pending = list(zip(rollout_nums, seeds))[::-1]
+    order = list(rollout_nums)
+    finished = {}
+    next_write = 0
+
+    # per slot episode state: rollout number, last observation, step number, episode reward, buffered log entries,
+    # replay header of the first entry
+    slots = {}
+
+    def start_episode(slot):
+        rollout_num, seed = pending.pop()
+        envs[slot].seed(seed)
+        obs = envs[slot].reset()
+        slots[slot] = [rollout_num, obs, 0, 0, [], episode_header(envs[slot], seed) if replay else None]
+
+    for slot in range(min(len(envs), len(pending))):
+        start_episode(slot)
+
+    while slots:
+        active = sorted(slots.keys())
+        actions = policy.compute_actions([slots[slot][1] for slot in active])
+
+        for slot, action in zip(active, actions):
+            episode = slots[slot]
+            obs, reward, done, info = envs[slot].step(action)
+            episode[1] = obs
+            episode[2] += 1
+            episode[3] += reward
+            state = log_state(info, action, obs, episode[0], episode[2], episode[3], raw=raw)
+            if episode[5] is not None:
+                state["replay"] = episode[5]
+                episode[5] = None
+            episode[4].append(state)
+
+            if done:
+                finished[episode[0]] = episode[4]
+                del slots[slot]
+                if progress is not None:
+                    progress.update(1)
+                if pending:
+                    start_episode(slot)
+
+        # write finished episodes as soon as all earlier rollouts are written
+        while next_write < len(order) and order[next_write] in finished:
+            writer.write_all(finished.pop(order[next_write]))
+            next_write += 1
+
+
+def rollout_seeds(seed, num_rollouts):
+    """
+    Independent per episode seeds spawned from a single seed, so every episode is reproducible on its own.
+
+    Returns
+    -------
+    list
+        One integer seed per rollout.
+    """
+    children = np.random.SeedSequence(seed).spawn(num_rollouts)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+class RolloutActor:
+    """
+    Evaluation worker holding its own restored policy and environment instance, run as a ray actor.
+    """
+
+    def __init__(self, ray_config, env_config, ckpt_path, explore, batch_size=1):
+        import ray.rllib.agents.ppo as ppo
+
+        # policy evaluation within the actor does not need rollout workers of its own
+        ray_config = dict(ray_config, num_workers=0, num_gpus=0)
+        self.agent = ppo.PPOTrainer(config=ray_config, env=ray_config['env'])
+        self.agent.restore(ckpt_path)
+        self.agent.get_policy().config['explore'] = explore
+        self.envs = [ray_config['env'](env_config) for _ in range(batch_size)]
+        self.batch_policy = RLlibBatchPolicy(self.agent) if batch_size > 1 else None
+
+    def run(self, rollout_nums, seeds, shard_path, log_format='jsonlines'):
+        with open_log_writer(shard_path, log_format) as writer:
+            if self.batch_policy is not None:
+                run_rollouts_batched(self.batch_policy, self.envs, writer, rollout_nums, seeds)
+            else:
+                for rollout_num, seed in zip(rollout_nums, seeds):
+                    run_rollout(self.agent, self.envs[0], writer, rollout_num, seed=seed)
+        return len(rollout_nums)
+
+
+def run_rollouts_parallel(ray_config, env_config, ckpt_path, explore, log_dir, num_rollouts, seed, workers,
+                          chunk_size=None, batch_size=1, log_format='jsonlines'):
+    """
+    A function to distribute evaluation rollouts across a pool of ray actors.
 
-                # write state to file
-                writer.write(state)
+    Every episode is seeded from its own spawned seed and episodes are split into chunks logged to separate shard
+    files, which are merged in rollout order. The merged log is therefore independent of the number of workers.
 
-                if render:
-                    # attempt to render environment state
-                    env.render()
+    Parameters
+    ----------
+    ray_config : dict
+        The config the agent was trained with.
+    env_config : dict
+        The config of the evaluation environment.
+    ckpt_path : str
+        The path to the checkpoint to restore in every worker.
+    explore : bool
+        True for off-policy evaluation.
+    log_dir : str
+        The path of the merged evaluation log.
+    num_rollouts : int
+        The number of randomly initialized episodes conducted to evaluate the agent on.
+    seed : int
+        The seed from which the episode seeds are spawned.
+    workers : int
+        The number of worker actors.
+    chunk_size : int
+        The number of episodes per task, by default chosen to give each worker several tasks for load balancing and
+        progress reporting.
+    batch_size : int
+        The number of concurrent episodes per worker sharing batched policy calls.
+    log_format : str
+        The format of the evaluation log, 'jsonlines' or 'columnar'.
+    """
+    import ray
+
+    seeds = rollout_seeds(seed, num_rollouts)
+    if chunk_size is None:
+        chunk_size = max(batch_size, num_rollouts // (4 * workers))
+    chunks = [list(range(start, min(start + chunk_size, num_rollouts)))
+              for start in range(0, num_rollouts, chunk_size)]
+    shard_paths = ["{}.shard_{}".format(log_dir, i) for i in range(len(chunks))]
+
+    actor_cls = ray.remote(RolloutActor)
+    actors = [actor_cls.remote(ray_config, env_config, ckpt_path, explore, batch_size) for _ in range(workers)]
+
+    # keep every actor busy with one chunk at a time
+    pending = {}
+    remaining = iter(range(len(chunks)))
+
+    def submit(actor):
+        chunk_index = next(remaining, None)
+        if chunk_index is not None:
+            chunk = chunks[chunk_index]
+            pending[actor.run.remote(chunk, [seeds[i] for i in chunk], shard_paths[chunk_index], log_format)] = actor
+
+    with tqdm.tqdm(total=num_rollouts) as progress:
+        for actor in actors:
+            submit(actor)
+
+        while pending:
+            done, _ = ray.wait(list(pending.keys()), num_returns=1)
+            actor = pending.pop(done[0])
+            progress.update(ray.get(done[0]))
+            submit(actor)
+
+    # merge shards in rollout order
+    if log_format == 'columnar':
+        merge_logs(shard_paths, log_dir, remove=True)
+        return
+
+    with open(log_dir, "w") as merged:
+        for shard_path in shard_paths:
+            with open(shard_path, "r") as shard:
+                shutil.copyfileobj(shard, merged)
+            os.remove(shard_path)
 
 
 def verify_experiment_dir(expr_dir_path, trial_index=None):
@@ -209,40 +517,56 @@ def find_checkpoint_dir(expr_dir_path, ckpt_num):
 
 
 def parse_jsonlines_log(filepath, separate_episodes=False):
-    log_states = []
-    episode_log = []
-    with jsonlines.open(filepath, 'r') as log:
-        for state in log:
-            if separate_episodes and episode_log:
-                if state['step_number'] == 1:
-                    log_states.append(episode_log)
-                    episode_log = []
-            episode_log.append(state)
+    """
+    A function to read all entries of an evaluation or training log through its episode index.
 
-    if separate_episodes:
-        log_states.append(episode_log)
-    else:
-        log_states = episode_log
+    Parameters
+    ----------
+    filepath : str
+        The path to the jsonlines or columnar log.
+    separate_episodes : bool
+        Return a list of episodes, each a list of log entries, instead of a flat list of entries.
+
+    Returns
+    -------
+    list
+        The log entries.
+    """
+    with LogReader(filepath) as reader:
+        episode_logs = list(reader.episodes())
 
-    return log_states
+    if separate_episodes:
+        return episode_logs
+    return [state for episode_log in episode_logs for state in episode_log]
 
 
-def main():
-    # process args
-    args = get_args()
+def resolve_checkpoint(args):
+    """
+    Find the checkpoint of the experiment directory given in the args, load the config it was trained with and make
+    the evaluation output directories.
 
-    # assume full path passed in
-    expr_dir_path = args.dir
-    trial_index = args.trial_index
+    Returns
+    -------
+    tuple
+        (ray_config, ckpt_path, ckpt_eval_dir_path), with ray_config and ckpt_path None when evaluating an exported
+        policy without an experiment directory.
+    """
+    if args.dir is None:
+        if args.policy is None or not args.alt_env_config:
+            raise ValueError("--dir is required unless both --policy and --alt_env_config are given")
+        if args.output_dir is None:
+            raise ValueError("--output_dir is required when no experiment directory is given")
+        os.makedirs(args.output_dir, exist_ok=True)
+        return None, None, args.output_dir
 
-    # verify experiment run dir
-    expr_dir_path = verify_experiment_dir(expr_dir_path, trial_index=trial_index)
+    # assume full path passed in, verify experiment run dir
+    expr_dir_path = verify_experiment_dir(args.dir, trial_index=args.trial_index)
 
     # get checkpoint num
     ckpt_num, ckpt_num_str = find_checkpoint_dir(expr_dir_path, args.ckpt_num)
 
-    # set paths
-    eval_dir_path = os.path.join(expr_dir_path, 'eval')
+    # set paths, output to the experiment dir unless user specified
+    eval_dir_path = os.path.join(expr_dir_path, 'eval') if args.output_dir is None else args.output_dir
     ckpt_eval_dir_path = os.path.join(eval_dir_path, 'ckpt_{}'.format(ckpt_num))
 
     ray_config_path = os.path.join(expr_dir_path, 'params.pkl')
@@ -250,67 +574,138 @@ def main():
     ckpt_filename = 'checkpoint-{}'.format(ckpt_num)
     ckpt_path = os.path.join(expr_dir_path, ckpt_dir, ckpt_filename)
 
-    # user specified output
-    if args.output_dir is not None:
-        eval_dir_path = args.output_dir
-        ckpt_eval_dir_path = os.path.join(eval_dir_path, 'ckpt_{}'.format(ckpt_num))
-
     # make directories
-    os.makedirs(eval_dir_path, exist_ok=True)
     os.makedirs(ckpt_eval_dir_path, exist_ok=True)
 
     # load checkpoint
     with open(ray_config_path, 'rb') as ray_config_f:
         ray_config = pickle.load(ray_config_f)
 
-    # Load render config
-    render_config = None
-    if args.render_config is not None:
-        parser = YAMLParser(yaml_file=args.render_config, lookup=build_lookup())
-        render_config = parser.parse_env()
+    return ray_config, ckpt_path, ckpt_eval_dir_path
 
-    ray.init()
 
-    # load policy and env
+def load_env_config(args, ray_config):
+    """
+    Load the evaluation environment class, config and default seed, from the alternative env config if given and
+    from the training config otherwise.
+    """
     if args.alt_env_config:
         parser = YAMLParser(yaml_file=args.alt_env_config, lookup=build_lookup())
         config = parser.parse_env()
         env_config = config["env_config"]
+        env_cls = ray_config['env'] if ray_config is not None else config['env']
+        default_seed = ray_config['seed'] if ray_config is not None else config.get('seed')
     else:
         env_config = ray_config['env_config']
+        env_cls = ray_config['env']
+        default_seed = ray_config['seed']
+
+    # Load render config
+    if args.render_config is not None:
+        parser = YAMLParser(yaml_file=args.render_config, lookup=build_lookup())
+        env_config[RENDER] = parser.parse_env()
+
+    return env_cls, env_config, default_seed
+
+
+def load_agent(args, ray_config, ckpt_path, action_space):
+    """
+    Load the exported policy, whose actions are selected and clipped for the action space of the evaluation
+    environment, or restore the checkpoint given in the args.
+
+    Returns
+    -------
+    tuple
+        (agent, batch_policy), the agent of serial rollouts and the policy of batched rollouts, None if unused.
+    """
+    if args.policy is not None:
+        if args.workers is not None:
+            raise ValueError("--workers is not supported with --policy, use --batch_size for batched inference")
+        if args.explore:
+            print("Exported policies are deterministic, --explore is ignored.")
+
+        agent = load_policy(args.policy, action_space=action_space)
+        return agent, agent
+
+    import ray
+    import ray.rllib.agents.ppo as ppo
+
+    ray.init()
 
-    if render_config is not None:
-        env_config[RENDER] = render_config
-        
-    #print(f"eval.py, env_config.keys() = {env_config.keys()}")
-    
-    #if args.render and RENDER not in env_config.keys():
-    #    env_config[RENDER] = {'config': {}}
-        
     agent = ppo.PPOTrainer(config=ray_config, env=ray_config['env'])
     agent.restore(ckpt_path)
-    
-    env = ray_config['env'](env_config)
-
-    # set seed and explore
-    seed = args.seed if args.seed is not None else ray_config['seed']
-    env.seed(seed)
 
     agent.get_policy().config['explore'] = args.explore
+    batch_policy = RLlibBatchPolicy(agent) if args.batch_size > 1 else None
+    return agent, batch_policy
 
-    # run inference episodes and log results
-    output_filename = args.output_name
-    if output_filename is None:
-        output_filename = "eval.log"
 
+def run_evaluation(args, ray_config, ckpt_path, env_cls, env_config, seed, log_path):
+    """
+    Run the evaluation rollouts in parallel ray workers, batched or serially, as selected by the args.
+    """
+    if args.batch_size > 1 and args.render:
+        raise ValueError("rendering is not supported with batched rollouts")
+
+    if args.workers is not None and args.policy is None:
+        if args.render:
+            raise ValueError("rendering is not supported with parallel workers")
+
+        import ray
+        ray.init()
+
+        run_rollouts_parallel(
+            ray_config,
+            env_config,
+            ckpt_path,
+            args.explore,
+            log_path,
+            num_rollouts=args.num_rollouts,
+            seed=seed,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            log_format=args.log_format
+        )
+        return
+
+    envs = [env_cls(env_config) for _ in range(args.batch_size)]
+    agent, batch_policy = load_agent(args, ray_config, ckpt_path, envs[0].action_space)
+
+    if args.batch_size > 1:
+        with open_log_writer(log_path, args.log_format) as writer, tqdm.tqdm(total=args.num_rollouts) as progress:
+            run_rollouts_batched(batch_policy, envs, writer, list(range(args.num_rollouts)),
+                                 rollout_seeds(seed, args.num_rollouts), progress=progress)
+        return
+
+    # run inference episodes and log results, seeding every episode like parallel and batched evaluation
     run_rollouts(
         agent,
-        env,
-        os.path.join(ckpt_eval_dir_path, output_filename),
+        envs[0],
+        log_path,
         num_rollouts=args.num_rollouts,
-        render=args.render
+        render=args.render,
+        log_format=args.log_format,
+        seeds=rollout_seeds(seed, args.num_rollouts)
     )
 
 
+def main():
+    # process args
+    args = get_args()
+
+    ray_config, ckpt_path, ckpt_eval_dir_path = resolve_checkpoint(args)
+
+    # load env
+    env_cls, env_config, default_seed = load_env_config(args, ray_config)
+    seed = args.seed if args.seed is not None else default_seed
+
+    output_filename = args.output_name
+    if output_filename is None:
+        output_filename = "eval.log"
+    log_path = os.path.join(ckpt_eval_dir_path, output_filename)
+
+    run_evaluation(args, ray_config, ckpt_path, env_cls, env_config, seed, log_path)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,313 @@
+import os
+import argparse
+import csv
+import hashlib
+import json
+import pickle
+from glob import glob
+import numpy as np
+import tqdm
+
+from saferl.environment.utils import YAMLParser, build_lookup
+from saferl.environment.logs.replay import episode_outcome
+
+from scripts.eval import verify_experiment_dir, rollout_seeds, run_rollout, run_rollouts_batched, RLlibBatchPolicy, \
+    DEFAULT_TRIAL_INDEX
+
+"""
+This script evaluates every checkpoint of an experiment directory on the same set of episodes, for success rate vs.
+training curves. Episode seeds are spawned once from --seed, so every checkpoint starts from identical initial
+conditions. A pool of ray actors, each holding one trainer and one set of environments, restores checkpoints in turn
+instead of rebuilding them. Episode outcomes are cached per (checkpoint, episode seed, config hash), so repeated or
+extended sweeps only evaluate new episodes. Results are summarized per checkpoint in a CSV table.
+"""
+
+CACHE_FILENAME = "sweep_cache.jsonl"
+SUMMARY_FILENAME = "sweep_summary.csv"
+
+# trainer config keys the restored policy's actions depend on: environment, network, observation preprocessing and
+# filtering, action post processing and exploration
+EVALUATION_CONFIG_KEYS = ('env', 'framework', 'model', 'preprocessor_pref', 'observation_filter', 'clip_actions',
+                          'normalize_actions', 'exploration_config', '_disable_preprocessor_api',
+                          '_disable_action_flattening')
+
+
+def get_args():
+    """
+    A function to process script args.
+
+    Returns
+    -------
+    argparse.Namespace
+        Collection of command line arguments and their values
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('dir', type=str, help="The full path to the experiment directory")
+    parser.add_argument('--trial_index', type=int, default=DEFAULT_TRIAL_INDEX,
+                        help="The index corresponding to the desired experiment to load. Use when multiple experiments"
+                             " are run by Tune.")
+    parser.add_argument('--ckpt_nums', type=int, nargs='+', default=None,
+                        help="Checkpoints to evaluate, all checkpoints by default")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="The seed the episode seeds are spawned from, the training seed by default")
+    parser.add_argument('--num_rollouts', type=int, default=100, help="Number of episodes per checkpoint")
+    parser.add_argument('--explore', default=False, action="store_true", help="True for off-policy evaluation")
+    parser.add_argument('--alt_env_config', type=str, default="",
+                        help="The full path to an alternative environment config file to evaluate in")
+    parser.add_argument('--workers', type=int, default=1, help="Number of parallel evaluation actors")
+    parser.add_argument('--batch_size', type=int, default=1,
+                        help="Number of concurrent episodes per actor sharing batched policy calls")
+    parser.add_argument('--output_dir', type=str, default=None,
+                        help="The directory of the results cache and summary table, <dir>/eval/sweep by default")
+
+    return parser.parse_args()
+
+
+def find_checkpoints(expr_dir_path):
+    """
+    Returns
+    -------
+    dict
+        checkpoint number -> checkpoint file path, of every checkpoint_* directory
+    """
+    checkpoints = {}
+    for ckpt_dir in glob(os.path.join(expr_dir_path, "checkpoint_*")):
+        ckpt_num = int(ckpt_dir.split("_")[-1])
+        ckpt_path = os.path.join(ckpt_dir, "checkpoint-{}".format(ckpt_num))
+        if os.path.isfile(ckpt_path):
+            checkpoints[ckpt_num] = ckpt_path
+    return dict(sorted(checkpoints.items()))
+
+
+def _stable_repr(obj):
+    # classes and functions by import path, whose repr would contain memory addresses
+    if hasattr(obj, '__module__') and hasattr(obj, '__qualname__'):
+        return "{}.{}".format(obj.__module__, obj.__qualname__)
+    return repr(obj)
+
+
+def config_hash(env_config, explore, ray_config=None):
+    """
+    Hash of the evaluation settings an episode outcome depends on besides the checkpoint and episode seed: the
+    environment config, exploration and the EVALUATION_CONFIG_KEYS of the config the agent was trained with.
+    """
+    settings = {'env_config': env_config, 'explore': explore}
+    if ray_config is not None:
+        settings['ray_config'] = {k: ray_config[k] for k in EVALUATION_CONFIG_KEYS if k in ray_config}
+    text = json.dumps(settings, sort_keys=True, default=_stable_repr)
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+class OutcomeCollector:
+    """
+    Log writer keeping only the outcome of every episode.
+    """
+
+    accepts_numpy = True
+
+    def __init__(self):
+        self.outcomes = {}
+
+    def write(self, entry):
+        self.outcomes[entry['rollout_num']] = episode_outcome(entry['info'], entry['episode_reward'],
+                                                              entry['step_number'])
+
+    def write_all(self, entries):
+        for entry in entries:
+            self.write(entry)
+
+
+class SweepActor:
+    """
+    Evaluation worker holding one trainer and one set of environments, reused across checkpoints.
+    """
+
+    def __init__(self, ray_config, env_config, explore, batch_size=1):
+        import ray.rllib.agents.ppo as ppo
+
+        ray_config = dict(ray_config, num_workers=0, num_gpus=0)
+        self.agent = ppo.PPOTrainer(config=ray_config, env=ray_config['env'])
+        self.explore = explore
+        self.envs = [ray_config['env'](env_config) for _ in range(batch_size)]
+
+    def evaluate(self, ckpt_path, rollout_nums, seeds):
+        self.agent.restore(ckpt_path)
+        self.agent.get_policy().config['explore'] = self.explore
+
+        collector = OutcomeCollector()
+        if len(self.envs) > 1:
+            run_rollouts_batched(RLlibBatchPolicy(self.agent), self.envs, collector, rollout_nums, seeds)
+        else:
+            for rollout_num, seed in zip(rollout_nums, seeds):
+                run_rollout(self.agent, self.envs[0], collector, rollout_num, seed=seed)
+
+        return [dict(collector.outcomes[rollout_num], seed=seed) for rollout_num, seed in zip(rollout_nums, seeds)]
+
+
+def load_cache(cache_path):
+    """
+    Returns
+    -------
+    dict
+        (checkpoint, episode seed, config hash) -> episode outcome
+    """
+    cache = {}
+    if os.path.isfile(cache_path):
+        with open(cache_path, "r") as cache_file:
+            for line in cache_file:
+                if line.strip():
+                    row = json.loads(line)
+                    cache[(row['checkpoint'], row['seed'], row['config_hash'])] = row
+    return cache
+
+
+def read_timesteps(expr_dir_path):
+    """
+    Training iteration -> total environment timesteps, from progress.csv.
+    """
+    timesteps = {}
+    progress_path = os.path.join(expr_dir_path, "progress.csv")
+    if os.path.isfile(progress_path):
+        with open(progress_path, newline='') as progress_file:
+            for row in csv.DictReader(progress_file):
+                timesteps[int(row["training_iteration"])] = int(row["timesteps_total"])
+    return timesteps
+
+
+def summarize(checkpoints, seeds, digest, cache, timesteps):
+    rows = []
+    for ckpt_num in checkpoints:
+        outcomes = [cache[(ckpt_num, seed, digest)] for seed in seeds]
+        rewards = np.array([o['episode_reward'] for o in outcomes])
+        lengths = np.array([o['length'] for o in outcomes])
+        failures = [str(o['failure']) for o in outcomes if o['failure']]
+        rows.append({
+            'checkpoint': ckpt_num,
+            'timesteps_total': timesteps.get(ckpt_num, ''),
+            'episodes': len(outcomes),
+            'success_rate': np.mean([o['success'] for o in outcomes]),
+            'failure_rate': len(failures) / len(outcomes),
+            'failure_codes': ";".join("{}:{}".format(code, failures.count(code))
+                                      for code in sorted(set(failures))),
+            'reward_mean': rewards.mean(),
+            'reward_std': rewards.std(),
+            'length_mean': lengths.mean(),
+        })
+    return rows
+
+
+def select_checkpoints(expr_dir_path, ckpt_nums=None):
+    """
+    Checkpoint number -> checkpoint file path of the requested checkpoints, all checkpoints by default.
+    """
+    checkpoints = find_checkpoints(expr_dir_path)
+    if ckpt_nums is not None:
+        missing = set(ckpt_nums) - set(checkpoints)
+        if missing:
+            raise FileNotFoundError("Checkpoints {} not found".format(sorted(missing)))
+        checkpoints = {n: checkpoints[n] for n in sorted(ckpt_nums)}
+    return checkpoints
+
+
+def build_tasks(checkpoints, seeds, digest, cache):
+    """
+    One (checkpoint, checkpoint path, rollout nums, episode seeds) task per checkpoint with uncached episodes.
+    """
+    tasks = []
+    for ckpt_num, ckpt_path in checkpoints.items():
+        todo = [(i, s) for i, s in enumerate(seeds) if (ckpt_num, s, digest) not in cache]
+        if todo:
+            tasks.append((ckpt_num, ckpt_path, [i for i, _ in todo], [s for _, s in todo]))
+    return tasks
+
+
+def run_tasks(tasks, ray_config, env_config, args, digest, cache, cache_path):
+    """
+    Evaluate the tasks across a pool of SweepActors, adding every episode outcome to the cache and cache file.
+    """
+    import ray
+
+    ray.init()
+    actor_cls = ray.remote(SweepActor)
+    actors = [actor_cls.remote(ray_config, env_config, args.explore, args.batch_size)
+              for _ in range(min(args.workers, len(tasks)))]
+
+    pending = {}
+    remaining = iter(tasks)
+
+    def submit(actor):
+        task = next(remaining, None)
+        if task is not None:
+            ckpt_num, ckpt_path, rollout_nums, task_seeds = task
+            pending[actor.evaluate.remote(ckpt_path, rollout_nums, task_seeds)] = (actor, ckpt_num)
+
+    with open(cache_path, "a") as cache_file, tqdm.tqdm(total=len(tasks)) as progress:
+        for actor in actors:
+            submit(actor)
+
+        while pending:
+            done, _ = ray.wait(list(pending.keys()), num_returns=1)
+            actor, ckpt_num = pending.pop(done[0])
+
+            # cache every finished checkpoint right away, so interrupted sweeps resume where they stopped
+            for outcome in ray.get(done[0]):
+                row = dict(outcome, checkpoint=ckpt_num, config_hash=digest)
+                cache[(ckpt_num, row['seed'], digest)] = row
+                cache_file.write(json.dumps(row) + "\n")
+            cache_file.flush()
+            progress.update(1)
+
+            submit(actor)
+
+
+def write_summary(rows, summary_path):
+    with open(summary_path, "w", newline='') as summary_file:
+        writer = csv.DictWriter(summary_file, fieldnames=list(rows[0].keys()) if rows else ['checkpoint'])
+        writer.writeheader()
+        writer.writerows(rows)
+
+    for row in rows:
+        print("checkpoint {:>6}: success rate {:.3f}, reward {:.3f} +/- {:.3f}".format(
+            row['checkpoint'], row['success_rate'], row['reward_mean'], row['reward_std']))
+    print("Summary written to {}".format(summary_path))
+
+
+def main():
+    args = get_args()
+
+    expr_dir_path = verify_experiment_dir(args.dir, trial_index=args.trial_index)
+    with open(os.path.join(expr_dir_path, 'params.pkl'), 'rb') as ray_config_f:
+        ray_config = pickle.load(ray_config_f)
+
+    if args.alt_env_config:
+        parser = YAMLParser(yaml_file=args.alt_env_config, lookup=build_lookup())
+        env_config = parser.parse_env()["env_config"]
+    else:
+        env_config = ray_config['env_config']
+
+    checkpoints = select_checkpoints(expr_dir_path, args.ckpt_nums)
+
+    output_dir = args.output_dir if args.output_dir is not None else os.path.join(expr_dir_path, 'eval', 'sweep')
+    os.makedirs(output_dir, exist_ok=True)
+    cache_path = os.path.join(output_dir, CACHE_FILENAME)
+
+    # one fixed episode set shared by all checkpoints
+    seed = args.seed if args.seed is not None else ray_config['seed']
+    seeds = rollout_seeds(seed, args.num_rollouts)
+    digest = config_hash(env_config, args.explore, ray_config)
+    cache = load_cache(cache_path)
+
+    tasks = build_tasks(checkpoints, seeds, digest, cache)
+    print("{} checkpoints, {} cached, {} to evaluate".format(
+        len(checkpoints), len(checkpoints) - len(tasks), len(tasks)))
+
+    if tasks:
+        run_tasks(tasks, ray_config, env_config, args, digest, cache, cache_path)
+
+    rows = summarize(checkpoints, seeds, digest, cache, read_timesteps(expr_dir_path))
+    write_summary(rows, os.path.join(output_dir, SUMMARY_FILENAME))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import os
+import argparse
+import pickle
+import jsonlines
+import tqdm
+
+from saferl.environment.utils import YAMLParser, build_lookup
+from saferl.environment.logs.replay import load_replay_log, replay_episode
+
+from scripts.eval import verify_experiment_dir, DEFAULT_TRIAL_INDEX
+
+"""
+This script regenerates full evaluation logs from a replay log written by eval.py --log_format replay. Episodes are
+re-simulated from their recorded seeds and actions in the environment of the experiment directory or of an
+alternative environment config, which must match the evaluation environment. Replayed outcomes are checked against
+the recorded outcomes.
+"""
+
+
+def get_args():
+    """
+    A function to process script args.
+
+    Returns
+    -------
+    argparse.Namespace
+        Collection of command line arguments and their values
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('log', type=str, help="The full path to the replay log")
+    parser.add_argument('--dir', type=str, default=None,
+                        help="The full path to the experiment directory the replay log was evaluated from")
+    parser.add_argument('--trial_index', type=int, default=DEFAULT_TRIAL_INDEX,
+                        help="The index corresponding to the desired experiment to load. Use when multiple experiments"
+                             " are run by Tune.")
+    parser.add_argument('--alt_env_config', type=str, default="",
+                        help="The full path to the alternative environment config the replay log was evaluated in")
+    parser.add_argument('--rollouts', type=int, nargs='+', default=None,
+                        help="Rollout numbers of the episodes to replay, all by default")
+    parser.add_argument('--steps', type=int, nargs='+', default=None,
+                        help="Step numbers to regenerate log entries for, all by default")
+    parser.add_argument('--output', type=str, default=None,
+                        help="The full path of the regenerated jsonlines log, <log>.full by default")
+    parser.add_argument('--no_verify', default=False, action="store_true",
+                        help="Skip the initial state and outcome checks and stop each replay at the last requested"
+                             " step")
+
+    return parser.parse_args()
+
+
+def load_env(args):
+    if args.alt_env_config:
+        parser = YAMLParser(yaml_file=args.alt_env_config, lookup=build_lookup())
+        config = parser.parse_env()
+        return config['env'](config['env_config'])
+
+    if args.dir is None:
+        raise ValueError("either --dir or --alt_env_config is required")
+
+    expr_dir_path = verify_experiment_dir(args.dir, trial_index=args.trial_index)
+    with open(os.path.join(expr_dir_path, 'params.pkl'), 'rb') as ray_config_f:
+        ray_config = pickle.load(ray_config_f)
+    return ray_config['env'](ray_config['env_config'])
+
+
+def main():
+    args = get_args()
+
+    env = load_env(args)
+    records = load_replay_log(args.log)
+    if args.rollouts is not None:
+        rollouts = set(args.rollouts)
+        records = [record for record in records if record['rollout_num'] in rollouts]
+
+    output_path = args.output if args.output is not None else args.log + ".full"
+    with jsonlines.open(output_path, "w") as writer:
+        for record in tqdm.tqdm(records):
+            writer.write_all(replay_episode(env, record, steps=args.steps, verify=not args.no_verify))
+
+    print("Replayed {} episodes to {}".format(len(records), output_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import numpy as np
+import yaml
+
+from saferl.environment.utils import YAMLParser, build_lookup
+from saferl.environment.logs.replay import ReplayLogWriter, load_replay_log, replay_episode
+
+from scripts.eval import run_rollout, rollout_seeds
+
+"""
+Round trip check of replay logs on the default docking config, with its continuous Tuple(Box, Box) actuators and with
+the Tuple(Discrete, Discrete) actuators of configs/docking/env_objs/deputy.yaml, whose actions are logged as one float
+index per actuator. Episodes of a random policy are recorded as a replay log, re-simulated with verification of the
+initial states and outcomes, and the regenerated steps are compared with the recorded ones.
+"""
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'configs', 'docking')
+CONFIG = os.path.join(CONFIG_DIR, 'docking_default.yaml')
+DISCRETE_DEPUTY = os.path.join(CONFIG_DIR, 'env_objs', 'deputy.yaml')
+NUM_ROLLOUTS = 3
+SEED = 0
+
+
+class RandomAgent:
+    # samples from the action space's own RNG, leaving the environment's global RNG untouched
+    def __init__(self, action_space, seed):
+        self.action_space = action_space
+        self.action_space.seed(seed)
+
+    def compute_single_action(self, obs):
+        return self.action_space.sample()
+
+
+class RecordingReplayWriter(ReplayLogWriter):
+    # keeps the full JSON log entries next to the replay log
+    accepts_numpy = False
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.entries = []
+
+    def write(self, entry):
+        self.entries.append(entry)
+        super().write(entry)
+
+
+def check_round_trip(env_config):
+    env = config['env'](env_config)
+    agent = RandomAgent(env.action_space, SEED)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_path = os.path.join(tmp_dir, 'eval.log')
+        with RecordingReplayWriter(log_path) as writer:
+            for rollout_num, seed in enumerate(rollout_seeds(SEED, NUM_ROLLOUTS)):
+                run_rollout(agent, env, writer, rollout_num, seed=seed)
+        records = load_replay_log(log_path)
+
+    assert len(records) == NUM_ROLLOUTS, f"{len(records)} of {NUM_ROLLOUTS} episodes recorded"
+
+    for record in records:
+        recorded = [entry for entry in writer.entries if entry['rollout_num'] == record['rollout_num']]
+        replayed = replay_episode(env, record, verify=True)
+
+        assert len(replayed) == len(recorded), \
+            f"rollout {record['rollout_num']}: {len(replayed)} replayed steps, {len(recorded)} recorded"
+        for original, regenerated in zip(recorded, replayed):
+            assert original['actions'] == regenerated['actions']
+            assert np.allclose(original['obs'], regenerated['obs'], rtol=1e-9, atol=1e-9), \
+                f"rollout {record['rollout_num']} step {original['step_number']}: observations differ"
+            assert original['info']['success'] == regenerated['info']['success']
+            assert original['info']['failure'] == regenerated['info']['failure']
+
+    print(f"replayed {len(records)} docking episodes with {env.action_space} actions")
+
+
+parser = YAMLParser(yaml_file=CONFIG, lookup=build_lookup())
+config = parser.parse_env()
+check_round_trip(config['env_config'])
+
+# swap in the discrete actuators of the deputy object config
+with open(DISCRETE_DEPUTY, 'r') as deputy_file:
+    discrete_actuators = yaml.safe_load(deputy_file)['config']['controller']['actuators']
+discrete_config = parser.parse_env()['env_config']
+deputy_config = next(obj for obj in discrete_config['env_objs'] if obj['name'] == 'deputy')
+deputy_config['config']['controller']['actuators'] = discrete_actuators
+check_round_trip(discrete_config)
@@ -13,7 +13,8 @@ import ray.rllib.agents.ppo as ppo
 from saferl.environment.utils import YAMLParser, build_lookup, dict_merge
 from saferl.environment.callbacks import build_callbacks_caller, EpisodeOutcomeCallback, FailureCodeCallback, \
                                         RewardComponentsCallback, LoggingCallback, LogContents, \
-                                        StatusCustomMetricsCallback, ConstraintViolationMetricsCallback
+                                        StatusCustomMetricsCallback, ConstraintViolationMetricsCallback, \
+                                        RTATelemetryCallback
 
 
 # Training defaults
@@ -145,7 +146,8 @@ def experiment_setup(args):
                                                                   episode_log_interval=args.log_interval,
                                                                   contents=CONTENTS),
                                                   StatusCustomMetricsCallback(),
-                                                  ConstraintViolationMetricsCallback()])
+                                                  ConstraintViolationMetricsCallback(),
+                                                  RTATelemetryCallback()])
 
     if args.eval:
         # set evaluation parameters
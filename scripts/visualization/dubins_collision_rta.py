@@ -49,6 +49,10 @@ def run_collision(env_class, env_config, save_anim=False, output_name='vids/anim
     env_config['env_objs'][0]['config']['init'] = wingman_init
     env_config['env_objs'][1]['config']['init'] = lead_init
 
+    # projected trajectories are only reported by the rta module in debug mode
+    rta_config = env_config['env_objs'][0]['config']['rta']
+    rta_config.setdefault('config', {})['debug_info_interval'] = 1
+
     env = env_class(env_config)
 
     env.reset()
@@ -92,8 +96,11 @@ def run_collision(env_class, env_config, save_anim=False, output_name='vids/anim
 
         wingman_marker.set_data(info['wingman']['x'], info['wingman']['y'])
         lead_marker.set_data(info['lead']['x'], info['lead']['y'])
-        wingman_traj.set_data(info['wingman']['rta']['rta_traj'][:, 0], info['wingman']['rta']['rta_traj'][:, 1])
-        lead_traj.set_data(info['wingman']['rta']['watch_traj'][:, 0], info['wingman']['rta']['watch_traj'][:, 1])
+        rta_info = info['wingman']['rta']
+        if rta_info.get('rta_traj') is not None:
+            wingman_traj.set_data(rta_info['rta_traj'][:, 0], rta_info['rta_traj'][:, 1])
+        if rta_info.get('watch_traj') is not None:
+            lead_traj.set_data(rta_info['watch_traj'][:, 0], rta_info['watch_traj'][:, 1])
 
         x = info['wingman']['x']
         y = info['wingman']['y']
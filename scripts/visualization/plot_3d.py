@@ -6,12 +6,13 @@ Author: John McCarroll
 
 import pandas as pd
 import numpy as np
-import jsonlines
 from flatten_json import flatten_json
 import time
 import pickle
 import matplotlib.pyplot as pyplot
 
+from saferl.environment.logs.index import LogReader
+
 
 def process_log(path_to_file: str, blacklist: list, is_jsonlines=True):
     """
@@ -40,9 +41,9 @@ def process_log(path_to_file: str, blacklist: list, is_jsonlines=True):
     t_start = time.time()
     # open log file
     if is_jsonlines:
-        with jsonlines.open(path_to_file, 'r') as log:
+        with LogReader(path_to_file) as log:
             # iterate through json objects in log
-            for state in log:
+            for state in (state for episode in log for state in episode):
                 data["wingman"]["x"].append(state["info"]["wingman"]["x"])
                 data["wingman"]["y"].append(state["info"]["wingman"]["y"])
                 data["wingman"]["z"].append(state["info"]["wingman"]["z"])
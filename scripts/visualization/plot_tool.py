@@ -13,17 +13,21 @@ Author: John McCarroll
 
 import pandas as pd
 import numpy as np
-import jsonlines
 from flatten_json import flatten_json
 import time
 import pickle
 import matplotlib.pyplot as pyplot
 
+from saferl.environment.logs.index import LogReader
 
-def process_log(path_to_file: str, blacklist: list, is_jsonlines=True):
+
+def process_log(path_to_file: str, blacklist: list, is_jsonlines=True, episodes=None):
     """
     This function handles the conversion of stored historical trial data to in-memory python objects,
     namely a pandas.DataFrame metadata table and a dictionary of episode ID to episode summary DataFrames.
+
+    Logs are read through their episode index (see saferl.environment.logs.index), so a subset of episodes, e.g.
+    LogReader(path).filter(success=True), can be loaded without parsing the whole log.
     """
     metadata_table = {
         "worker_episode_number": [],
@@ -39,52 +43,35 @@ def process_log(path_to_file: str, blacklist: list, is_jsonlines=True):
     t_start = time.time()
     # open log file
     if is_jsonlines:
-        with jsonlines.open(path_to_file, 'r') as log:
-            episode_duration = 0
-            prev_ID = None
-            prev_success = None
-            prev_failure = None
-            prev_episode_number = None
-
-            # iterate through json objects in log
-            for state in log:
-                episode_success = state["info"]["success"]
-                episode_failure = state["info"]["failure"]
-                episode_ID = state["episode_ID"]
-
-                # apply blacklist filter
-                for unwanted_key in blacklist:
-                    state.pop(unwanted_key, None)
-
-                # start of new episode
-                if episode_ID not in episode_dictionaries:
-
-                    # store previous episode's metadata
-                    if prev_ID:
-                        metadata_table["worker_episode_number"].append(prev_episode_number)
-                        metadata_table["episode_ID"].append(prev_ID)
-                        metadata_table["episode_duration"].append(episode_duration)
-                        metadata_table["episode_success"].append(prev_success)
-                        metadata_table["episode_failure"].append(prev_failure)
-
-                    # reset metadata counters
-                    episode_duration = 0
-
-                    # construct pandas table for new episode & place in map
-                    episode_dictionaries[episode_ID] = {episode_duration: flatten_json(state)}
-
-                    # continuing current episode
-                else:
+        with LogReader(path_to_file) as log:
+            if episodes is None:
+                episodes = range(len(log))
+
+            # iterate through episodes in log
+            for index in episodes:
+                episode_states = log.episode(int(index))
+                episode_ID = episode_states[0]["episode_ID"]
+                episode_duration = 0
+                episode_dictionaries[episode_ID] = {}
+
+                for step, state in enumerate(episode_states):
                     # update metadata counters
-                    episode_duration += 1 * state["info"]["timestep_size"]
+                    if step > 0:
+                        episode_duration += 1 * state["info"]["timestep_size"]
+
+                    # apply blacklist filter
+                    for unwanted_key in blacklist:
+                        state.pop(unwanted_key, None)
 
                     # add state to table
                     episode_dictionaries[episode_ID][episode_duration] = flatten_json(state)
 
-                prev_ID = episode_ID
-                prev_success = episode_success
-                prev_failure = episode_failure
-                prev_episode_number = state["worker_episode_number"]
+                # store episode's metadata
+                metadata_table["worker_episode_number"].append(episode_states[-1]["worker_episode_number"])
+                metadata_table["episode_ID"].append(episode_ID)
+                metadata_table["episode_duration"].append(episode_duration)
+                metadata_table["episode_success"].append(episode_states[-1]["info"]["success"])
+                metadata_table["episode_failure"].append(episode_states[-1]["info"]["failure"])
 
         # construct episode DataFrames
         episode_dataframes = {}
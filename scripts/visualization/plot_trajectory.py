@@ -12,7 +12,6 @@ import seaborn as sns
 # import matplotlib
 # matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import jsonlines
 import os
 import argparse
 from glob import glob
@@ -23,6 +22,7 @@ import ray.rllib.agents.ppo as ppo
 
 from scripts.eval import run_rollouts, verify_experiment_dir
 from saferl.environment.utils import YAMLParser, build_lookup
+from saferl.environment.logs.index import LogReader
 
 
 # Define Defaults
@@ -84,15 +84,16 @@ def parse_log_trajectories(data_dir_path: str, environment_objs: list, iters: di
             }
 
             # open eval log file
-            with jsonlines.open(data_dir_path + "/eval{}.log".format(ckpt_num), 'r') as log:
+            with LogReader(data_dir_path + "/eval{}.log".format(ckpt_num)) as log:
                 # iterate over json dict states
-                for state in log:
-                    x = state["info"][obj]["x"]
-                    y = state["info"][obj]["y"]
-
-                    # trajectories["vehicle"].append(vehicle)
-                    trajectories[iter_num][obj]['x'].append(x)
-                    trajectories[iter_num][obj]['y'].append(y)
+                for episode in log:
+                    for state in episode:
+                        x = state["info"][obj]["x"]
+                        y = state["info"][obj]["y"]
+
+                        # trajectories["vehicle"].append(vehicle)
+                        trajectories[iter_num][obj]['x'].append(x)
+                        trajectories[iter_num][obj]['y'].append(y)
 
     return trajectories
 
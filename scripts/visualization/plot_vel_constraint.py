@@ -10,7 +10,6 @@ import math
 import seaborn as sns
 import matplotlib
 import matplotlib.pyplot as plt
-import jsonlines
 import os
 import argparse
 from glob import glob
@@ -21,6 +20,7 @@ import ray.rllib.agents.ppo as ppo
 from scripts.eval import run_rollouts, verify_experiment_dir
 from scripts.visualization.plot_trajectory import get_iters
 from saferl.environment.utils import YAMLParser, build_lookup
+from saferl.environment.logs.index import LogReader
 
 
 # Define Defaults
@@ -73,15 +73,16 @@ def parse_log_trajectories(data_dir_path: str, agent_name: str, iters: dict):
         }
 
         # open eval log file
-        with jsonlines.open(data_dir_path + "/eval{}.log".format(ckpt_num), 'r') as log:
+        with LogReader(data_dir_path + "/eval{}.log".format(ckpt_num)) as log:
             # iterate over json dict states
-            for state in log:
-                x_dot = state["info"][agent_name]["x_dot"]
-                y_dot = state["info"][agent_name]["y_dot"]
-
-                trajectories[iter_num]["velocity"].append(math.sqrt(x_dot**2 + y_dot**2))
-                trajectories[iter_num]["distance"].append(state["info"]["status"]["docking_distance"])
-                trajectories[iter_num]["vel_limit"].append(state["info"]["status"]["max_vel_limit"])
+            for episode in log:
+                for state in episode:
+                    x_dot = state["info"][agent_name]["x_dot"]
+                    y_dot = state["info"][agent_name]["y_dot"]
+
+                    trajectories[iter_num]["velocity"].append(math.sqrt(x_dot**2 + y_dot**2))
+                    trajectories[iter_num]["distance"].append(state["info"]["status"]["docking_distance"])
+                    trajectories[iter_num]["vel_limit"].append(state["info"]["status"]["max_vel_limit"])
 
     return trajectories
 
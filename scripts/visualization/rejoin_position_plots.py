@@ -1,4 +1,4 @@
-import jsonlines
+from saferl.environment.logs.index import LogReader
 import matplotlib.pyplot as pyplot
 import argparse
 
@@ -58,36 +58,36 @@ def process_log(path_to_file: str, episode_number: int):
         "rejoin_region_z": [],
     }
 
-    with jsonlines.open(path_to_file, 'r') as log:
-        # open log file
-        for state in log:
-            # iterate through json objects in log
-            episode_key = "worker_episode_number" if "worker_episode_number" in state else None
-            episode_key = "rollout_num" if "rollout_num" in state else episode_key
-            if episode_key is None:
-                raise NotImplementedError("Could not find episode number key in logs.")
+    with LogReader(path_to_file) as log:
+        # open log file and look up the episode in its index
+        try:
+            episode_states = log.episode(log.find(episode_number=episode_number))
+        except KeyError:
+            episode_states = []
 
-            if state[episode_key] == episode_number:
-                # ensure correct episode
+        for state in episode_states:
+            # iterate through json objects in episode
+            if "worker_episode_number" not in state and "rollout_num" not in state:
+                raise NotImplementedError("Could not find episode number key in logs.")
 
-                # add positional info of state to episode_dict
-                episode_dict["ID"] = state["episode_ID"] if "episode_ID" in state else episode_number
-                episode_dict["step_number"].append(state["step_number"])
+            # add positional info of state to episode_dict
+            episode_dict["ID"] = state["episode_ID"] if "episode_ID" in state else episode_number
+            episode_dict["step_number"].append(state["step_number"])
 
-                episode_dict["lead_x"].append(state["info"]["lead"]["x"])
-                episode_dict["lead_y"].append(state["info"]["lead"]["y"])
+            episode_dict["lead_x"].append(state["info"]["lead"]["x"])
+            episode_dict["lead_y"].append(state["info"]["lead"]["y"])
 
-                episode_dict["wingman_x"].append(state["info"]["wingman"]["x"])
-                episode_dict["wingman_y"].append(state["info"]["wingman"]["y"])
+            episode_dict["wingman_x"].append(state["info"]["wingman"]["x"])
+            episode_dict["wingman_y"].append(state["info"]["wingman"]["y"])
 
-                episode_dict["rejoin_region_x"].append(state["info"]["rejoin_region"]["x"])
-                episode_dict["rejoin_region_y"].append(state["info"]["rejoin_region"]["y"])
+            episode_dict["rejoin_region_x"].append(state["info"]["rejoin_region"]["x"])
+            episode_dict["rejoin_region_y"].append(state["info"]["rejoin_region"]["y"])
 
-                if "z" in state["info"]["lead"]:
-                    # 3d dubins
-                    episode_dict["lead_z"].append(state["info"]["lead"]["z"])
-                    episode_dict["wingman_z"].append(state["info"]["wingman"]["z"])
-                    episode_dict["rejoin_region_z"].append(state["info"]["rejoin_region"]["z"])
+            if "z" in state["info"]["lead"]:
+                # 3d dubins
+                episode_dict["lead_z"].append(state["info"]["lead"]["z"])
+                episode_dict["wingman_z"].append(state["info"]["wingman"]["z"])
+                episode_dict["rejoin_region_z"].append(state["info"]["rejoin_region"]["z"])
 
     return episode_dict
 
@@ -0,0 +1,71 @@
+"""
+This module holds unit tests of the batched evaluation of AutoKoopman models.
+"""
+
+import os
+import sys
+import pytest
+import numpy as np
+
+traj = pytest.importorskip("autokoopman.core.trajectory")
+kobs = pytest.importorskip("autokoopman.observable")
+koopman_estimator = pytest.importorskip("autokoopman.estimator.koopman")
+
+# the training scripts in the repository's autokoopman directory import each other as top level modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'autokoopman'))
+from batch_eval import LiftedLinearModel, evaluate  # noqa: E402
+from export import extract_operators  # noqa: E402
+
+SAMPLING_PERIOD = 0.5
+
+
+def trajectories(rng, num_trajectories=5, num_steps=40):
+    data = {}
+    for n in range(num_trajectories):
+        state = rng.uniform([-100, 50], [100, 200])
+        inputs = rng.uniform(-1, 1, (num_steps - n, 1))
+        states = [state]
+        for control in inputs[:-1]:
+            state = np.array([state[0] + SAMPLING_PERIOD * 0.1 * state[1], state[1] + SAMPLING_PERIOD * 5 * control[0]])
+            states.append(state)
+        data[n] = traj.UniformTimeTrajectory(np.array(states), inputs, SAMPLING_PERIOD)
+    return traj.UniformTimeTrajectoriesData(data)
+
+
+def fit_model(normalize):
+    np.random.seed(0)
+    observables = kobs.IdentityObservable() | kobs.RFFObservable(2, 20, 1.0)
+    estimator = koopman_estimator.KoopmanDiscEstimator(observables, SAMPLING_PERIOD, 2, rank=20, normalize=normalize)
+    estimator.fit(trajectories(np.random.default_rng(0)))
+    return estimator.model
+
+
+@pytest.mark.unit_test
+@pytest.mark.parametrize("normalize", [True, False])
+def test_lifted_model_matches_model_steps(normalize):
+    model = fit_model(normalize)
+    lifted = LiftedLinearModel.from_autokoopman(model)
+    assert (lifted.scale is not None) == normalize
+
+    test_data = list(trajectories(np.random.default_rng(1))._trajs.values())
+    report = evaluate(lifted, test_data)
+    assert report['method'] == 'batched'
+
+    for t, error in zip(test_data, report['errors']):
+        expected = [t.states[0]]
+        for control in t.inputs[:-1]:
+            expected.append(model.step(0, expected[-1], control))
+        expected = np.array(expected)
+        assert np.allclose(lifted.step(0, t.states[0], t.inputs[0]), expected[1], rtol=1e-9, atol=1e-9)
+        assert np.isclose(error, np.linalg.norm(t.states - expected) / np.linalg.norm(t.states), rtol=1e-6)
+
+
+@pytest.mark.unit_test
+def test_lifted_model_exports_normalization():
+    lifted = LiftedLinearModel.from_autokoopman(fit_model(normalize=True))
+    operators = extract_operators(lifted)
+    assert np.array_equal(operators['scale'], lifted.scale)
+    assert np.array_equal(operators['offset'], lifted.offset)
+
+    with pytest.raises(ValueError):
+        LiftedLinearModel(lifted.A, lifted.B, lifted.w, lifted.u, scale=lifted.scale)
@@ -0,0 +1,69 @@
+"""
+This module holds unit tests of the chunked columnar rollout log format.
+"""
+
+import pytest
+import numpy as np
+
+from saferl.environment.logs.columnar import ColumnarLogReader, ColumnarLogWriter, encode_column, merge_logs
+
+
+def entry(rollout_num, step_number):
+    return {
+        'rollout_num': rollout_num,
+        'step_number': step_number,
+        'obs': [0.1 * step_number, -1.0, 2.5],
+        'actions': [float(step_number), 0.0],
+        'episode_reward': 0.5 * step_number,
+        'info': {
+            'success': step_number == 3,
+            'failure': 'timeout' if rollout_num == 1 and step_number == 3 else False,
+            'status': {'in_docking': step_number > 1, 'names': list(range(step_number))},
+        },
+    }
+
+
+def write_log(path, rollouts=3, steps=3, chunk_size=4):
+    entries = [entry(r, s) for r in range(rollouts) for s in range(1, steps + 1)]
+    with ColumnarLogWriter(path, chunk_size=chunk_size) as writer:
+        writer.write_all(entries)
+    return entries
+
+
+@pytest.mark.unit_test
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "eval.log")
+    entries = write_log(path)
+
+    with ColumnarLogReader(path) as reader:
+        assert list(reader.episode_ids) == [0, 1, 2]
+        read = [e for i in range(len(reader)) for e in reader.episode_entries(i)]
+
+    assert read == entries
+
+
+@pytest.mark.unit_test
+def test_merge_logs_preserves_order(tmp_path):
+    paths = [str(tmp_path / "shard_{}".format(i)) for i in range(2)]
+    write_log(paths[0])
+    write_log(paths[1], rollouts=2)
+    merge_logs(paths, str(tmp_path / "merged"), remove=True)
+
+    with ColumnarLogReader(str(tmp_path / "merged")) as reader:
+        assert list(reader.episode_ids) == [0, 1, 2, 0, 1]
+
+
+@pytest.mark.unit_test
+def test_encode_column_kinds():
+    assert list(encode_column([1, 2, 3])) == ['num']
+    assert list(encode_column(['a', 'b'])) == ['str']
+    assert list(encode_column([[1.0, 2.0], [3.0]])) == ['ragged_values', 'ragged_shapes']
+
+    # int and float values share a float array
+    mixed = encode_column([0, 0.5, 1])
+    assert mixed['num'].dtype == np.float64
+
+    # bools are not coerced to numbers
+    assert list(encode_column([True, 1, 2.0])) == ['json']
+    assert list(encode_column([np.array([True]), np.array([2])])) == ['json']
+    assert list(encode_column([False, 'crash'])) == ['json']
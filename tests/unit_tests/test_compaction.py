@@ -0,0 +1,104 @@
+"""
+This module holds unit tests of the compaction of jsonlines rollout logs into columnar archives.
+"""
+
+import json
+
+import pytest
+import numpy as np
+
+from saferl.environment.logs.compaction import CompactionEncoder, compact_log, decompress_log, verify_compaction
+from saferl.environment.logs.index import LogReader
+
+
+def write_log(path, rollouts=3, steps=20, seed=0):
+    rng = np.random.default_rng(seed)
+    entries = []
+    for rollout_num in range(rollouts):
+        position = rng.uniform(-100, 100, size=2)
+        for step_number in range(1, steps + 1):
+            position = position + rng.normal(0, 1, size=2)
+            last = step_number == steps
+            entries.append({
+                'rollout_num': rollout_num,
+                'step_number': step_number,
+                'obs': rng.normal(size=3).tolist(),
+                'actions': [int(rng.integers(5)), float(rng.uniform(-1, 1))],
+                'episode_reward': 0.25 * step_number,
+                'info': {
+                    'success': last and rollout_num == 0,
+                    'failure': 'timeout' if last and rollout_num > 0 else False,
+                    'deputy': {'x': float(position[0]), 'y': float(position[1]), 'name': 'deputy'},
+                },
+            })
+    with open(path, 'w') as log:
+        for entry in entries:
+            log.write(json.dumps(entry) + '\n')
+    return entries
+
+
+@pytest.mark.unit_test
+@pytest.mark.parametrize('precision', [1e-3, None])
+def test_compact_log_round_trip(tmp_path, precision):
+    log_path = str(tmp_path / 'eval.log')
+    compacted_path = str(tmp_path / 'eval.npz')
+    entries = write_log(log_path)
+
+    assert compact_log(log_path, compacted_path, precision=precision, chunk_size=16) == len(entries)
+    verify_compaction(log_path, compacted_path, precision=precision)
+
+    with LogReader(compacted_path) as reader:
+        assert reader.lengths.tolist() == [20, 20, 20]
+        assert reader.success.tolist() == [True, False, False]
+        assert reader.failure.tolist() == ['', 'timeout', 'timeout']
+
+        decoded = [entry for episode in reader for entry in episode]
+    tolerance = 1e-3 / 2 if precision else 0
+    for original, entry in zip(entries, decoded):
+        assert entry['actions'] == original['actions']
+        assert entry['info']['failure'] == original['info']['failure']
+        assert abs(entry['info']['deputy']['x'] - original['info']['deputy']['x']) <= tolerance + 1e-9
+        assert np.allclose(entry['obs'], original['obs'], rtol=0, atol=tolerance + 1e-9)
+        if precision is None:
+            assert entry == original
+
+
+@pytest.mark.unit_test
+def test_decompress_log(tmp_path):
+    pytest.importorskip('jsonlines')
+    log_path = str(tmp_path / 'eval.log')
+    compacted_path = str(tmp_path / 'eval.npz')
+    decompressed_path = str(tmp_path / 'decompressed.log')
+    entries = write_log(log_path, rollouts=2, steps=5)
+
+    compact_log(log_path, compacted_path, precision=None)
+    decompress_log(compacted_path, decompressed_path)
+
+    with open(decompressed_path) as log:
+        assert [json.loads(line) for line in log] == entries
+
+
+@pytest.mark.unit_test
+def test_verify_compaction_mismatch(tmp_path):
+    log_path = str(tmp_path / 'eval.log')
+    compacted_path = str(tmp_path / 'eval.npz')
+    write_log(log_path, rollouts=1, steps=5)
+
+    # a coarser grid than verified for moves channel values beyond the tolerance
+    compact_log(log_path, compacted_path, precision=1.0)
+    with pytest.raises(ValueError):
+        verify_compaction(log_path, compacted_path, precision=1e-3)
+
+
+@pytest.mark.unit_test
+def test_compaction_encoder():
+    encoder = CompactionEncoder(precision=0.5, channels=('*/x',))
+
+    delta = encoder([1.0, 1.6, 2.4, 10.0, 9.1], name='info/x', starts=[0, 3])
+    assert delta['delta'].tolist() == [2, 1, 2, 20, -2]
+    assert delta['delta_scale'] == 0.5
+
+    assert 'num' in encoder([1.0, 1.6], name='info/y', starts=[0])
+
+    dictionary = encoder(['timeout', False, 'timeout'], name='info/failure', starts=[0])
+    assert dictionary['dict_values'][dictionary['dict_codes']].tolist() == ['"timeout"', 'false', '"timeout"']
@@ -0,0 +1,57 @@
+"""
+This module holds unit tests of the checkpoint sweep evaluation cache.
+"""
+
+import json
+import pytest
+
+from saferl.aerospace.tasks.docking.task import DockingEnv
+from scripts.eval_sweep import build_tasks, config_hash, load_cache, summarize
+
+RAY_CONFIG = {
+    'env': DockingEnv,
+    'seed': 0,
+    'clip_actions': True,
+    'observation_filter': 'NoFilter',
+    'model': {'fcnet_hiddens': [64, 64]},
+    'num_workers': 4,
+}
+
+
+@pytest.mark.unit_test
+def test_config_hash_covers_evaluation_settings():
+    env_config = {'step_size': 1, 'env_objs': [{'name': 'deputy', 'class': DockingEnv}]}
+    digest = config_hash(env_config, False, RAY_CONFIG)
+
+    assert digest == config_hash(dict(env_config), False, dict(RAY_CONFIG))
+    assert digest != config_hash(env_config, True, RAY_CONFIG)
+    assert digest != config_hash(dict(env_config, step_size=2), False, RAY_CONFIG)
+    for key, value in [('clip_actions', False), ('observation_filter', 'MeanStdFilter'),
+                       ('model', {'fcnet_hiddens': [256, 256]})]:
+        assert digest != config_hash(env_config, False, dict(RAY_CONFIG, **{key: value}))
+
+    # training only settings do not invalidate cached outcomes
+    assert digest == config_hash(env_config, False, dict(RAY_CONFIG, num_workers=8, seed=1))
+
+
+@pytest.mark.unit_test
+def test_cached_outcomes_are_not_evaluated_again(tmp_path):
+    checkpoints = {10: 'checkpoint_000010/checkpoint-10', 20: 'checkpoint_000020/checkpoint-20'}
+    seeds = [11, 12, 13]
+    digest = 'abc'
+
+    cache_path = str(tmp_path / 'sweep_cache.jsonl')
+    with open(cache_path, 'w') as cache_file:
+        for seed in seeds:
+            row = {'checkpoint': 10, 'seed': seed, 'config_hash': digest, 'success': seed != 13, 'failure': False,
+                   'episode_reward': 1.0, 'length': 5}
+            cache_file.write(json.dumps(row) + "\n")
+        cache_file.write(json.dumps(dict(row, checkpoint=20, config_hash='other')) + "\n")
+    cache = load_cache(cache_path)
+
+    tasks = build_tasks(checkpoints, seeds, digest, cache)
+    assert tasks == [(20, checkpoints[20], [0, 1, 2], seeds)]
+
+    rows = summarize({10: checkpoints[10]}, seeds, digest, cache, {10: 4000})
+    assert rows[0]['episodes'] == 3 and rows[0]['timesteps_total'] == 4000
+    assert rows[0]['success_rate'] == pytest.approx(2 / 3)
@@ -0,0 +1,102 @@
+"""
+This module holds unit tests of the zero crossing events located during integration.
+"""
+
+import pytest
+import numpy as np
+
+from saferl.aerospace.models.cwhspacecraft.platforms.cwh import CWH3dState
+from saferl.environment.models.events import DistanceEvent, VelocityLimitEvent
+from saferl.environment.models.platforms import BaseODESolverDynamics
+from saferl.environment.tasks.env import SimulationState
+
+STEP_SIZE = 10
+INTEGRATION_METHODS = ['Euler', 'RK4', 'RK45']
+
+
+class AccelerationDynamics(BaseODESolverDynamics):
+    """point mass with the control as acceleration"""
+
+    def dx(self, t, state_vec, control):
+        return np.concatenate([state_vec[3:6], control])
+
+
+class Platform:
+    def __init__(self, **kwargs):
+        self.state = CWH3dState(**kwargs)
+
+
+class Target:
+    def __init__(self, position, velocity=(0, 0, 0)):
+        self.position = np.asarray(position, dtype=np.float64)
+        self.velocity = np.asarray(velocity, dtype=np.float64)
+
+
+def step_with_events(integration_method, platform, events, control=(0, 0, 0), target=None, time_elapsed=20):
+    dynamics = AccelerationDynamics(integration_method=integration_method)
+    dynamics.events = events
+
+    sim_state = SimulationState(env_objs={'target': target or Target([0, 0, 0])})
+    sim_state.time_elapsed = time_elapsed
+    for event in events:
+        event.bind(platform, sim_state)
+
+    return dynamics.step(STEP_SIZE, platform.state, np.asarray(control, dtype=np.float64))
+
+
+@pytest.mark.unit_test
+@pytest.mark.parametrize("integration_method", INTEGRATION_METHODS)
+def test_distance_crossing_within_step(integration_method):
+    # the platform enters the 50 m threshold at t = 5 / 3 and is far beyond the target at the end of the step
+    platform = Platform(x=100, x_dot=-30)
+    event = DistanceEvent('entry', 'target', threshold=50)
+    state = step_with_events(integration_method, platform, [event])
+
+    assert state.x == pytest.approx(-200)
+    assert event.triggered
+    assert event.time == pytest.approx(20 + 5 / 3, abs=1e-6)
+
+
+@pytest.mark.unit_test
+@pytest.mark.parametrize("integration_method", INTEGRATION_METHODS)
+def test_distance_crossing_of_moving_target(integration_method):
+    platform = Platform(x=100, x_dot=-30)
+    event = DistanceEvent('entry', 'target', threshold=10)
+    step_with_events(integration_method, platform, [event], target=Target([0, 0, 0], [5, 0, 0]))
+
+    assert event.time == pytest.approx(20 + 90 / 35, abs=1e-6)
+
+
+@pytest.mark.unit_test
+def test_event_direction_and_missed_crossings():
+    approaching = DistanceEvent('exit', 'target', threshold=10, direction=1)
+    step_with_events('RK4', Platform(x=100, x_dot=-5), [approaching])
+    assert not approaching.triggered
+
+    # the first crossing of the step is located
+    both = DistanceEvent('both', 'target', threshold=50, direction=0)
+    step_with_events('RK4', Platform(x=100, x_dot=-30), [both])
+    assert both.time == pytest.approx(20 + 5 / 3, abs=1e-6)
+
+    distant = DistanceEvent('entry', 'target', threshold=10)
+    step_with_events('RK4', Platform(x=1000, x_dot=-30), [distant])
+    assert not distant.triggered and distant.time is None
+
+
+@pytest.mark.unit_test
+@pytest.mark.parametrize("integration_method", INTEGRATION_METHODS)
+def test_velocity_limit_crossing(integration_method):
+    # accelerating at 0.5 m/s^2 from rest exceeds the 1 m/s limit at t = 2
+    event = VelocityLimitEvent('speeding', 'target', vel_threshold=1, threshold_dist=1e6, slope=0)
+    step_with_events(integration_method, Platform(x=100), [event], control=(0.5, 0, 0))
+
+    assert event.time == pytest.approx(20 + 2, abs=1e-6)
+
+
+@pytest.mark.unit_test
+def test_substeps_resolve_short_crossings():
+    # inside the 10 m threshold for 2 / 3 s only, shorter than the default 1 s between samples
+    fine = DistanceEvent('entry', 'target', threshold=10, substeps=100)
+    step_with_events('RK45', Platform(x=100, x_dot=-30), [fine])
+
+    assert fine.time == pytest.approx(20 + 3, abs=1e-6)
@@ -0,0 +1,125 @@
+"""
+This module holds unit tests of the multi-agent DubinsFormation environment.
+"""
+
+import os
+import pytest
+import numpy as np
+
+from saferl.aerospace.models.dubins.platforms import Dubins2dDynamics, Dubins2dState
+from saferl.environment.utils import YAMLParser, build_lookup
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'configs', 'formation',
+                           'formation_default.yaml')
+
+
+def parse_config():
+    return YAMLParser(yaml_file=CONFIG_PATH, lookup=build_lookup()).parse_env()
+
+
+@pytest.fixture
+def env():
+    config = parse_config()
+    env = config['env'](config['env_config'])
+    env.seed(0)
+    env.reset()
+    return env
+
+
+def zero_actions(env):
+    return {agent_id: (np.zeros(1), np.zeros(1)) for agent_id in env.agent_ids}
+
+
+def separation_processor(config):
+    return next(p for p in config['env_config']['status'] if p['name'] == 'separation')
+
+
+@pytest.mark.unit_test
+@pytest.mark.parametrize("seed", range(5))
+def test_reset_respects_separation(env, seed):
+    env.seed(seed)
+    obs = env.reset()
+
+    assert set(obs.keys()) == set(env.agent_ids)
+    positions = env.state_store[:, 0:2]
+    distances = np.linalg.norm(positions[:, None, :] - positions[None, :, :], axis=2)
+    np.fill_diagonal(distances, np.inf)
+    assert np.min(distances) > env.separation.safety_margin
+    assert not env.status['failure']
+
+    # platform states are views into the state store
+    for i, platform in enumerate(env.platforms):
+        assert np.array_equal(platform.state.vector, env.state_store[i])
+
+
+@pytest.mark.unit_test
+def test_initialize_raises_on_unsatisfiable_separation():
+    config = parse_config()
+    config['env_config']['max_init_attempts'] = 3
+    # wingmen start at most 10000 apart, so a larger safety margin can never be satisfied
+    separation_processor(config)['config']['safety_margin'] = 20000
+
+    with pytest.raises(ValueError, match="separation violations"):
+        config['env'](config['env_config'])
+
+
+@pytest.mark.unit_test
+def test_batched_step_matches_platform_dynamics(env):
+    states = env.state_store.copy()
+    actions = {agent_id: (np.array([0.5]), np.array([-0.25])) for agent_id in env.agent_ids}
+    env.step(actions)
+
+    for i, platform in enumerate(env.platforms):
+        dynamics = Dubins2dDynamics(v_min=platform.dynamics.v_min, v_max=platform.dynamics.v_max,
+                                    integration_method='RK4')
+        control = platform.untrimmed_control if platform.name in env.agent_ids else np.zeros(2)
+        expected = dynamics.step(env.step_size, Dubins2dState(vector=states[i]), np.copy(control))
+        assert np.allclose(env.state_store[i], expected.vector, rtol=1e-12, atol=1e-9)
+
+
+@pytest.mark.unit_test
+def test_slots_follow_lead(env):
+    lead = env.env_objs['lead']
+    heading = lead.state.heading
+    rotation = np.array([[np.cos(heading), -np.sin(heading)], [np.sin(heading), np.cos(heading)]])
+
+    # slot_0 lies 500 behind the lead at a 45 degree aspect angle on its left
+    offset = rotation.T @ (env.env_objs['slot_0'].position[0:2] - lead.position[0:2])
+    assert np.allclose(offset, 500 * np.array([-np.cos(np.pi / 4), np.sin(np.pi / 4)]))
+
+    env.step(zero_actions(env))
+    offset = rotation.T @ (env.env_objs['slot_0'].position[0:2] - lead.position[0:2])
+    assert np.allclose(offset, 500 * np.array([-np.cos(np.pi / 4), np.sin(np.pi / 4)]))
+
+
+@pytest.mark.unit_test
+def test_separation_violation_is_a_crash(env):
+    # put wingman_1 next to wingman_0 with the same heading and speed
+    env.state_store[2] = env.state_store[1] + np.array([10, 0, 0, 0])
+    for platform in env.platforms:
+        platform.mark_pose_changed()
+
+    _, rewards, dones, infos = env.step(zero_actions(env))
+
+    assert dones['__all__']
+    assert infos['wingman_0']['failure'] == 'crash'
+    assert infos['wingman_0']['status']['crashed'] and infos['wingman_1']['status']['crashed']
+    assert not infos['wingman_2']['status']['crashed']
+    assert infos['wingman_0']['reward']['components']['step']['crash_reward'] == -1
+    assert infos['wingman_2']['reward']['components']['step']['crash_reward'] == 0
+
+
+@pytest.mark.unit_test
+def test_agent_rewards_add_up(env):
+    totals = {agent_id: 0 for agent_id in env.agent_ids}
+    done = False
+    while not done:
+        _, rewards, dones, infos = env.step(zero_actions(env))
+        done = dones['__all__']
+        for agent_id, reward in rewards.items():
+            totals[agent_id] += reward
+            assert reward == pytest.approx(sum(infos[agent_id]['reward']['components']['step'].values()))
+
+    for agent_id in env.agent_ids:
+        assert totals[agent_id] == pytest.approx(infos[agent_id]['reward']['total'])
+        assert totals[agent_id] == pytest.approx(sum(infos[agent_id]['reward']['components']['total'].values()))
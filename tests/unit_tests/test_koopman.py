@@ -0,0 +1,81 @@
+"""
+This module holds unit tests of the Koopman surrogate dynamics exported from AutoKoopman models.
+"""
+
+import os
+import sys
+import pytest
+import numpy as np
+
+from saferl.environment.models.koopman import KoopmanSurrogateDynamics
+
+traj = pytest.importorskip("autokoopman.core.trajectory")
+kobs = pytest.importorskip("autokoopman.observable")
+koopman_estimator = pytest.importorskip("autokoopman.estimator.koopman")
+
+# the training scripts in the repository's autokoopman directory import each other as top level modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'autokoopman'))
+from export import export_surrogate, extract_operators  # noqa: E402
+
+SAMPLING_PERIOD = 0.5
+
+
+def training_data(rng, num_trajectories=5, num_steps=40):
+    trajectories = {}
+    for n in range(num_trajectories):
+        state = rng.uniform([-100, 50], [100, 200])
+        inputs = rng.uniform(-1, 1, (num_steps, 1))
+        states = [state]
+        for control in inputs[:-1]:
+            state = np.array([state[0] + SAMPLING_PERIOD * 0.1 * state[1], state[1] + SAMPLING_PERIOD * 5 * control[0]])
+            states.append(state)
+        trajectories[n] = traj.UniformTimeTrajectory(np.array(states), inputs, SAMPLING_PERIOD)
+    return traj.UniformTimeTrajectoriesData(trajectories)
+
+
+def fit_model(normalize):
+    rng = np.random.default_rng(0)
+    np.random.seed(0)
+    observables = kobs.IdentityObservable() | kobs.RFFObservable(2, 20, 1.0)
+    estimator = koopman_estimator.KoopmanDiscEstimator(observables, SAMPLING_PERIOD, 2, rank=20, normalize=normalize)
+    estimator.fit(training_data(rng))
+    return estimator.model
+
+
+def export(model, tmp_path):
+    path = str(tmp_path / "model.npz")
+    export_surrogate(model, path, sampling_period=SAMPLING_PERIOD)
+    return KoopmanSurrogateDynamics(path)
+
+
+@pytest.mark.unit_test
+@pytest.mark.parametrize("normalize", [True, False])
+def test_surrogate_step_matches_model(tmp_path, normalize):
+    model = fit_model(normalize)
+    assert (model.scaler is not None) == normalize
+    assert ('scale' in extract_operators(model)) == normalize
+
+    surrogate = export(model, tmp_path)
+    rng = np.random.default_rng(1)
+    states = rng.uniform([-100, 50], [100, 200], (8, 2))
+    controls = rng.uniform(-1, 1, (8, 1))
+
+    expected = np.array([model.step(0, state, control) for state, control in zip(states, controls)])
+    assert np.allclose(surrogate.step_batch(SAMPLING_PERIOD, states, controls), expected, rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.unit_test
+def test_surrogate_rollout_matches_model_steps(tmp_path):
+    model = fit_model(normalize=True)
+    surrogate = export(model, tmp_path)
+
+    rng = np.random.default_rng(2)
+    state = rng.uniform([-100, 50], [100, 200])
+    controls = rng.uniform(-1, 1, (10, 1, 1))
+
+    expected = [state]
+    for control in controls[:, 0]:
+        expected.append(model.step(0, expected[-1], control))
+
+    trajectory = surrogate.rollout_batch(SAMPLING_PERIOD, state[None, :], controls)
+    assert np.allclose(trajectory[:, 0], np.array(expected), rtol=1e-9, atol=1e-9)
@@ -0,0 +1,139 @@
+"""
+This module holds unit tests of the sidecar episode index of rollout logs.
+"""
+
+import json
+import os
+
+import pytest
+import numpy as np
+
+from saferl.environment.logs.columnar import ColumnarLogWriter
+from saferl.environment.logs.index import LogReader, build_index, index_path, load_index
+
+
+def entry(step_number, failure=False, success=False, **keys):
+    entry = {'step_number': step_number, 'obs': [float(step_number)],
+             'info': {'success': success, 'failure': failure}}
+    entry.update(keys)
+    return entry
+
+
+def eval_entries():
+    # three rollouts of 2, 3 and 1 steps
+    outcomes = [(False, 'timeout'), (True, False), (False, 'crash')]
+    entries = []
+    for rollout_num, length in enumerate([2, 3, 1]):
+        success, failure = outcomes[rollout_num]
+        for step_number in range(1, length + 1):
+            last = step_number == length
+            entries.append(entry(step_number, failure=failure if last else False, success=success and last,
+                                 rollout_num=rollout_num))
+    return entries
+
+
+def write_jsonlines(path, entries):
+    with open(path, 'w') as log:
+        for e in entries:
+            log.write(json.dumps(e) + '\n')
+
+
+@pytest.mark.unit_test
+def test_build_index_eval_log(tmp_path):
+    path = str(tmp_path / 'eval.log')
+    write_jsonlines(path, eval_entries())
+
+    index = build_index(path)
+
+    assert index['episode_id'].tolist() == [0, 1, 2]
+    assert index['episode_number'].tolist() == [0, 1, 2]
+    assert index['length'].tolist() == [2, 3, 1]
+    assert index['success'].tolist() == [False, True, False]
+    assert index['failure'].tolist() == ['timeout', '', 'crash']
+    assert index['segment_length'].sum() == os.path.getsize(path)
+
+
+@pytest.mark.unit_test
+def test_build_index_interleaved_training_log(tmp_path):
+    # two environments of one worker writing their episodes in turns
+    episode_ids = [7, 7, 9, 7, 9, 9]
+    entries = [entry(i + 1, episode_ID=episode_id, worker_episode_number=episode_id // 2)
+               for i, episode_id in enumerate(episode_ids)]
+    path = str(tmp_path / 'training.log')
+    write_jsonlines(path, entries)
+
+    index = build_index(path)
+
+    assert index['episode_id'].tolist() == [7, 9]
+    assert index['episode_number'].tolist() == [3, 4]
+    assert index['length'].tolist() == [3, 3]
+    assert index['segment_episode'].tolist() == [0, 1, 0, 1]
+
+    with LogReader(path) as reader:
+        assert [e['step_number'] for e in reader.episode(0)] == [1, 2, 4]
+        assert [e['step_number'] for e in reader.episode(1)] == [3, 5, 6]
+
+
+@pytest.mark.unit_test
+def test_build_index_step_number_episodes(tmp_path):
+    entries = [entry(s) for s in [1, 2, 3, 1, 2]]
+    path = str(tmp_path / 'steps.log')
+    write_jsonlines(path, entries)
+
+    index = build_index(path)
+
+    assert index['episode_id'].tolist() == [0, 1]
+    assert index['length'].tolist() == [3, 2]
+
+
+@pytest.mark.unit_test
+def test_load_index_cache(tmp_path):
+    path = str(tmp_path / 'eval.log')
+    entries = eval_entries()
+    write_jsonlines(path, entries)
+
+    index = load_index(path)
+    assert os.path.isfile(index_path(path))
+    cached = load_index(path)
+    assert cached['length'].tolist() == index['length'].tolist()
+
+    # a changed log invalidates the index
+    write_jsonlines(path, entries + [entry(1, rollout_num=3)])
+    assert load_index(path)['length'].tolist() == [2, 3, 1, 1]
+
+
+@pytest.mark.unit_test
+def test_log_reader(tmp_path):
+    path = str(tmp_path / 'eval.log')
+    entries = eval_entries()
+    write_jsonlines(path, entries)
+
+    with LogReader(path) as reader:
+        assert len(reader) == 3
+        assert reader.episode(1) == entries[2:5]
+        assert reader[-1] == entries[5:]
+        assert [len(episode) for episode in reader] == [2, 3, 1]
+        assert reader.find(episode_number=2) == 2
+        assert reader.filter(success=True).tolist() == [1]
+        assert reader.filter(failure=True).tolist() == [0, 2]
+        assert reader.filter(failure='crash').tolist() == [2]
+        assert reader.filter(min_length=2, max_length=2).tolist() == [0]
+
+        with pytest.raises(IndexError):
+            reader.episode(3)
+        with pytest.raises(KeyError):
+            reader.find(episode_id=5)
+
+
+@pytest.mark.unit_test
+def test_log_reader_columnar(tmp_path):
+    path = str(tmp_path / 'eval.log')
+    with ColumnarLogWriter(path, chunk_size=4) as writer:
+        writer.write_all(eval_entries())
+
+    with LogReader(path) as reader:
+        assert reader.lengths.tolist() == [2, 3, 1]
+        assert reader.success.tolist() == [False, True, False]
+        assert reader.failure.tolist() == ['timeout', '', 'crash']
+        assert [e['step_number'] for e in reader.episode(1)] == [1, 2, 3]
+        assert np.allclose(reader.episode(1)[-1]['obs'], [3.0])
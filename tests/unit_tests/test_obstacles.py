@@ -0,0 +1,55 @@
+"""
+This module holds unit tests of the BVH nearest obstacle queries of ObstacleField.
+"""
+
+import pytest
+import numpy as np
+
+from saferl.environment.models.obstacles import ObstacleField
+
+
+def random_field(count, types, seed=0, leaf_size=4):
+    np.random.seed(seed)
+    distribution = {'count': count, 'type': types, 'x': [-1000, 1000], 'y': [-1000, 1000], 'z': [-200, 200],
+                    'radius': [5, 50], 'height': [10, 100]}
+    return ObstacleField('obstacles', distribution=distribution, leaf_size=leaf_size)
+
+
+@pytest.mark.unit_test
+@pytest.mark.parametrize("k", [1, 3, 10])
+def test_nearest_matches_brute_force(k):
+    field = random_field(300, ['sphere', 'cylinder', 'circle'])
+    rng = np.random.default_rng(1)
+
+    for point in rng.uniform([-1200, -1200, -300], [1200, 1200, 300], (50, 3)):
+        indices, distances = field.nearest(point, k=k)
+
+        expected = np.sort(field.signed_distance(point))[:k]
+        assert np.allclose(distances, expected)
+        assert np.allclose(field.signed_distance(point, indices), distances)
+
+
+@pytest.mark.unit_test
+def test_sphere_distances():
+    field = random_field(100, 'sphere')
+    point = np.array([10.0, -20.0, 5.0])
+
+    brute = np.linalg.norm(field.centers - point, axis=1) - field.radii
+    indices, distances = field.nearest(point, k=5)
+    assert list(indices) == list(np.argsort(brute)[:5])
+    assert np.allclose(distances, np.sort(brute)[:5])
+
+
+@pytest.mark.unit_test
+def test_inside_obstacle_and_small_fields():
+    field = ObstacleField('obstacles', obstacles=[{'type': 'sphere', 'x': 0, 'y': 0, 'z': 0, 'radius': 10},
+                                                  {'type': 'circle', 'x': 100, 'y': 0, 'radius': 5}])
+    assert field.nearest_distance(np.array([1.0, 0, 0])) == pytest.approx(-9)
+    # circles only constrain the xy plane
+    assert field.nearest_distance(np.array([100.0, 0, 500])) == pytest.approx(-5)
+
+    indices, distances = field.nearest(np.zeros(3), k=5)
+    assert list(indices) == [0, 1] and len(distances) == 2
+
+    empty = ObstacleField('obstacles', obstacles=[])
+    assert empty.nearest_distance(np.zeros(3)) == np.inf
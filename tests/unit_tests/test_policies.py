@@ -0,0 +1,61 @@
+"""
+This module holds unit tests of the exported policy runtime.
+"""
+
+import gym.spaces
+import pytest
+import numpy as np
+
+from saferl.environment.policies import NumpyMLPPolicy
+
+
+def linear_policy(out, obs_dim=3, **kwargs):
+    """single layer policy whose output is the constant out for zero observations"""
+    out = np.asarray(out, dtype=np.float64)
+    return NumpyMLPPolicy([np.zeros((obs_dim, len(out)))], [out], **kwargs)
+
+
+@pytest.mark.unit_test
+def test_tuple_box_actions_match_interleaved_layout():
+    out = [0.5, -1, 2.0, -1]
+    action_space = gym.spaces.Tuple((gym.spaces.Box(-1, 1, (1,)), gym.spaces.Box(-1, 1, (1,))))
+
+    policy = linear_policy(out, action_space=action_space)
+    action = policy.compute_single_action(np.zeros(3))
+
+    assert isinstance(action, tuple) and len(action) == 2
+    assert action[0].shape == (1,) and action[0].dtype == np.float32
+    assert action[0][0] == 0.5
+    # means are clipped to the action space bounds by default
+    assert action[1][0] == 1.0
+
+    unclipped = linear_policy(out, output_layout='interleaved').compute_single_action(np.zeros(3))
+    assert unclipped[1][0] == 2.0
+
+
+@pytest.mark.unit_test
+def test_tuple_discrete_actions_are_argmax():
+    action_space = gym.spaces.Tuple((gym.spaces.Discrete(3), gym.spaces.Discrete(2)))
+    policy = linear_policy([0.1, 0.7, 0.2, 0.9, -0.3], action_space=action_space)
+
+    assert policy.compute_action_batch(np.zeros((2, 3))).tolist() == [[1, 0], [1, 0]]
+    action = policy.compute_single_action(np.zeros(3))
+    assert action == (1, 0) and all(isinstance(a, int) for a in action)
+    assert action_space.contains(action)
+
+
+@pytest.mark.unit_test
+def test_box_actions_use_concatenated_layout():
+    action_space = gym.spaces.Box(np.array([-1, -2]), np.array([1, 2]), dtype=np.float64)
+    policy = linear_policy([1.5, -1.5, 0, 0], action_space=action_space, clip=[-1.2, 1.2])
+
+    action = policy.compute_single_action(np.zeros(3))
+    assert action.shape == (2,)
+    assert action.tolist() == [1.2, -1.2]
+
+
+@pytest.mark.unit_test
+def test_action_space_mismatch_raises():
+    action_space = gym.spaces.Tuple((gym.spaces.Discrete(11), gym.spaces.Discrete(11)))
+    with pytest.raises(ValueError):
+        linear_policy(np.zeros(4), action_space=action_space)
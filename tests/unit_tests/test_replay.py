@@ -0,0 +1,157 @@
+"""
+This module holds unit tests of replay logs and the deterministic re-simulation of recorded episodes.
+"""
+
+import gym
+import pytest
+import numpy as np
+
+from saferl.environment.logs.replay import (ReplayLogWriter, ReplayMismatchError, _restore_action, episode_header,
+                                            load_replay_log, replay_episode)
+
+
+class State:
+    def __init__(self, vector):
+        self.vector = vector
+
+
+class Point:
+    def __init__(self):
+        self.state = State(np.zeros(2))
+
+
+class RandomWalkEnv(gym.Env):
+    """
+    Point pushed by the action and a random disturbance, starting at a random position. Episodes succeed when the
+    point leaves the unit box and time out after max_steps.
+    """
+
+    def __init__(self, max_steps=5):
+        self.max_steps = max_steps
+        self.action_space = gym.spaces.Tuple((gym.spaces.Discrete(3), gym.spaces.Box(low=-1, high=1, shape=(2,))))
+        self.env_objs = {'point': Point()}
+        self.steps = 0
+
+    def seed(self, seed=None):
+        np.random.seed(seed)
+        return [seed]
+
+    def reset(self):
+        self.env_objs['point'].state.vector = np.random.uniform(-0.5, 0.5, size=2)
+        self.steps = 0
+        return self.env_objs['point'].state.vector.copy()
+
+    def step(self, action):
+        direction, push = action
+        state = self.env_objs['point'].state
+        state.vector = state.vector + 0.1 * (direction - 1) + 0.2 * push + np.random.normal(0, 0.05, size=2)
+        self.steps += 1
+        success = bool(np.any(np.abs(state.vector) > 1))
+        failure = 'timeout' if not success and self.steps >= self.max_steps else False
+        info = {'success': success, 'failure': failure, 'position': state.vector.copy()}
+        return state.vector.copy(), float(np.sum(state.vector)), success or bool(failure), info
+
+
+def record_episodes(env, path, seeds):
+    recorded = []
+    with ReplayLogWriter(path) as writer:
+        for rollout_num, seed in enumerate(seeds):
+            env.action_space.seed(seed)
+            env.seed(seed)
+            obs = env.reset()
+            header = episode_header(env, seed)
+            episode_reward = 0
+            done = False
+            step_num = 0
+            while not done:
+                step_num += 1
+                direction, push = env.action_space.sample()
+                obs, reward, done, info = env.step((direction, push))
+                episode_reward += reward
+                entry = {'info': info, 'actions': [direction] + push.tolist(), 'obs': obs,
+                         'rollout_num': rollout_num, 'step_number': step_num, 'episode_reward': episode_reward}
+                if step_num == 1:
+                    entry['replay'] = header
+                writer.write(entry)
+                recorded.append(entry)
+    return recorded
+
+
+@pytest.mark.unit_test
+def test_replay_round_trip(tmp_path):
+    env = RandomWalkEnv()
+    path = str(tmp_path / 'replay.log')
+    recorded = record_episodes(env, path, seeds=[1, 2, 3])
+
+    records = load_replay_log(path)
+    assert [record['rollout_num'] for record in records] == [0, 1, 2]
+
+    for record in records:
+        steps = [entry for entry in recorded if entry['rollout_num'] == record['rollout_num']]
+        assert len(record['actions']) == record['outcome']['length'] == len(steps)
+
+        replayed = replay_episode(env, record, verify=True)
+        assert len(replayed) == len(steps)
+        for original, regenerated in zip(steps, replayed):
+            assert regenerated['actions'] == original['actions']
+            assert np.allclose(regenerated['obs'], original['obs'], rtol=1e-12, atol=1e-12)
+            assert regenerated['info']['success'] == original['info']['success']
+            assert regenerated['info']['failure'] == original['info']['failure']
+            assert np.isclose(regenerated['episode_reward'], original['episode_reward'])
+
+
+@pytest.mark.unit_test
+def test_replay_selected_steps(tmp_path):
+    env = RandomWalkEnv(max_steps=4)
+    path = str(tmp_path / 'replay.log')
+    recorded = record_episodes(env, path, seeds=[5])
+    record = load_replay_log(path)[0]
+
+    replayed = replay_episode(env, record, steps=[2], verify=False)
+
+    assert [entry['step_number'] for entry in replayed] == [2]
+    assert np.allclose(replayed[0]['obs'], recorded[1]['obs'], rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.unit_test
+def test_replay_mismatch(tmp_path):
+    env = RandomWalkEnv()
+    path = str(tmp_path / 'replay.log')
+    record_episodes(env, path, seeds=[1])
+    record = load_replay_log(path)[0]
+
+    wrong_seed = dict(record, seed=record['seed'] + 1)
+    with pytest.raises(ReplayMismatchError):
+        replay_episode(env, wrong_seed)
+
+    outcome = record['outcome']
+    wrong_outcome = dict(record, outcome=dict(outcome, episode_reward=outcome['episode_reward'] + 1))
+    with pytest.raises(ReplayMismatchError):
+        replay_episode(env, wrong_outcome)
+
+    wrong_env = dict(record, env='saferl.aerospace.tasks.docking.task.DockingEnv')
+    with pytest.raises(ReplayMismatchError):
+        replay_episode(env, wrong_env)
+
+
+@pytest.mark.unit_test
+def test_replay_writer_requires_header(tmp_path):
+    with ReplayLogWriter(str(tmp_path / 'replay.log')) as writer:
+        with pytest.raises(ValueError):
+            writer.write({'info': {'success': False, 'failure': False}, 'actions': [0], 'rollout_num': 0,
+                          'step_number': 1, 'episode_reward': 0})
+
+
+@pytest.mark.unit_test
+def test_restore_action():
+    space = gym.spaces.Tuple((gym.spaces.Discrete(5), gym.spaces.Box(low=-1, high=1, shape=(2,), dtype=np.float32)))
+    push = np.array([0.1, -0.7], dtype=np.float32)
+
+    direction, restored = _restore_action(space, [3.0] + push.tolist())
+
+    assert direction == 3 and isinstance(direction, int)
+    assert restored.dtype == np.float32
+    assert np.array_equal(restored, push)
+
+    with pytest.raises(ReplayMismatchError):
+        _restore_action(space, [3.0, 0.1, -0.7, 0.0])
@@ -0,0 +1,81 @@
+"""
+This module holds unit tests of the multi-rate PlatformScheduler.
+"""
+
+import pytest
+import numpy as np
+
+from saferl.aerospace.models.dubins.platforms import Dubins2dPlatform
+from saferl.environment.models.geometry import RelativeCircle
+from saferl.environment.tasks.env import SimulationState
+from saferl.environment.tasks.scheduler import PlatformScheduler
+
+STEP_SIZE = 1
+TURN = {'rudder': np.array([np.deg2rad(3)])}
+
+
+def build(schedules, integration_method='RK45'):
+    env_objs = {
+        'agent': Dubins2dPlatform('agent', integration_method=integration_method),
+        'lead': Dubins2dPlatform('lead', integration_method=integration_method),
+    }
+    env_objs['slot'] = RelativeCircle(env_objs['lead'], name='slot', radius=10, r_offset=100, aspect_angle=45)
+    env_objs['agent'].reset(x=0, y=0, heading=0, v=50)
+    env_objs['lead'].reset(x=500, y=200, heading=1, v=80)
+
+    env_objs_config = [{'name': name, 'schedule': schedules.get(name, {})} for name in env_objs]
+    scheduler = PlatformScheduler(env_objs_config, env_objs, env_objs['agent'], STEP_SIZE)
+    scheduler.reset()
+    return scheduler, SimulationState(env_objs=env_objs)
+
+
+def run(scheduler, sim_state, num_steps):
+    states = []
+    for _ in range(num_steps):
+        scheduler.step(sim_state, STEP_SIZE, TURN)
+        states.append({name: np.copy(sim_state.env_objs[name].state.vector) for name in ['agent', 'lead']})
+    return states
+
+
+@pytest.mark.unit_test
+def test_non_platforms_are_not_scheduled():
+    scheduler, _ = build({})
+    assert [schedule.platform.name for schedule in scheduler.schedules] == ['agent', 'lead']
+
+
+@pytest.mark.unit_test
+def test_analytic_schedule_matches_integration():
+    default = run(*build({}), 10)
+    analytic = run(*build({'lead': {'mode': 'analytic', 'chunk_steps': 3}}), 10)
+
+    for expected, actual in zip(default, analytic):
+        assert np.allclose(actual['lead'], expected['lead'], atol=1e-6)
+        assert np.array_equal(actual['agent'], expected['agent'])
+
+
+@pytest.mark.unit_test
+def test_interval_schedule_holds_state_between_steps():
+    default = run(*build({}, integration_method='RK4'), 9)
+    interval = run(*build({'lead': {'mode': 'interval', 'interval': 3}}, integration_method='RK4'), 9)
+
+    initial = np.array([500, 200, 1, 80], dtype=np.float64)
+    for i, states in enumerate(interval):
+        if (i + 1) % 3 == 0:
+            # one step of three times the step size, the lead flies straight at constant speed
+            assert np.allclose(states['lead'], default[i]['lead'])
+        else:
+            held = initial if i < 2 else interval[i - i % 3 - 1]['lead']
+            assert np.array_equal(states['lead'], held)
+        assert np.array_equal(states['agent'], default[i]['agent'])
+
+
+@pytest.mark.unit_test
+def test_invalid_schedules_raise():
+    with pytest.raises(ValueError):
+        build({'agent': {'mode': 'interval', 'interval': 2}})
+    with pytest.raises(ValueError):
+        build({'lead': {'mode': 'sometimes'}})
+
+    scheduler, sim_state = build({'lead': {'mode': 'analytic'}})
+    with pytest.raises(ValueError):
+        scheduler.step(sim_state, 2 * STEP_SIZE, TURN)
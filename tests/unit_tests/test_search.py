@@ -0,0 +1,69 @@
+"""
+This module holds unit tests of the cached RFF grid search for Koopman models.
+"""
+
+import os
+import sys
+import pytest
+import numpy as np
+
+traj = pytest.importorskip("autokoopman.core.trajectory")
+kobs = pytest.importorskip("autokoopman.observable")
+koopman_estimator = pytest.importorskip("autokoopman.estimator.koopman")
+
+# the training scripts in the repository's autokoopman directory import each other as top level modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'autokoopman'))
+from search import _as_arrays, _fit, lifted_data, normalization  # noqa: E402
+
+SAMPLING_PERIOD = 0.5
+
+
+def training_data(num_trajectories=5, num_steps=40):
+    rng = np.random.default_rng(0)
+    trajectories = {}
+    for n in range(num_trajectories):
+        state = rng.uniform([-100, 50], [100, 200])
+        inputs = rng.uniform(-1, 1, (num_steps, 1))
+        states = [state]
+        for control in inputs[:-1]:
+            state = np.array([state[0] + SAMPLING_PERIOD * 0.1 * state[1], state[1] + SAMPLING_PERIOD * 5 * control[0]])
+            states.append(state)
+        trajectories[n] = traj.UniformTimeTrajectory(np.array(states), inputs, SAMPLING_PERIOD)
+    return traj.UniformTimeTrajectoriesData(trajectories)
+
+
+@pytest.mark.unit_test
+@pytest.mark.parametrize("normalize", [True, False])
+def test_fit_matches_autokoopman_estimator(tmp_path, normalize):
+    data = training_data()
+    ranks = [10, 22]
+    models = _fit(_as_arrays(data), 20, 0.5, 0, ranks, normalize, str(tmp_path))
+
+    rng = np.random.default_rng(1)
+    states = rng.uniform([-100, 50], [100, 200], (5, 2))
+    controls = rng.uniform(-1, 1, (5, 1))
+
+    for rank in ranks:
+        # same RFF parameters, fit by auto_koopman's estimator
+        rff = kobs.RFFObservable(2, 20, 0.5)
+        rff.w, rff.u = models[rank].w, models[rank].u
+        estimator = koopman_estimator.KoopmanDiscEstimator(kobs.IdentityObservable() | rff, SAMPLING_PERIOD, 2,
+                                                           rank=rank, normalize=normalize)
+        estimator.fit(data)
+
+        for state, control in zip(states, controls):
+            assert np.allclose(models[rank].step(0, state, control), estimator.model.step(0, state, control),
+                               rtol=1e-8, atol=1e-8)
+
+
+@pytest.mark.unit_test
+def test_lifted_data_cache_keys_normalization(tmp_path):
+    arrays = _as_arrays(training_data())
+    norm = normalization(arrays)
+    normalized = lifted_data(arrays, 20, 0.5, 0, cache_dir=str(tmp_path), **norm)
+    raw = lifted_data(arrays, 20, 0.5, 0, cache_dir=str(tmp_path))
+
+    assert len(os.listdir(str(tmp_path))) == 2
+    assert not np.allclose(normalized['G'], raw['G'])
+    assert np.array_equal(lifted_data(arrays, 20, 0.5, 0, cache_dir=str(tmp_path), **norm)['G'], normalized['G'])
+    assert np.all(np.abs(normalized['G'][:, :2]) <= 1 + 1e-12)
@@ -0,0 +1,89 @@
+"""
+This module holds unit tests of the uniform grid SpatialHash and the pairwise separation status built on it.
+"""
+
+import pytest
+import numpy as np
+
+from saferl.environment.models.spatial import SpatialHash
+from saferl.environment.tasks.env import SimulationState
+from saferl.environment.tasks.processor.status import PairwiseSeparationStatusProcessor
+
+
+def brute_force_pairs(points, radius):
+    distances = np.linalg.norm(points[:, None] - points[None, :], axis=2)
+    i, j = np.nonzero(np.triu(distances <= radius, k=1))
+    return set(zip(i.tolist(), j.tolist())), distances
+
+
+@pytest.mark.unit_test
+@pytest.mark.parametrize("dim", [2, 3])
+def test_pairs_within_matches_brute_force(dim):
+    rng = np.random.default_rng(dim)
+    points = rng.uniform(-500, 500, (400, dim))
+    spatial_hash = SpatialHash(cell_size=50)
+    spatial_hash.build(points)
+
+    for radius in [10, 30, 50]:
+        pairs, distances = spatial_hash.pairs_within(radius)
+        expected, brute_distances = brute_force_pairs(points, radius)
+
+        assert np.all(pairs[:, 0] < pairs[:, 1])
+        assert set(map(tuple, pairs.tolist())) == expected
+        assert len(pairs) == len(expected)
+        assert np.allclose(distances, brute_distances[pairs[:, 0], pairs[:, 1]])
+
+
+@pytest.mark.unit_test
+@pytest.mark.parametrize("dim", [2, 3])
+def test_nearest_neighbors_matches_brute_force(dim):
+    rng = np.random.default_rng(10 + dim)
+    # clustered and isolated points, isolated points resolve their neighbors beyond adjacent cells
+    points = np.concatenate([rng.uniform(-50, 50, (100, dim)), rng.uniform(-5000, 5000, (20, dim))])
+    spatial_hash = SpatialHash(cell_size=20)
+    spatial_hash.build(points)
+
+    indices, distances = spatial_hash.nearest_neighbors()
+
+    brute = np.linalg.norm(points[:, None] - points[None, :], axis=2)
+    np.fill_diagonal(brute, np.inf)
+    assert np.allclose(distances, brute.min(axis=1))
+    assert np.allclose(brute[np.arange(len(points)), indices], distances)
+
+
+@pytest.mark.unit_test
+def test_degenerate_point_sets():
+    spatial_hash = SpatialHash(cell_size=10)
+
+    spatial_hash.build(np.zeros((0, 2)))
+    assert spatial_hash.candidate_pairs().shape == (0, 2)
+
+    spatial_hash.build(np.array([[1.0, 2.0]]))
+    indices, distances = spatial_hash.nearest_neighbors()
+    assert indices[0] == -1 and distances[0] == np.inf
+
+    # coincident points are each other's nearest neighbors
+    spatial_hash.build(np.array([[1.0, 2.0], [1.0, 2.0], [100.0, 2.0]]))
+    indices, distances = spatial_hash.nearest_neighbors()
+    assert list(indices) == [1, 0, 1] or list(indices) == [1, 0, 0]
+    assert list(distances[:2]) == [0, 0] and distances[2] == pytest.approx(99)
+
+
+class Point:
+    def __init__(self, position):
+        self.position = np.asarray(position, dtype=np.float64)
+
+
+@pytest.mark.unit_test
+def test_pairwise_separation_status():
+    env_objs = {'a': Point([0, 0, 0]), 'b': Point([60, 0, 0]), 'c': Point([1000, 0, 0]), 'd': Point([1300, 0, 0])}
+    sim_state = SimulationState(env_objs=env_objs, status={})
+    processor = PairwiseSeparationStatusProcessor(name='separation', platforms=['a', 'b', 'c', 'd'],
+                                                  safety_margin=100)
+    processor.reset(sim_state)
+
+    assert processor.process(sim_state) == pytest.approx(60)
+    assert sim_state.status['separation.violating_pairs'] == [('a', 'b')]
+    assert sim_state.status['separation.nearest.c'] == pytest.approx(300)
+    assert sim_state.status['separation.neighbor.a'] == 'b'
+    assert sim_state.status['separation.neighbor.d'] == 'c'
@@ -0,0 +1,76 @@
+"""
+This module holds unit tests of the consolidated binary trajectory store of the Koopman training data.
+"""
+
+import os
+import sys
+import pytest
+import numpy as np
+
+# the training scripts in the repository's autokoopman directory import each other as top level modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'autokoopman'))
+from trajectory_store import TrajectoryStore, TrajectoryStoreWriter, convert_measurements  # noqa: E402
+
+
+def trajectories(num_trajectories=4):
+    rng = np.random.default_rng(0)
+    data = []
+    for n in range(num_trajectories):
+        length = 5 + 3 * n
+        data.append((np.arange(length) * 0.5, rng.normal(size=(length, 4)), rng.normal(size=(length, 2))))
+    return data
+
+
+@pytest.mark.unit_test
+def test_round_trip(tmp_path):
+    data = trajectories()
+    path = str(tmp_path / "store")
+    with TrajectoryStoreWriter(path, state_names=['x', 'y', 'heading', 'v'], input_names=['rudder', 'throttle']) \
+            as writer:
+        for times, states, inputs in data:
+            writer.append(times, states, inputs)
+
+    store = TrajectoryStore(path + '.npz')
+    assert len(store) == len(data)
+    assert list(store.lengths()) == [len(t) for t, _, _ in data]
+    assert store.state_names == ['x', 'y', 'heading', 'v']
+
+    for (times, states, inputs), loaded in zip(data, store.load()):
+        assert np.array_equal(loaded[0], times)
+        assert np.array_equal(loaded[1], states)
+        assert np.array_equal(loaded[2], inputs)
+
+    times, states, inputs = store.trajectory(2, state_columns=[0, 3], input_columns=[1])
+    assert np.array_equal(states, data[2][1][:, [0, 3]])
+    assert np.array_equal(inputs, data[2][2][:, [1]])
+
+
+@pytest.mark.unit_test
+def test_empty_store_and_invalid_trajectories(tmp_path):
+    path = str(tmp_path / "empty.npz")
+    with TrajectoryStoreWriter(path):
+        pass
+    assert len(TrajectoryStore(path)) == 0
+
+    with TrajectoryStoreWriter(str(tmp_path / "invalid.npz")) as writer:
+        writer.append(np.arange(3), np.zeros((3, 4)), np.zeros((3, 2)))
+        with pytest.raises(ValueError):
+            writer.append(np.arange(3), np.zeros((2, 4)), np.zeros((3, 2)))
+        with pytest.raises(ValueError):
+            writer.append(np.arange(3), np.zeros((3, 5)), np.zeros((3, 2)))
+
+
+@pytest.mark.unit_test
+def test_convert_measurements(tmp_path):
+    data = trajectories(2)
+    for n, (times, states, inputs) in enumerate(data):
+        directory = tmp_path / "measurements" / "measurement_{}".format(n)
+        os.makedirs(str(directory))
+        np.savetxt(str(directory / "time.csv"), times, delimiter=',')
+        np.savetxt(str(directory / "trajectory.csv"), states, delimiter=',')
+        np.savetxt(str(directory / "input.csv"), inputs, delimiter=',')
+
+    path = str(tmp_path / "store.npz")
+    assert convert_measurements(str(tmp_path / "measurements"), path) == 2
+    for (times, states, inputs), loaded in zip(data, TrajectoryStore(path).load()):
+        assert np.allclose(loaded[1], states) and np.allclose(loaded[2], inputs)
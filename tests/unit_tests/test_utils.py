@@ -0,0 +1,81 @@
+"""
+This module holds unit tests of the single pass JSON conversion of log entries.
+"""
+
+import json
+
+import pytest
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from saferl.environment.utils import to_jsonable
+
+
+@pytest.mark.unit_test
+def test_to_jsonable_nested():
+    obj = {
+        'obs': np.array([1.5, -2.0]),
+        'done': np.bool_(True),
+        'count': np.int32(3),
+        'reward': np.float32(0.5),
+        'info': {'status': [np.int64(1), (2, np.array([3, 4]))], 'failure': False, 'name': None},
+    }
+
+    result = to_jsonable(obj)
+
+    assert result == {
+        'obs': [1.5, -2.0],
+        'done': True,
+        'count': 3,
+        'reward': 0.5,
+        'info': {'status': [1, [2, [3, 4]]], 'failure': False, 'name': None},
+    }
+    assert type(result['done']) is bool
+    assert type(result['count']) is int
+    json.dumps(result)
+
+
+@pytest.mark.unit_test
+def test_to_jsonable_does_not_modify_input():
+    obs = np.array([1.0, 2.0])
+    obj = {'info': {'obs': obs}}
+
+    to_jsonable(obj)
+
+    assert obj['info']['obs'] is obs
+
+
+@pytest.mark.unit_test
+def test_to_jsonable_rotation():
+    rotation = Rotation.from_euler('z', 90, degrees=True)
+
+    result = to_jsonable({'orientation': rotation})
+
+    assert np.allclose(result['orientation'], rotation.as_quat())
+    assert isinstance(result['orientation'], list)
+
+
+@pytest.mark.unit_test
+def test_to_jsonable_array_side_channel():
+    small = np.array([1.0, 2.0])
+    large = np.arange(4, dtype=np.float64)
+    obj = {'small': small, 'large': large, 'ints': np.arange(4), 'nested': [large * 2]}
+    arrays = []
+
+    result = to_jsonable(obj, arrays=arrays, min_array_size=3)
+
+    assert result == {'small': [1.0, 2.0], 'large': {'__array__': 0}, 'ints': [0, 1, 2, 3],
+                      'nested': [{'__array__': 1}]}
+    assert len(arrays) == 2
+    assert np.array_equal(arrays[0], large)
+    assert np.array_equal(arrays[1], large * 2)
+
+    # side channel arrays are copies
+    large[0] = -1
+    assert arrays[0][0] == 0
+
+
+@pytest.mark.unit_test
+def test_to_jsonable_unsupported():
+    with pytest.raises(TypeError):
+        to_jsonable({'obj': object()})